@@ -7,14 +7,29 @@ Role: Machine Learning Engineer
 Organization: Emmvee Solar Systems Pvt. Ltd.
 
 Purpose: REST API for solar irradiance prediction
-Endpoint: POST /predict
+Endpoints: POST /predict, POST /predict/batch, POST /predict/stream,
+           POST /predict/daily
 ================================================================================
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from werkzeug.exceptions import BadRequest
 from flask_cors import CORS
-import joblib
+import os
+import io
+import json
+import re
+import time
 import numpy as np
+from feature_stage import build_features
+from forest_engine import (CompiledForest, EarlyExitPolicy, forest_mean, sklearn_tree_predictions,
+                           tree_quantiles)
+from model_store import ModelStore
+from prediction_cache import PredictionCache, parse_quantization
+from request_coalescer import RequestCoalescer
+from shadow_scorer import ShadowScorer
+from solar_geometry import DEFAULT_MIN_ELEVATION, NightFilter
+from service_metrics import ServiceMetrics
 
 # ============================================================================
 # INITIALIZE FLASK APP
@@ -25,28 +40,585 @@ app = Flask(__name__)
 # Enable CORS to allow frontend requests
 CORS(app)
 
+# ============================================================================
+# SERVICE CONFIGURATION
+# ============================================================================
+
+# Trained artifacts (written by save_model.py)
+MODEL_PATH = 'random_forest_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+
+# Artifact format to serve: 'pickle' (joblib files) or 'portable' (the
+# versioned NumPy .npz files save_model.py writes next to them; they load
+# without sklearn or unpickling, see portable_model.py)
+MODEL_FORMAT = os.environ.get('MODEL_FORMAT', 'pickle')
+
+# Model registry: name -> artifact. Callers pick a model with ?model=<name>;
+# optional models missing on disk are skipped. All share SCALER_PATH, which
+# portable files carry themselves.
+MODEL_REGISTRY = {
+    'random_forest': MODEL_PATH,
+    'decision_tree': 'decision_tree_model.pkl',
+    'linear_regression': 'linear_regression_model.pkl',
+    'gradient_boosting': 'gradient_boosting_model.pkl'
+}
+if MODEL_FORMAT == 'portable':
+    MODEL_REGISTRY = {name: path.replace('.pkl', '.npz') for name, path in MODEL_REGISTRY.items()}
+    SCALER_PATH = None
+DEFAULT_MODEL = 'random_forest'
+
+# Artifact version and SHA-256 hashes (written by save_model.py)
+MODEL_MANIFEST_PATH = 'model_manifest.json'
+
+# Precomputed grid artifact (written by build_irradiance_grid.py)
+GRID_PATH = 'irradiance_grid.npy'
+GRID_METADATA_PATH = 'irradiance_grid.json'
+
+# Inference engine: 'compiled' (array-backed forest or boosted trees),
+# 'sklearn', or 'grid'
+# (interpolated lookups in the precomputed grid; no pickle is loaded)
+PREDICTION_ENGINE = os.environ.get('PREDICTION_ENGINE', 'compiled')
+
+# Fold the StandardScaler into the forest's split thresholds at load time so
+# compiled-engine requests skip scaler.transform (only with the compiled engine)
+FUSE_SCALER = os.environ.get('FUSE_SCALER', '1') == '1'
+
+# Above this many rows sklearn's Cython traversal is faster than the
+# compiled engine's NumPy walk (the two break even near 1000 rows)
+COMPILED_MAX_ROWS = 512
+
+# Early exit: forest batches evaluate trees in blocks of EARLY_EXIT_BLOCK
+# and stop for a row once the standard error of its running mean is within
+# EARLY_EXIT_TOLERANCE W/m² (0 disables it), on the compiled engine or, above
+# COMPILED_MAX_ROWS, on the sklearn estimators. Calls with fewer than
+# EARLY_EXIT_MIN_ROWS rows walk every tree, which is faster there; see
+# benchmark_early_exit.py for the latency/error curve
+EARLY_EXIT_TOLERANCE = float(os.environ.get('EARLY_EXIT_TOLERANCE', '0'))
+EARLY_EXIT_BLOCK = int(os.environ.get('EARLY_EXIT_BLOCK', '25'))
+EARLY_EXIT_MIN_ROWS = int(os.environ.get('EARLY_EXIT_MIN_ROWS', '128'))
+
+early_exit = None
+if EARLY_EXIT_TOLERANCE > 0:
+    early_exit = EarlyExitPolicy(EARLY_EXIT_TOLERANCE, block_size=EARLY_EXIT_BLOCK,
+                                 min_rows=EARLY_EXIT_MIN_ROWS)
+
+# LRU prediction cache for /predict: maximum entries (0 disables it) and
+# optional input quantization, e.g. "temperature=0.5,cloud_cover=5,humidity=5"
+CACHE_SIZE = int(os.environ.get('CACHE_SIZE', '4096'))
+CACHE_QUANTIZATION = os.environ.get('CACHE_QUANTIZATION', '')
+
+# Micro-batching of concurrent /predict calls: collection window in
+# milliseconds (0 disables coalescing) and maximum rows per batch
+COALESCE_WINDOW_MS = float(os.environ.get('COALESCE_WINDOW_MS', '0'))
+COALESCE_MAX_BATCH = int(os.environ.get('COALESCE_MAX_BATCH', '64'))
+
+# Per-stage latency histograms and counters served on /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+
+metrics = ServiceMetrics(enabled=METRICS_ENABLED)
+
+# Same interface, records nothing: predictions that are not requests
+# (bundle warmup) stay out of /metrics
+unrecorded_metrics = ServiceMetrics(enabled=False)
+
+# Hot reload: seconds between checks of the artifact files for a new model
+# (0 disables watching; POST /admin/reload still works)
+RELOAD_POLL_SECONDS = float(os.environ.get('RELOAD_POLL_SECONDS', '5'))
+
+# Shadow scoring: registry model run in the background on a sample of live
+# traffic to record its latency and divergence (empty disables it)
+SHADOW_MODEL = os.environ.get('SHADOW_MODEL', '')
+SHADOW_SAMPLE_RATE = float(os.environ.get('SHADOW_SAMPLE_RATE', '1.0'))
+
+# Night short-circuit: rows whose hour has no sun are answered with 0 W/m²
+# without running the model (relative solar elevation must exceed
+# NIGHT_MIN_ELEVATION for the model to be used)
+NIGHT_FILTER = os.environ.get('NIGHT_FILTER', '1') == '1'
+NIGHT_MIN_ELEVATION = float(os.environ.get('NIGHT_MIN_ELEVATION', str(DEFAULT_MIN_ELEVATION)))
+
+# Shared secret for /admin endpoints, sent as X-Admin-Token (unset = open)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
 # ============================================================================
 # LOAD TRAINED MODEL AND SCALER
 # ============================================================================
 
-print("Loading trained model and scaler...")
+# The registry models, scaler and compiled forests (or the grid) live
+# together in one bundle that reloads replace atomically; see model_store.py
+model_store = ModelStore(
+    PREDICTION_ENGINE,
+    model_paths=MODEL_REGISTRY,
+    default_model=DEFAULT_MODEL,
+    scaler_path=SCALER_PATH,
+    grid_path=GRID_PATH,
+    grid_metadata_path=GRID_METADATA_PATH,
+    manifest_path=MODEL_MANIFEST_PATH,
+    fuse_scaler=FUSE_SCALER,
+    warmup_fn=lambda bundle: warm_bundle(bundle),
+    poll_interval=RELOAD_POLL_SECONDS
+)
 
-try:
-    # Load the trained Random Forest model
-    model = joblib.load('random_forest_model.pkl')
-    print("✓ Model loaded successfully")
+# Define feature order (must match training data)
+FEATURE_ORDER = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+
+# Cache is flushed whenever a new model bundle goes live
+prediction_cache = None
+if CACHE_SIZE > 0:
+    prediction_cache = PredictionCache(
+        max_size=CACHE_SIZE,
+        steps=parse_quantization(CACHE_QUANTIZATION, FEATURE_ORDER)
+    )
+    model_store.on_swap(lambda bundle: prediction_cache.clear())
+
+# Hours with no sun never reach the model; see solar_geometry.py
+night_filter = NightFilter(NIGHT_MIN_ELEVATION) if NIGHT_FILTER else None
+
+# Maximum number of rows accepted by /predict/batch in one request
+MAX_BATCH_SIZE = 10000
+
+# Maximum number of quantiles per request (?quantiles=0.1,0.5,0.9)
+MAX_QUANTILES = 9
+
+# Rows predicted (and streamed back) per chunk by /predict/stream
+STREAM_CHUNK_SIZE = 1000
+
+# Read buffer for the /predict/stream request body (the raw WSGI stream
+# would otherwise be read one byte at a time when splitting lines)
+STREAM_READ_BUFFER = 64 * 1024
+
+# Content types accepted by /predict/stream
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+# ============================================================================
+# INPUT VALIDATION
+# ============================================================================
+
+def parse_json_object():
+    """
+    Parse the request body, which must be a JSON object
+    
+    Returns (data, None), otherwise (None, error_message) for a body that
+    is not JSON, is malformed JSON, or is JSON but not an object (null, a
+    list or a scalar).
+    """
+    if not request.is_json:
+        return None, 'Request must be JSON'
+    try:
+        data = request.get_json()
+    except BadRequest:
+        return None, 'Request body is not valid JSON'
+    if not isinstance(data, dict):
+        return None, 'Request must be a JSON object'
+    return data, None
+
+def validate_features(data):
+    """
+    Validate one input record and extract its features in FEATURE_ORDER
+    
+    Returns (features, None) when the record is valid, otherwise
+    (None, error_message). Shared by /predict and /predict/batch so both
+    endpoints apply exactly the same rules and error messages.
+    """
+    
+    if not isinstance(data, dict):
+        return None, 'Request must be a JSON object'
     
-    # Load the StandardScaler
-    scaler = joblib.load('scaler.pkl')
-    print("✓ Scaler loaded successfully")
+    # Check if all required features are present
+    missing_features = [f for f in FEATURE_ORDER if f not in data]
+    if missing_features:
+        return None, f'Missing required features: {", ".join(missing_features)}'
     
+    # Extract features in correct order
+    try:
+        features = [
+            float(data['temperature']),
+            float(data['cloud_cover']),
+            float(data['humidity']),
+            int(data['hour']),
+            int(data['month'])
+        ]
+    except (ValueError, TypeError) as e:
+        return None, f'Invalid feature values: {str(e)}'
+    
+    # Validate temperature (-10 to 50°C)
+    if not -10 <= features[0] <= 50:
+        return None, 'Temperature must be between -10°C and 50°C'
+    
+    # Validate cloud cover (0 to 100%)
+    if not 0 <= features[1] <= 100:
+        return None, 'Cloud cover must be between 0% and 100%'
+    
+    # Validate humidity (0 to 100%)
+    if not 0 <= features[2] <= 100:
+        return None, 'Humidity must be between 0% and 100%'
+    
+    # Validate hour (0 to 23)
+    if not 0 <= features[3] <= 23:
+        return None, 'Hour must be between 0 and 23'
+    
+    # Validate month (1 to 12)
+    if not 1 <= features[4] <= 12:
+        return None, 'Month must be between 1 and 12'
+    
+    return features, None
+
+# Validation error message prefixes -> rule names used by /metrics
+VALIDATION_RULES = [
+    ('Request must be JSON', 'not_json'),
+    ('Request body is not valid JSON', 'invalid_json'),
+    ('Request must be a JSON object', 'not_object'),
+    ('Instance must be a JSON object', 'not_object'),
+    ('Record must be a JSON object', 'not_object'),
+    ('Invalid JSON', 'invalid_json'),
+    ('Request must contain an "instances" list', 'missing_instances'),
+    ('Batch size must not exceed', 'batch_too_large'),
+    ('Missing required features', 'missing_features'),
+    ('Invalid feature values', 'invalid_type'),
+    ('Temperature must be', 'temperature_range'),
+    ('Cloud cover must be', 'cloud_cover_range'),
+    ('Humidity must be', 'humidity_range'),
+    ('Hour must be', 'hour_range'),
+    ('Month must be', 'month_range'),
+    ('Unknown model', 'unknown_model'),
+    ('Quantiles must be', 'quantiles_invalid'),
+    ('Quantiles are not available', 'quantiles_unsupported')
+]
+
+def validation_rule(error):
+    """
+    Map a validation error message to its rule name for error counters
+    """
+    for prefix, rule in VALIDATION_RULES:
+        if error.startswith(prefix):
+            return rule
+    return 'other'
+
+# ============================================================================
+# MODEL INFERENCE
+# ============================================================================
+
+def model_features(features_matrix, bundle, stage_label, started, recorder=metrics):
+    """
+    Model features of raw request rows: the feature stage the bundle was
+    trained with (feature_stage.py); raw features pass through unchanged
+    """
+    if bundle.feature_set == 'raw':
+        return features_matrix
+    features = build_features(features_matrix, bundle.feature_set)
+    recorder.observe(stage_label, 'features', time.perf_counter() - started)
+    return features
+
+def predict_features(features_matrix, model_name=DEFAULT_MODEL, bundle=None, record=True):
+    """
+    Predict irradiance for a matrix of raw features in FEATURE_ORDER
+    
+    Small inputs go through the compiled forest (without scaling when the
+    scaler is fused into it); large batches use scaler + sklearn, whose
+    Cython traversal wins once there are many rows. A portable forest has
+    no sklearn model, so its compiled forest serves every size. With early
+    exit enabled, batches of a forest (compiled or sklearn) stop evaluating
+    trees for rows whose mean has converged. Gradient boosting is compiled like a
+    forest; models without trees always use scaler + sklearn. In grid mode every
+    request is an interpolated lookup in the precomputed grid. The active
+    bundle is read once, so a concurrent reload never mixes two models.
+    With record=False (warmup) nothing is added to /metrics or the
+    early-exit counters.
+    """
+    if bundle is None:
+        bundle = model_store.active
+    scaler, grid = bundle.scaler, bundle.grid
+    stage_label = f'inference/{model_name}'
+    recorder = metrics if record else unrecorded_metrics
+    
+    started = time.perf_counter()
+    if grid is not None:
+        predictions = grid.predict(features_matrix)
+        recorder.observe(stage_label, 'model', time.perf_counter() - started)
+        return predictions
+    
+    model = bundle.models[model_name]
+    engine = bundle.engines.get(model_name)
+    features_matrix = model_features(features_matrix, bundle, stage_label, started, recorder)
+    
+    started = time.perf_counter()
+    use_engine = engine is not None and (len(features_matrix) <= COMPILED_MAX_ROWS
+                                         or isinstance(model, CompiledForest))
+    if use_engine and engine.fused:
+        features_scaled = features_matrix
+    else:
+        features_scaled = scaler.transform(features_matrix)
+        recorder.observe(stage_label, 'scale', time.perf_counter() - started)
+    
+    scaled = time.perf_counter()
+    if engine is not None and early_exit is not None and early_exit.applies(engine, len(features_scaled)):
+        predictions = early_exit.predict(engine, features_scaled, record=record,
+                                         sklearn_model=None if use_engine else model)
+    elif use_engine:
+        predictions = engine.predict(features_scaled)
+    else:
+        predictions = model.predict(features_scaled)
+    recorder.observe(stage_label, 'model', time.perf_counter() - scaled)
+    return predictions
+
+def predict_quantiles(features_matrix, quantiles, model_name=DEFAULT_MODEL):
+    """
+    Predict the forest mean and quantiles of the per-tree predictions
+    
+    Both come from the same per-tree values, so intervals cost one sort on
+    top of a plain prediction. Small inputs read them from the compiled
+    forest's traversal; large batches collect each sklearn estimator's
+    output, which is the per-tree pass model.predict makes internally.
+    Returns (mean, quantile matrix of shape (n_rows, len(quantiles))).
+    """
+    bundle = model_store.active
+    scaler = bundle.scaler
+    model = bundle.models[model_name]
+    engine = bundle.engines.get(model_name)
+    stage_label = f'inference/{model_name}'
+    
+    started = time.perf_counter()
+    features_matrix = model_features(features_matrix, bundle, stage_label, started)
+    
+    started = time.perf_counter()
+    use_engine = engine is not None and (len(features_matrix) <= COMPILED_MAX_ROWS
+                                         or isinstance(model, CompiledForest))
+    if use_engine and engine.fused:
+        features_scaled = features_matrix
+    else:
+        features_scaled = scaler.transform(features_matrix)
+        metrics.observe(stage_label, 'scale', time.perf_counter() - started)
+    
+    scaled = time.perf_counter()
+    if use_engine:
+        tree_values = engine.tree_predictions(features_scaled)
+    elif isinstance(model, CompiledForest):
+        tree_values = model.tree_predictions(features_scaled)
+    else:
+        tree_values = sklearn_tree_predictions(model, features_scaled)
+    mean = forest_mean(tree_values)
+    quantile_values = tree_quantiles(tree_values, quantiles)
+    metrics.observe(stage_label, 'model', time.perf_counter() - scaled)
+    return mean, quantile_values
+
+# Rows run through a freshly loaded bundle before it takes traffic: one row
+# for the compiled engine and a batch large enough for the sklearn path
+WARMUP_ROWS = np.tile([[25.0, 20.0, 50.0, 12, 6], [10.0, 80.0, 90.0, 3, 12]],
+                      (COMPILED_MAX_ROWS, 1))
+
+# Single-row calls timed per model after warmup
+WARMUP_TIMING_CALLS = 20
+
+def warm_bundle(bundle):
+    """
+    Pay first-call costs of a new bundle before it is swapped in, and time
+    a single-row prediction of every model for /model-info (not recorded
+    in /metrics, which describes requests only)
+    """
+    for model_name in model_names(bundle):
+        for rows in (WARMUP_ROWS[:1], WARMUP_ROWS):
+            predict_features(rows, model_name, bundle, record=False)
+        
+        started = time.perf_counter()
+        for _ in range(WARMUP_TIMING_CALLS):
+            predict_features(WARMUP_ROWS[:1], model_name, bundle, record=False)
+        elapsed = time.perf_counter() - started
+        bundle.latency_us[model_name] = round(elapsed / WARMUP_TIMING_CALLS * 1e6, 1)
+
+def model_names(bundle):
+    """
+    Names of the models a bundle can serve (grid mode serves the default
+    model's precomputed grid only)
+    """
+    if bundle.grid is not None:
+        return [DEFAULT_MODEL]
+    return list(bundle.models)
+
+# ============================================================================
+# LOAD ACTIVE MODEL
+# ============================================================================
+
+print("Loading precomputed irradiance grid..." if PREDICTION_ENGINE == 'grid'
+      else "Loading trained model and scaler...")
+try:
+    model_store.reload()
 except Exception as e:
-    print(f"✗ Error loading model or scaler: {str(e)}")
-    model = None
-    scaler = None
+    print(f"✗ Error loading serving artifacts: {str(e)}")
 
-# Define feature order (must match training data)
-FEATURE_ORDER = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+@app.before_request
+def start_model_watcher():
+    """
+    Watch the artifact files from the process that serves requests
+    (under serve.py the master watches instead)
+    """
+    model_store.ensure_watcher()
+
+# Concurrent single-row requests share one vectorized predict call
+coalescer = None
+if COALESCE_WINDOW_MS > 0:
+    coalescer = RequestCoalescer(
+        predict_features,
+        window_ms=COALESCE_WINDOW_MS,
+        max_batch_size=COALESCE_MAX_BATCH
+    )
+
+# Candidate model scored off the response path on a sample of live traffic
+shadow_scorer = None
+if SHADOW_MODEL:
+    if SHADOW_MODEL in MODEL_REGISTRY:
+        shadow_scorer = ShadowScorer(
+            predict_features,
+            SHADOW_MODEL,
+            sample_rate=SHADOW_SAMPLE_RATE
+        )
+        print(f"✓ Shadow scoring with '{SHADOW_MODEL}' ({SHADOW_SAMPLE_RATE:.0%} of requests)")
+    else:
+        print(f"✗ Unknown SHADOW_MODEL '{SHADOW_MODEL}', shadow scoring disabled")
+
+def shadow_score(features_matrix, predictions, model_name):
+    """
+    Hand rows answered by model_name to the shadow model, if enabled
+    """
+    if shadow_scorer is not None and model_name != shadow_scorer.model_name:
+        shadow_scorer.submit(features_matrix, predictions)
+
+def split_daylight(features_matrix):
+    """
+    Separate the rows that need the model from rows after sunset
+    
+    Returns (daylight mask, daylight rows); the mask is None when every
+    row needs the model. Night rows are answered with 0 by the caller.
+    """
+    if night_filter is None:
+        return None, features_matrix
+    daylight = night_filter.daylight_mask(features_matrix)
+    n_night = len(daylight) - int(np.count_nonzero(daylight))
+    night_filter.record(len(daylight), n_night)
+    if n_night == 0:
+        return None, features_matrix
+    return daylight, features_matrix[daylight]
+
+def predict_matrix(features_matrix, model_name=DEFAULT_MODEL):
+    """
+    Predict a matrix of validated rows with the selected model
+    """
+    daylight, rows = split_daylight(features_matrix)
+    if daylight is None:
+        predictions = predict_features(rows, model_name)
+        shadow_score(rows, predictions, model_name)
+        return predictions
+    
+    predictions = np.zeros(len(features_matrix))
+    if len(rows) > 0:
+        predictions[daylight] = predict_features(rows, model_name)
+        shadow_score(rows, predictions[daylight], model_name)
+    return predictions
+
+def predict_with_quantiles(features_matrix, model_name=DEFAULT_MODEL, quantiles=None):
+    """
+    Predict a matrix of validated rows, plus quantiles when asked for
+
+    Returns (predictions, quantile matrix or None).
+    """
+    if not quantiles:
+        return predict_matrix(features_matrix, model_name), None
+    
+    daylight, rows = split_daylight(features_matrix)
+    if daylight is None:
+        mean, quantile_values = predict_quantiles(rows, quantiles, model_name)
+        shadow_score(rows, mean, model_name)
+        return mean, quantile_values
+    
+    # Every tree predicts 0 without sun, so every quantile is 0 too
+    mean = np.zeros(len(features_matrix))
+    quantile_values = np.zeros((len(features_matrix), len(quantiles)))
+    if len(rows) > 0:
+        mean[daylight], quantile_values[daylight] = predict_quantiles(rows, quantiles, model_name)
+        shadow_score(rows, mean[daylight], model_name)
+    return mean, quantile_values
+
+def predict_row(features, model_name=DEFAULT_MODEL):
+    """
+    Predict one row, through the request coalescer if enabled (the
+    coalescer batches requests for the default model only)
+    """
+    row = np.array(features, dtype=float).reshape(1, -1)
+    if coalescer is not None and model_name == DEFAULT_MODEL:
+        value = coalescer.submit(features)
+    else:
+        value = float(predict_features(row, model_name)[0])
+    shadow_score(row, [value], model_name)
+    return value
+
+def predict_single(features, model_name=DEFAULT_MODEL):
+    """
+    Predict one validated row, going through the prediction cache if enabled
+    """
+    # No sun: exactly 0 W/m², without touching the cache or the model
+    if night_filter is not None:
+        daylight = night_filter.is_daylight(features[FEATURE_ORDER.index('hour')])
+        night_filter.record(1, 0 if daylight else 1)
+        if not daylight:
+            return 0.0
+    
+    if prediction_cache is None:
+        return predict_row(features, model_name)
+    
+    # The normalized key is also the (possibly quantized) model input
+    key = prediction_cache.normalize(features)
+    cache_key = (model_name, key)
+    value = prediction_cache.get(cache_key)
+    if value is None:
+        bundle = model_store.active
+        value = predict_row(key, model_name)
+        # Do not cache a value from a bundle that was replaced meanwhile
+        if model_store.active is bundle:
+            prediction_cache.put(cache_key, value)
+    return value
+
+def select_quantiles(model_name):
+    """
+    Read the optional ?quantiles= query parameter, e.g. "0.1,0.5,0.9"
+    
+    Returns (quantiles, None), with quantiles None when none were asked
+    for, or (None, error_message).
+    """
+    spec = request.args.get('quantiles', '').strip()
+    if not spec:
+        return None, None
+    
+    try:
+        quantiles = [float(part) for part in spec.split(',')]
+    except ValueError:
+        return None, 'Quantiles must be comma-separated numbers, e.g. 0.1,0.5,0.9'
+    if not quantiles or len(quantiles) > MAX_QUANTILES or not all(0 <= q <= 1 for q in quantiles):
+        return None, f'Quantiles must be 1 to {MAX_QUANTILES} values between 0 and 1'
+    
+    model = model_store.active.models.get(model_name)
+    if not (hasattr(model, 'estimators_')
+            or (isinstance(model, CompiledForest) and model.averages_trees and model.n_trees > 1)):
+        return None, (f'Quantiles are not available for model {model_name}; '
+                      f'they need a forest of trees')
+    return quantiles, None
+
+def quantile_dict(quantiles, values):
+    """
+    Non-negative quantile values keyed "p10", "p50", "p2.5", ...
+    """
+    return {f'p{q * 100:g}': round(max(0.0, float(value)), 2)
+            for q, value in zip(quantiles, values)}
+
+def select_model():
+    """
+    Read the ?model= query parameter
+    
+    Returns (model_name, None) when the model is available, otherwise
+    (None, error_message).
+    """
+    model_name = request.args.get('model', DEFAULT_MODEL)
+    available = model_names(model_store.active)
+    if model_name not in available:
+        return None, f'Unknown model: {model_name}. Available models: {", ".join(available)}'
+    return model_name, None
 
 # ============================================================================
 # HEALTH CHECK ENDPOINT
@@ -69,6 +641,7 @@ def health_check():
 # ============================================================================
 
 @app.route('/predict', methods=['POST'])
+@metrics.track('predict')
 def predict():
     """
     Predict solar irradiance based on input features
@@ -88,151 +661,722 @@ def predict():
     }
     """
     
+    # Per-stage latency marks for /metrics
+    timer = g.request_timer
+    
     try:
         # ====================================================================
         # STEP 1: VALIDATE REQUEST
         # ====================================================================
         
-        # Check if request contains JSON data
-        if not request.is_json:
+        # Request body must be a JSON object
+        data, error = parse_json_object()
+        if error:
+            metrics.count_error('predict', validation_rule(error))
             return jsonify({
-                'error': 'Request must be JSON',
+                'error': error,
                 'status': 'failed'
             }), 400
-        
-        # Get JSON data from request
-        data = request.get_json()
+        timer.mark('parse_json')
         
         # ====================================================================
         # STEP 2: EXTRACT AND VALIDATE INPUT FEATURES
         # ====================================================================
         
-        # Check if all required features are present
-        missing_features = [f for f in FEATURE_ORDER if f not in data]
-        if missing_features:
-            return jsonify({
-                'error': f'Missing required features: {", ".join(missing_features)}',
-                'status': 'failed'
-            }), 400
+        # Check presence, types and ranges (same rules as /predict/batch)
+        features, error = validate_features(data)
         
-        # Extract features in correct order
-        try:
-            features = [
-                float(data['temperature']),
-                float(data['cloud_cover']),
-                float(data['humidity']),
-                int(data['hour']),
-                int(data['month'])
-            ]
-        except (ValueError, TypeError) as e:
+        # Model chosen by the caller with ?model= (default: random_forest)
+        # and optional prediction quantiles (?quantiles=0.1,0.5,0.9)
+        if error is None:
+            model_name, error = select_model()
+        if error is None:
+            quantiles, error = select_quantiles(model_name)
+        timer.mark('validate')
+        if error:
+            metrics.count_error('predict', validation_rule(error))
             return jsonify({
-                'error': f'Invalid feature values: {str(e)}',
+                'error': error,
                 'status': 'failed'
             }), 400
         
         # ====================================================================
-        # STEP 3: VALIDATE FEATURE RANGES
+        # STEP 3: MAKE PREDICTION
         # ====================================================================
         
-        # Validate temperature (-10 to 50°C)
-        if not -10 <= features[0] <= 50:
+        # Scale (unless fused into the forest) and predict solar irradiance,
+        # answering repeated inputs from the prediction cache. Quantiles
+        # come from the same per-tree values as the mean (no cache).
+        if quantiles:
+            mean, quantile_values = predict_with_quantiles(
+                np.array(features, dtype=float).reshape(1, -1), model_name, quantiles)
+            predicted_value = float(mean[0])
+        else:
+            predicted_value = predict_single(features, model_name)
+        
+        # Ensure prediction is non-negative (solar irradiance cannot be negative)
+        predicted_value = max(0.0, predicted_value)
+        timer.mark('predict')
+        
+        # ====================================================================
+        # STEP 4: RETURN PREDICTION
+        # ====================================================================
+        
+        result = {
+            'predicted_solar_irradiance': round(predicted_value, 2),
+            'unit': 'W/m²',
+            'model': model_name,
+            'status': 'success',
+            'input_features': {
+                'temperature': features[0],
+                'cloud_cover': features[1],
+                'humidity': features[2],
+                'hour': features[3],
+                'month': features[4]
+            }
+        }
+        if quantiles:
+            result['quantiles'] = quantile_dict(quantiles, quantile_values[0])
+        
+        response = jsonify(result)
+        timer.mark('serialize')
+        return response, 200
+    
+    except Exception as e:
+        # Handle any unexpected errors
+        return jsonify({
+            'error': f'Prediction failed: {str(e)}',
+            'status': 'failed'
+        }), 500
+
+# ============================================================================
+# BATCH PREDICTION ENDPOINT
+# ============================================================================
+
+@app.route('/predict/batch', methods=['POST'])
+@metrics.track('predict_batch')
+def predict_batch():
+    """
+    Predict solar irradiance for many input rows in one request
+
+    Expected JSON input:
+    {
+        "instances": [
+            {"temperature": float, "cloud_cover": float, "humidity": float,
+             "hour": int, "month": int},
+            ...
+        ]
+    }
+
+    Valid rows are scaled and predicted together as one NumPy matrix.
+    Invalid rows are reported individually with the same error messages
+    as /predict and do not fail the rest of the batch. Results are
+    returned in request order.
+
+    Returns JSON output:
+    {
+        "predictions": [
+            {"index": 0, "predicted_solar_irradiance": float, "status": "success"},
+            {"index": 1, "error": str, "status": "failed"},
+            ...
+        ],
+        "count": int,
+        "succeeded": int,
+        "failed": int
+    }
+    """
+
+    timer = g.request_timer
+
+    try:
+        # ====================================================================
+        # STEP 1: VALIDATE REQUEST
+        # ====================================================================
+
+        data, error = parse_json_object()
+        if error:
+            metrics.count_error('predict_batch', validation_rule(error))
             return jsonify({
-                'error': 'Temperature must be between -10°C and 50°C',
+                'error': error,
                 'status': 'failed'
             }), 400
-        
-        # Validate cloud cover (0 to 100%)
-        if not 0 <= features[1] <= 100:
+        timer.mark('parse_json')
+
+        instances = data.get('instances')
+        if not isinstance(instances, list):
+            metrics.count_error('predict_batch', 'missing_instances')
+            return jsonify({
+                'error': 'Request must contain an "instances" list',
+                'status': 'failed'
+            }), 400
+
+        if len(instances) > MAX_BATCH_SIZE:
+            metrics.count_error('predict_batch', 'batch_too_large')
             return jsonify({
-                'error': 'Cloud cover must be between 0% and 100%',
+                'error': f'Batch size must not exceed {MAX_BATCH_SIZE} instances',
                 'status': 'failed'
             }), 400
+
+        model_name, error = select_model()
+        if error is None:
+            quantiles, error = select_quantiles(model_name)
+        if error:
+            metrics.count_error('predict_batch', validation_rule(error))
+            return jsonify({
+                'error': error,
+                'status': 'failed'
+            }), 400
+
+        # ====================================================================
+        # STEP 2: VALIDATE EACH ROW
+        # ====================================================================
+
+        results = [None] * len(instances)
+        valid_rows = []
+        valid_indices = []
+
+        for i, instance in enumerate(instances):
+            if not isinstance(instance, dict):
+                metrics.count_error('predict_batch', 'not_object')
+                results[i] = {
+                    'index': i,
+                    'error': 'Instance must be a JSON object',
+                    'status': 'failed'
+                }
+                continue
+
+            features, error = validate_features(instance)
+            if error:
+                metrics.count_error('predict_batch', validation_rule(error))
+                results[i] = {'index': i, 'error': error, 'status': 'failed'}
+            else:
+                valid_rows.append(features)
+                valid_indices.append(i)
+
+        # ====================================================================
+        # STEP 3: SCALE AND PREDICT ALL VALID ROWS AT ONCE
+        # ====================================================================
+
+        timer.mark('validate')
+
+        if valid_rows:
+            features_matrix = np.array(valid_rows, dtype=float)
+            predictions, quantile_values = predict_with_quantiles(
+                features_matrix, model_name, quantiles)
+            predictions = np.maximum(predictions, 0.0)
+
+            for row, (i, value) in enumerate(zip(valid_indices, predictions)):
+                results[i] = {
+                    'index': i,
+                    'predicted_solar_irradiance': round(float(value), 2),
+                    'status': 'success'
+                }
+                if quantiles:
+                    results[i]['quantiles'] = quantile_dict(quantiles, quantile_values[row])
+
+        timer.mark('predict')
+
+        # ====================================================================
+        # STEP 4: RETURN PREDICTIONS IN REQUEST ORDER
+        # ====================================================================
+
+        response = jsonify({
+            'predictions': results,
+            'count': len(results),
+            'succeeded': len(valid_indices),
+            'failed': len(results) - len(valid_indices),
+            'unit': 'W/m²',
+            'model': model_name,
+            'status': 'success'
+        })
+        timer.mark('serialize')
+        return response, 200
+
+    except Exception as e:
+        return jsonify({
+            'error': f'Batch prediction failed: {str(e)}',
+            'status': 'failed'
+        }), 500
+
+# ============================================================================
+# DAILY IRRADIANCE CURVE ENDPOINT
+# ============================================================================
+
+HOURS_PER_DAY = 24
+
+@app.route('/predict/daily', methods=['POST'])
+@metrics.track('predict_daily')
+def predict_daily():
+    """
+    Predict the full 24-hour irradiance curve for one day
+    
+    Expected JSON input (each weather field is a list of 24 hourly values,
+    hour 0 first, or a single number used for every hour):
+    {
+        "month": int,
+        "temperature": [float x 24] or float,
+        "cloud_cover": [float x 24] or float,
+        "humidity": [float x 24] or float
+    }
+    
+    All 24 hours are predicted in one call over a 24-row matrix.
+    
+    Returns JSON output:
+    {
+        "hourly": [{"hour": 0, "predicted_solar_irradiance": float}, ...],
+        "daily_insolation_kwh_m2": float,
+        "peak_hour": int,
+        "peak_irradiance": float
+    }
+    """
+    
+    try:
+        # ====================================================================
+        # STEP 1: VALIDATE REQUEST
+        # ====================================================================
         
-        # Validate humidity (0 to 100%)
-        if not 0 <= features[2] <= 100:
+        data, error = parse_json_object()
+        if error:
+            metrics.count_error('predict_daily', validation_rule(error))
             return jsonify({
-                'error': 'Humidity must be between 0% and 100%',
+                'error': error,
                 'status': 'failed'
             }), 400
         
-        # Validate hour (0 to 23)
-        if not 0 <= features[3] <= 23:
+        missing_features = [f for f in ['temperature', 'cloud_cover', 'humidity', 'month']
+                            if f not in data]
+        if missing_features:
+            metrics.count_error('predict_daily', 'missing_features')
             return jsonify({
-                'error': 'Hour must be between 0 and 23',
+                'error': f'Missing required features: {", ".join(missing_features)}',
                 'status': 'failed'
             }), 400
         
-        # Validate month (1 to 12)
-        if not 1 <= features[4] <= 12:
+        model_name, error = select_model()
+        if error is None:
+            quantiles, error = select_quantiles(model_name)
+        if error:
+            metrics.count_error('predict_daily', validation_rule(error))
             return jsonify({
-                'error': 'Month must be between 1 and 12',
+                'error': error,
                 'status': 'failed'
             }), 400
         
         # ====================================================================
-        # STEP 4: SCALE FEATURES
+        # STEP 2: EXPAND TO 24 HOURLY RECORDS AND VALIDATE EACH
         # ====================================================================
         
-        # Convert to numpy array and reshape for scaler
-        features_array = np.array(features).reshape(1, -1)
+        hourly_inputs = {}
+        for name in ['temperature', 'cloud_cover', 'humidity']:
+            values = data[name]
+            if isinstance(values, list):
+                if len(values) != HOURS_PER_DAY:
+                    metrics.count_error('predict_daily', 'hourly_length')
+                    return jsonify({
+                        'error': f'{name} must have {HOURS_PER_DAY} hourly values, got {len(values)}',
+                        'status': 'failed'
+                    }), 400
+                hourly_inputs[name] = values
+            else:
+                hourly_inputs[name] = [values] * HOURS_PER_DAY
         
-        # Apply StandardScaler transformation
-        features_scaled = scaler.transform(features_array)
+        rows = []
+        for hour in range(HOURS_PER_DAY):
+            record = {name: hourly_inputs[name][hour] for name in hourly_inputs}
+            record['hour'] = hour
+            record['month'] = data['month']
+            
+            features, error = validate_features(record)
+            if error:
+                metrics.count_error('predict_daily', validation_rule(error))
+                return jsonify({
+                    'error': f'Hour {hour}: {error}',
+                    'status': 'failed'
+                }), 400
+            rows.append(features)
         
         # ====================================================================
-        # STEP 5: MAKE PREDICTION
+        # STEP 3: PREDICT ALL 24 HOURS AT ONCE
         # ====================================================================
         
-        # Use trained model to predict solar irradiance
-        prediction = model.predict(features_scaled)
-        
-        # Extract prediction value (convert from array to float)
-        predicted_value = float(prediction[0])
-        
-        # Ensure prediction is non-negative (solar irradiance cannot be negative)
-        predicted_value = max(0.0, predicted_value)
+        predictions, quantile_values = predict_with_quantiles(
+            np.array(rows, dtype=float), model_name, quantiles)
+        predictions = np.maximum(predictions, 0.0)
         
         # ====================================================================
-        # STEP 6: RETURN PREDICTION
+        # STEP 4: DAILY TOTALS
         # ====================================================================
         
+        # Each hourly value is the mean irradiance over a one-hour interval,
+        # so W/m² x 1 h summed over the day gives Wh/m²
+        daily_insolation = float(predictions.sum()) / 1000.0
+        peak_hour = int(np.argmax(predictions))
+        
+        hourly = [
+            {'hour': hour, 'predicted_solar_irradiance': round(float(value), 2)}
+            for hour, value in enumerate(predictions)
+        ]
+        if quantiles:
+            for hour, entry in enumerate(hourly):
+                entry['quantiles'] = quantile_dict(quantiles, quantile_values[hour])
+        
         return jsonify({
-            'predicted_solar_irradiance': round(predicted_value, 2),
+            'hourly': hourly,
+            'daily_insolation_kwh_m2': round(daily_insolation, 3),
+            'peak_hour': peak_hour,
+            'peak_irradiance': round(float(predictions[peak_hour]), 2),
+            'month': rows[0][4],
             'unit': 'W/m²',
-            'status': 'success',
-            'input_features': {
-                'temperature': features[0],
-                'cloud_cover': features[1],
-                'humidity': features[2],
-                'hour': features[3],
-                'month': features[4]
-            }
+            'model': model_name,
+            'status': 'success'
         }), 200
     
     except Exception as e:
-        # Handle any unexpected errors
         return jsonify({
-            'error': f'Prediction failed: {str(e)}',
+            'error': f'Daily prediction failed: {str(e)}',
             'status': 'failed'
         }), 500
 
+# ============================================================================
+# STREAMING NDJSON PREDICTION ENDPOINT
+# ============================================================================
+
+def score_chunk(records, first_index, id_field, model_name=DEFAULT_MODEL, quantiles=None):
+    """
+    Validate and predict one chunk of parsed NDJSON records
+    
+    Returns the NDJSON result lines and the number of successful rows.
+    """
+    results = [None] * len(records)
+    valid_rows = []
+    valid_positions = []
+    
+    for position, (record, parse_error) in enumerate(records):
+        index = first_index + position
+        
+        if parse_error is not None:
+            metrics.count_error('predict_stream', 'invalid_json')
+            results[position] = {'index': index, 'error': parse_error, 'status': 'failed'}
+            continue
+        if not isinstance(record, dict):
+            metrics.count_error('predict_stream', 'not_object')
+            results[position] = {'index': index, 'error': 'Record must be a JSON object',
+                                 'status': 'failed'}
+            continue
+        
+        features, error = validate_features(record)
+        if error:
+            metrics.count_error('predict_stream', validation_rule(error))
+            results[position] = {'index': index, 'error': error, 'status': 'failed'}
+        else:
+            valid_rows.append(features)
+            valid_positions.append(position)
+    
+    if valid_rows:
+        predictions, quantile_values = predict_with_quantiles(
+            np.array(valid_rows, dtype=float), model_name, quantiles)
+        predictions = np.maximum(predictions, 0.0)
+        for row, (position, value) in enumerate(zip(valid_positions, predictions)):
+            results[position] = {
+                'index': first_index + position,
+                'predicted_solar_irradiance': round(float(value), 2),
+                'status': 'success'
+            }
+            if quantiles:
+                results[position]['quantiles'] = quantile_dict(quantiles, quantile_values[row])
+    
+    # Echo the caller's record key so results can be joined back
+    for (record, _), result in zip(records, results):
+        if isinstance(record, dict) and id_field in record:
+            result[id_field] = record[id_field]
+    
+    lines = ''.join(json.dumps(result) + '\n' for result in results)
+    return lines, len(valid_rows)
+
+@app.route('/predict/stream', methods=['POST'])
+@metrics.track('predict_stream')
+def predict_stream():
+    """
+    Score newline-delimited JSON records and stream NDJSON results back
+    
+    Expected input (Content-Type: application/x-ndjson), one record per line:
+    {"temperature": float, "cloud_cover": float, "humidity": float, "hour": int, "month": int}
+    
+    The body is read incrementally and predicted in chunks of
+    STREAM_CHUNK_SIZE rows; each chunk's results are sent as soon as it
+    finishes, so server memory stays bounded regardless of payload size.
+    Each output line carries the record's 0-based "index" (and its
+    "datetime", or the field named by ?id_field=). A final summary line
+    with "status": "complete" ends the stream. ?model= selects the model
+    and ?quantiles= adds prediction quantiles to every line.
+    """
+    
+    content_type = (request.mimetype or '').lower()
+    if content_type not in NDJSON_CONTENT_TYPES:
+        metrics.count_error('predict_stream', 'content_type')
+        return jsonify({
+            'error': 'Request must be NDJSON (Content-Type: application/x-ndjson)',
+            'status': 'failed'
+        }), 400
+    
+    model_name, error = select_model()
+    if error is None:
+        quantiles, error = select_quantiles(model_name)
+    if error:
+        metrics.count_error('predict_stream', validation_rule(error))
+        return jsonify({
+            'error': error,
+            'status': 'failed'
+        }), 400
+    
+    id_field = request.args.get('id_field', 'datetime')
+    stream = io.BufferedReader(request.stream, buffer_size=STREAM_READ_BUFFER)
+    
+    def generate():
+        records = []
+        next_index = 0
+        succeeded = 0
+        
+        for raw_line in stream:
+            line = raw_line.strip()
+            if not line:
+                continue
+            
+            try:
+                records.append((json.loads(line), None))
+            except ValueError as e:
+                records.append((None, f'Invalid JSON: {str(e)}'))
+            
+            if len(records) >= STREAM_CHUNK_SIZE:
+                lines, ok = score_chunk(records, next_index, id_field, model_name, quantiles)
+                succeeded += ok
+                next_index += len(records)
+                records = []
+                yield lines
+        
+        if records:
+            lines, ok = score_chunk(records, next_index, id_field, model_name, quantiles)
+            succeeded += ok
+            next_index += len(records)
+            yield lines
+        
+        yield json.dumps({
+            'status': 'complete',
+            'count': next_index,
+            'succeeded': succeeded,
+            'failed': next_index - succeeded,
+            'model': model_name
+        }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# ============================================================================
+# METRICS ENDPOINT
+# ============================================================================
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """
+    Latency histograms (with p50/p90/p99), request and validation error
+    counters and in-flight requests in Prometheus text format
+    """
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ============================================================================
+# CACHE STATISTICS ENDPOINT
+# ============================================================================
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """
+    Get hit/miss/eviction counters of the /predict prediction cache
+    """
+    if prediction_cache is None:
+        return jsonify({'enabled': False, 'status': 'success'})
+    
+    stats = prediction_cache.stats()
+    stats['enabled'] = True
+    stats['status'] = 'success'
+    return jsonify(stats)
+
+# ============================================================================
+# COALESCER STATISTICS ENDPOINT
+# ============================================================================
+
+@app.route('/coalescer-stats', methods=['GET'])
+def coalescer_stats():
+    """
+    Get batch size and queue wait statistics of the request coalescer
+    """
+    if coalescer is None:
+        return jsonify({'enabled': False, 'status': 'success'})
+    
+    stats = coalescer.stats()
+    stats['enabled'] = True
+    stats['status'] = 'success'
+    return jsonify(stats)
+
+# ============================================================================
+# EARLY EXIT STATISTICS ENDPOINT
+# ============================================================================
+
+@app.route('/early-exit-stats', methods=['GET'])
+def early_exit_stats():
+    """
+    Get the early-exit settings and the average number of trees used
+    """
+    if early_exit is None:
+        return jsonify({'enabled': False, 'status': 'success'})
+    
+    stats = early_exit.stats()
+    stats['enabled'] = True
+    stats['status'] = 'success'
+    return jsonify(stats)
+
+# ============================================================================
+# NIGHT FILTER STATISTICS ENDPOINT
+# ============================================================================
+
+@app.route('/night-filter-stats', methods=['GET'])
+def night_filter_stats():
+    """
+    Get how many rows and requests were answered without the model
+    because the sun was down
+    """
+    if night_filter is None:
+        return jsonify({'enabled': False, 'status': 'success'})
+    
+    stats = night_filter.stats()
+    stats['enabled'] = True
+    stats['status'] = 'success'
+    return jsonify(stats)
+
 # ============================================================================
 # MODEL INFO ENDPOINT
 # ============================================================================
 
+def describe_model(model_name, bundle):
+    """
+    Type, size, serving path, measured latency and (from the manifest)
+    test error of one registry model
+    """
+    description = {'single_row_latency_us': bundle.latency_us.get(model_name)}
+    
+    if bundle.grid is not None:
+        description['model_type'] = 'Precomputed Irradiance Grid'
+        return description
+    
+    model = bundle.models[model_name]
+    engine = bundle.engines.get(model_name)
+    trained = bundle.manifest.get('models', {}).get(model_name, {})
+    header = bundle.headers.get(model_name)
+    if header is not None:
+        # Portable file: the header names the exported sklearn model
+        description['model_type'] = ' '.join(re.findall('[A-Z][a-z]*', header['model_type']))
+        if 'n_estimators' in header:
+            description['n_estimators'] = header['n_estimators']
+        if header['kind'] == 'boosting':
+            description['n_iterations'] = header['n_trees']
+        description['artifact_format'] = 'portable'
+        description['format_version'] = header['format_version']
+        trained = {'test_mae': trained['portable_test_mae']} if 'portable_test_mae' in trained else {}
+    else:
+        description['model_type'] = ' '.join(re.findall('[A-Z][a-z]*', type(model).__name__))
+        if hasattr(model, 'n_estimators'):
+            description['n_estimators'] = model.n_estimators
+        if hasattr(model, 'n_iter_'):
+            description['n_iterations'] = model.n_iter_
+        description['artifact_format'] = 'pickle'
+    description['compiled'] = engine is not None
+    description['scaler_fused'] = engine is not None and engine.fused
+    
+    if 'test_mae' in trained:
+        description['test_mae'] = trained['test_mae']
+    return description
+
 @app.route('/model-info', methods=['GET'])
 def model_info():
     """
-    Get information about the loaded model
+    Get information about the loaded model, including the active artifact
+    version and content hash
     """
-    return jsonify({
-        'model_type': 'Random Forest Regressor',
-        'n_estimators': 100,
+    bundle = model_store.active
+    info = {
+        'default_model': DEFAULT_MODEL,
+        'engine': PREDICTION_ENGINE,
         'features': FEATURE_ORDER,
+        'feature_set': bundle.feature_set,
         'target': 'solar_irradiance',
         'unit': 'W/m²',
+        'models': {name: describe_model(name, bundle) for name in model_names(bundle)},
+        'shadow_model': shadow_scorer.model_name if shadow_scorer is not None else None,
+        'model_version': bundle.version,
+        'content_hash': bundle.content_hash,
+        'reload': model_store.stats(),
         'status': 'ready'
-    })
+    }
+    
+    # Top-level fields describe the default model
+    default = info['models'].get(DEFAULT_MODEL, {})
+    info['model_type'] = default.get('model_type')
+    info['n_estimators'] = default.get('n_estimators')
+    info['scaler_fused'] = default.get('scaler_fused', False)
+    
+    # Grid lookups approximate the forest; report how closely
+    if bundle.grid is not None:
+        info['grid_shape'] = list(bundle.grid.values.shape)
+        info['grid_error'] = bundle.grid.metadata['error']
+    
+    return jsonify(info)
+
+# ============================================================================
+# SHADOW SCORING STATISTICS ENDPOINT
+# ============================================================================
+
+@app.route('/shadow-stats', methods=['GET'])
+def shadow_stats():
+    """
+    Get latency and prediction divergence of the shadow model
+    """
+    if shadow_scorer is None:
+        return jsonify({'enabled': False, 'status': 'success'})
+    
+    stats = shadow_scorer.stats()
+    stats['enabled'] = True
+    stats['status'] = 'success'
+    return jsonify(stats)
+
+# ============================================================================
+# ADMIN: MODEL RELOAD ENDPOINT
+# ============================================================================
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """
+    Load and warm the artifacts on disk in the background, then swap them in
+    
+    Returns 202 immediately; requests keep being served by the current
+    model until the new one is ready. Poll /model-info for the new version.
+    Under serve.py the request is passed to the master, which reloads once
+    and restarts every worker on the new bundle.
+    """
+    if ADMIN_TOKEN and request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({
+            'error': 'Invalid or missing X-Admin-Token',
+            'status': 'failed'
+        }), 403
+    
+    if not model_store.reload_async():
+        return jsonify({
+            'error': 'A reload is already in progress',
+            'status': 'failed'
+        }), 409
+    
+    return jsonify({
+        'status': 'reloading',
+        'current_version': model_store.active.version,
+        'current_content_hash': model_store.active.content_hash
+    }), 202
 
 # ============================================================================
 # RUN FLASK APP
@@ -245,12 +1389,20 @@ if __name__ == '__main__':
     print("\nEndpoints:")
     print("  GET  /           - Health check")
     print("  POST /predict    - Predict solar irradiance")
+    print("  POST /predict/batch - Predict many rows in one request")
+    print("  POST /predict/stream - Stream NDJSON records in, NDJSON results out")
+    print("  POST /predict/daily - 24-hour irradiance curve and daily energy")
     print("  GET  /model-info - Model information")
+    print("  POST /admin/reload - Hot-reload model artifacts from disk")
+    print("  GET  /metrics    - Latency histograms and counters (Prometheus)")
+    print("  GET  /cache-stats - Prediction cache counters")
+    print("  GET  /coalescer-stats - Micro-batching statistics")
+    print("  GET  /shadow-stats - Shadow model latency and divergence")
     print("\n" + "="*80)
     print("Starting Flask server...")
     print("="*80 + "\n")
     
-    # Run Flask app
+    # Run Flask app (development server; use serve.py for production)
     # debug=True enables auto-reload during development
     # host='0.0.0.0' makes server accessible from other devices
     app.run(debug=True, host='0.0.0.0', port=5000)
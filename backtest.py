@@ -0,0 +1,208 @@
+"""
+================================================================================
+ROLLING-ORIGIN BACKTEST - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Month-by-month out-of-time evaluation over
+         weather_environmental_data.csv
+
+The shuffled 80/20 split of prepare_prediction_data.py puts hours from
+every month on both sides, so its test MAE says nothing about how the
+model does on a month it has not seen. Here every fold trains only on
+rows before its test month and predicts that whole month:
+
+- expanding window: all months before the test month
+- sliding window:   the last --window-months months before it
+
+Each fold fits its own scaler on its training rows. The CSV is parsed once
+into NumPy arrays, which the worker processes inherit; folds only select
+rows from them. Folds run in parallel (TRAIN_CORES workers, one thread
+each, see training_runner.py).
+
+Usage:
+    python backtest.py
+    python backtest.py --window sliding --window-months 12 --model decision_tree
+================================================================================
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+from incremental_training import FEATURE_COLUMNS, TARGET_COLUMN, WATERMARK_COLUMN, load_rows
+from training_runner import TRAIN_CORES, regression_metrics
+import warnings
+warnings.filterwarnings('ignore')
+
+DATA_PATH = 'weather_environmental_data.csv'
+
+# Models that can be backtested (the production configurations)
+MODELS = {
+    'random_forest': lambda: RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=1),
+    'decision_tree': lambda: DecisionTreeRegressor(random_state=42),
+    'linear_regression': lambda: LinearRegression()
+}
+
+# Preprocessed arrays shared with the workers (set before the pool starts)
+_arrays = {}
+
+
+# ============================================================================
+# DATA AND FOLDS
+# ============================================================================
+
+def load_arrays(path):
+    """
+    Parse the dataset once into feature, target and month-index arrays
+    """
+    data = load_rows(path)
+    stamps = data[WATERMARK_COLUMN].str
+    month_index = stamps[:4].astype(int).values * 12 + stamps[5:7].astype(int).values - 1
+    return {
+        'X': np.ascontiguousarray(data[FEATURE_COLUMNS].values, dtype=np.float64),
+        'y': data[TARGET_COLUMN].values.astype(np.float64),
+        'month': month_index
+    }
+
+
+def month_label(index):
+    return f'{index // 12}-{index % 12 + 1:02d}'
+
+
+def make_folds(months, window, window_months, min_train_months):
+    """
+    (first training month, test month) pairs; training covers every month
+    from the first one up to, not including, the test month
+    """
+    months = sorted(set(months))
+    folds = []
+    for position in range(min_train_months, len(months)):
+        first = 0 if window == 'expanding' else max(0, position - window_months)
+        folds.append((months[first], months[position]))
+    return folds
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def _init_worker(arrays):
+    _arrays.update(arrays)
+
+
+def run_fold(model_name, first_month, test_month):
+    """
+    Fit on [first_month, test_month) and score on test_month (runs in a
+    worker process)
+    """
+    X, y, month = _arrays['X'], _arrays['y'], _arrays['month']
+    train = (month >= first_month) & (month < test_month)
+    test = month == test_month
+
+    started = time.perf_counter()
+    scaler = StandardScaler().fit(X[train])
+    model = MODELS[model_name]()
+    model.fit(scaler.transform(X[train]), y[train])
+    fit_seconds = time.perf_counter() - started
+    predictions = model.predict(scaler.transform(X[test]))
+
+    daylight = y[test] > 0
+    return {
+        'first_month': first_month,
+        'test_month': test_month,
+        'train_rows': int(train.sum()),
+        'test_rows': int(test.sum()),
+        'fit_seconds': fit_seconds,
+        'seconds': time.perf_counter() - started,
+        'metrics': regression_metrics(y[test], predictions),
+        'daylight_mae': float(np.abs(predictions - y[test])[daylight].mean()),
+        'pid': os.getpid()
+    }
+
+
+# ============================================================================
+# BACKTEST
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest')
+    parser.add_argument('--model', choices=sorted(MODELS), default='random_forest')
+    parser.add_argument('--window', choices=['expanding', 'sliding'], default='expanding')
+    parser.add_argument('--window-months', type=int, default=12,
+                        help='training months of a sliding window')
+    parser.add_argument('--min-train-months', type=int, default=12,
+                        help='months before the first test month')
+    parser.add_argument('--workers', type=int, default=TRAIN_CORES)
+    args = parser.parse_args()
+
+    print("="*80)
+    print("ROLLING-ORIGIN BACKTEST")
+    print("="*80)
+    print()
+
+    started = time.perf_counter()
+    print("STEP 1: Parsing the dataset once...")
+    arrays = load_arrays(DATA_PATH)
+    folds = make_folds(arrays['month'], args.window, args.window_months, args.min_train_months)
+    if not folds:
+        print(f"✗ Not enough months for {args.min_train_months} training months before a test month")
+        return
+    print(f"✓ {len(arrays['y'])} rows, {len(set(arrays['month']))} months "
+          f"in {time.perf_counter() - started:.2f} s")
+    print(f"✓ {len(folds)} folds, {args.window} window"
+          + (f" of {args.window_months} months" if args.window == 'sliding' else '')
+          + f", model {args.model}, {args.workers} worker(s)")
+    print()
+
+    print("STEP 2: Running folds in parallel...")
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(arrays,)) as pool:
+        futures = [pool.submit(run_fold, args.model, first, test) for first, test in folds]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"✓ {month_label(result['test_month'])} done "
+                  f"({result['seconds']:.1f} s, worker {result['pid']})")
+    total_wall = time.perf_counter() - started
+    results.sort(key=lambda result: result['test_month'])
+    print()
+
+    print("STEP 3: Per-fold metrics (test month never seen in training)...")
+    print(f"{'Test month':<12}{'Training':>19}{'Train rows':>12}{'Test rows':>11}"
+          f"{'MAE':>8}{'RMSE':>8}{'R²':>8}{'Day MAE':>9}{'Fit':>8}")
+    print("-"*95)
+    for result in results:
+        metrics = result['metrics']
+        training = f"{month_label(result['first_month'])}..{month_label(result['test_month'] - 1)}"
+        print(f"{month_label(result['test_month']):<12}{training:>19}{result['train_rows']:>12}"
+              f"{result['test_rows']:>11}{metrics['mae']:>8.2f}{metrics['rmse']:>8.2f}"
+              f"{metrics['r2']:>8.4f}{result['daylight_mae']:>9.2f}{result['fit_seconds']:>6.1f} s")
+    print("-"*95)
+
+    maes = np.array([result['metrics']['mae'] for result in results])
+    weights = np.array([result['test_rows'] for result in results])
+    fold_seconds = sum(result['seconds'] for result in results)
+    print(f"Mean MAE {np.average(maes, weights=weights):.2f} W/m² "
+          f"(best {maes.min():.2f}, worst {maes.max():.2f} in "
+          f"{month_label(results[int(maes.argmax())]['test_month'])})")
+    print(f"Total wall-clock {total_wall:.1f} s for {fold_seconds:.1f} s of fold work "
+          f"({fold_seconds / total_wall:.1f}x parallel)")
+    print()
+
+    print("="*80)
+    print("BACKTEST COMPLETE")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+================================================================================
+COMPACT MODEL BENCHMARK - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Compare random_forest_model.pkl with the portable .npz forest
+         (portable_model.py, compact_forest.py encoding) at several pruning
+         tolerances: file size,
+         load time, resident memory, latency and test-set accuracy
+         (run after save_model.py)
+================================================================================
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+import joblib
+import numpy as np
+from compact_forest import prune_forest
+from forest_engine import CompiledForest
+from portable_model import load_portable, save_portable
+from prepared_data import load_prepared
+from sklearn.metrics import mean_absolute_error, r2_score
+
+warnings.filterwarnings('ignore')
+
+MODEL_PATH = 'random_forest_model.pkl'
+
+# Pruning tolerances (W/m²) exported and compared; 0 is lossless
+PRUNE_TOLERANCES = [0.0, 1.0, 5.0, 20.0]
+
+# Loads each artifact in a fresh interpreter the way model_store.py does
+# (read, deserialize, compile, fuse the scaler or verify the stored fusion)
+# and prints the seconds taken and the growth of resident memory in kB
+LOAD_PROBE = """
+import sys, time, joblib, numpy as np
+from forest_engine import CompiledForest
+from portable_model import load_portable
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        return int(f.read().split('VmRSS:')[1].split()[0])
+
+path = sys.argv[1]
+scaler = joblib.load('scaler.pkl')
+before = rss_kb()
+started = time.perf_counter()
+if path.endswith('.npz'):
+    model, _, _, engine = load_portable(path)
+    assert model.verify_fusion(engine, scaler) == 0
+else:
+    model = joblib.load(path)
+    engine = CompiledForest.from_sklearn(model).fuse_scaler(scaler)
+print(time.perf_counter() - started, rss_kb() - before)
+"""
+
+print("="*80)
+print("COMPACT MODEL BENCHMARK")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: LOAD MODEL, SCALER AND TEST SET
+# ============================================================================
+
+print("STEP 1: Loading model, scaler and test set...")
+model = joblib.load(MODEL_PATH)
+scaler = joblib.load('scaler.pkl')
+data = load_prepared()
+X_test, y_test = data['X_test'].values, data['y_test'].values
+reference = model.predict(X_test)
+forest = CompiledForest.from_sklearn(model)
+print(f"✓ {forest.n_trees} trees, {forest.n_nodes} nodes, {len(y_test)} test rows")
+print()
+
+# ============================================================================
+# STEP 2: EXPORT PORTABLE ARTIFACTS
+# ============================================================================
+
+print("STEP 2: Exporting portable forests...")
+work_dir = tempfile.mkdtemp(prefix='portable_forest_')
+feature_names = list(data['X_test'].columns)
+variants = [('pickle', MODEL_PATH, model.predict, forest.n_nodes, forest.max_depth)]
+for tolerance in PRUNE_TOLERANCES:
+    pruned = prune_forest(forest, tolerance)
+    path = os.path.join(work_dir, f'portable_tol{tolerance:g}.npz')
+    save_portable(model, scaler, path, feature_names, forest=pruned,
+                  metadata={'prune_tolerance': tolerance})
+    portable = load_portable(path)[0]
+    variants.append((f'portable, tol {tolerance:g}', path, portable.predict,
+                     portable.n_nodes, portable.max_depth))
+    print(f"✓ Tolerance {tolerance:g} W/m²: {pruned.n_nodes} nodes "
+          f"({1 - pruned.n_nodes / forest.n_nodes:.1%} pruned)")
+print()
+
+# ============================================================================
+# STEP 3: SIZE, LOAD TIME AND RESIDENT MEMORY
+# ============================================================================
+
+print("STEP 3: Size, load time and resident memory (fresh process, best of 3)...")
+print(f"{'Artifact':<18}{'Nodes':>10}{'Depth':>7}{'File':>10}{'Load + compile':>16}{'RSS growth':>13}")
+print("-"*80)
+env = dict(os.environ, PYTHONPATH=os.getcwd(), PYTHONWARNINGS='ignore')
+for label, path, _, n_nodes, max_depth in variants:
+    runs = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', LOAD_PROBE, path], env=env,
+                                capture_output=True, text=True, check=True).stdout
+        seconds, rss_kb = output.split()
+        runs.append((float(seconds), int(rss_kb)))
+    seconds = min(run[0] for run in runs)
+    rss_mb = min(run[1] for run in runs) / 1024
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"{label:<18}{n_nodes:>10}{max_depth:>7}{size_mb:>7.1f} MB{seconds:>14.2f} s{rss_mb:>10.0f} MB")
+print()
+
+# ============================================================================
+# STEP 4: ACCURACY ON THE TEST SET
+# ============================================================================
+
+print("STEP 4: Accuracy on the prepared test set...")
+base_mae = mean_absolute_error(y_test, reference)
+base_r2 = r2_score(y_test, reference)
+print(f"{'Artifact':<18}{'MAE':>10}{'ΔMAE':>11}{'R²':>10}{'ΔR²':>12}{'Max |Δ| vs pickle':>20}")
+print("-"*80)
+for label, _, predict, _, _ in variants:
+    predictions = predict(X_test)
+    mae = mean_absolute_error(y_test, predictions)
+    r2 = r2_score(y_test, predictions)
+    max_change = np.abs(predictions - reference).max()
+    print(f"{label:<18}{mae:>10.3f}{mae - base_mae:>+11.4f}{r2:>10.5f}{r2 - base_r2:>+12.6f}"
+          f"{max_change:>15.4f} W/m²")
+print()
+
+# ============================================================================
+# STEP 5: PREDICTION LATENCY (SCALER FUSED)
+# ============================================================================
+
+print("STEP 5: Compiled-engine latency with the scaler fused...")
+rng = np.random.default_rng(42)
+X_raw = np.column_stack([
+    rng.uniform(-10, 50, 1000),
+    rng.uniform(0, 100, 1000),
+    rng.uniform(0, 100, 1000),
+    rng.integers(7, 18, 1000),
+    rng.integers(1, 13, 1000)
+]).astype(float)
+
+print(f"{'Artifact':<18}{'1 row':>12}{'1000 rows':>14}")
+print("-"*80)
+for label, path, _, _, _ in variants:
+    engine = load_portable(path)[3] if path.endswith('.npz') else forest.fuse_scaler(scaler)
+    timings = []
+    for rows, calls in [(X_raw[:1], 1000), (X_raw, 5)]:
+        engine.predict(rows)
+        started = time.perf_counter()
+        for _ in range(calls):
+            engine.predict(rows)
+        timings.append((time.perf_counter() - started) / calls)
+    print(f"{label:<18}{timings[0] * 1e6:>9.1f} µs{timings[1] * 1e3:>11.1f} ms")
+print()
+
+print("The pickle row loads the sklearn forest and compiles it, as the service")
+print("does with MODEL_FORMAT=pickle; portable rows need no unpickling, keep")
+print("no sklearn object in memory and read the fused thresholds precomputed.")
+print("Pruning bounds each prediction change by the tolerance. Set")
+print("COMPACT_PRUNE_TOLERANCE in save_model.py to ship one.")
+print()
+
+print("="*80)
+print("BENCHMARK COMPLETE")
+print("="*80)
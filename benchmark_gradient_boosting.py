@@ -0,0 +1,161 @@
+"""
+================================================================================
+GRADIENT BOOSTING BENCHMARK - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Compare the Histogram Gradient Boosting model with the production
+         Random Forest: training time, single-row and batch latency,
+         artifact size and test-set accuracy
+
+Both models are fitted from scratch (not through the model cache) with the
+configurations save_model.py ships, capped at TRAIN_CORES threads. Latency
+is measured on the service's two paths: the compiled engine with the
+scaler fused (forest_engine.py, used up to COMPILED_MAX_ROWS rows) and
+scaler + sklearn (larger batches with pickled models).
+================================================================================
+"""
+
+import os
+import tempfile
+import time
+import warnings
+import joblib
+import numpy as np
+from portable_model import load_portable, save_portable
+from prepared_data import load_prepared
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+from threadpoolctl import threadpool_limits
+from training_runner import TRAIN_CORES
+
+warnings.filterwarnings('ignore')
+
+# Production configurations (save_model.py MODELS)
+MODELS = {
+    'random_forest': RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=TRAIN_CORES),
+    'gradient_boosting': HistGradientBoostingRegressor(max_iter=500, max_leaf_nodes=63,
+                                                       max_depth=10, random_state=42)
+}
+
+# Batch sizes timed (512 is COMPILED_MAX_ROWS in app.py)
+BATCH_SIZES = [1, 512, 5000]
+
+print("="*80)
+print("GRADIENT BOOSTING BENCHMARK")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: DATA
+# ============================================================================
+
+print("STEP 1: Loading training and test sets...")
+data = load_prepared()
+X_train, y_train = data['X_train'], data['y_train']
+X_test, y_test = data['X_test'], data['y_test'].values
+scaler = joblib.load('scaler.pkl')
+feature_names = list(X_train.columns)
+
+# Raw daylight rows in the service's validation ranges
+rng = np.random.default_rng(42)
+X_raw = np.column_stack([
+    rng.uniform(-10, 50, max(BATCH_SIZES)),
+    rng.uniform(0, 100, max(BATCH_SIZES)),
+    rng.uniform(0, 100, max(BATCH_SIZES)),
+    rng.integers(7, 18, max(BATCH_SIZES)),
+    rng.integers(1, 13, max(BATCH_SIZES))
+]).astype(float)
+print(f"✓ {len(X_train)} training rows, {len(y_test)} test rows, {TRAIN_CORES} thread(s)")
+print()
+
+# ============================================================================
+# STEP 2: TRAINING, SIZE AND ACCURACY
+# ============================================================================
+
+print("STEP 2: Training each model...")
+work_dir = tempfile.mkdtemp(prefix='gradient_boosting_')
+results = {}
+for name, model in MODELS.items():
+    with threadpool_limits(limits=TRAIN_CORES):
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+
+    pickle_path = os.path.join(work_dir, f'{name}.pkl')
+    joblib.dump(model, pickle_path)
+    portable_path = os.path.join(work_dir, f'{name}.npz')
+    save_portable(model, scaler, portable_path, feature_names)
+    engine = load_portable(portable_path)[3]
+
+    predictions = model.predict(X_test)
+    results[name] = {
+        'model': model,
+        'engine': engine,
+        'fit_seconds': fit_seconds,
+        'pickle_mb': os.path.getsize(pickle_path) / 1e6,
+        'portable_mb': os.path.getsize(portable_path) / 1e6,
+        'mae': mean_absolute_error(y_test, predictions),
+        'r2': r2_score(y_test, predictions)
+    }
+    print(f"✓ {name}: {engine.n_trees} trees, {engine.n_nodes} nodes, depth {engine.max_depth}, "
+          f"fitted in {fit_seconds:.2f} s")
+print()
+
+print(f"{'Model':<20}{'Fit':>9}{'Pickle':>10}{'Portable':>11}{'Test MAE':>10}{'Test R²':>10}")
+print("-"*80)
+for name, result in results.items():
+    print(f"{name:<20}{result['fit_seconds']:>7.2f} s{result['pickle_mb']:>7.1f} MB"
+          f"{result['portable_mb']:>8.1f} MB{result['mae']:>10.3f}{result['r2']:>10.5f}")
+print()
+
+# ============================================================================
+# STEP 3: PREDICTION LATENCY
+# ============================================================================
+
+
+def seconds_per_call(predict, rows, min_seconds=0.3):
+    """
+    Fastest of repeated timings of predict(rows)
+    """
+    predict(rows)
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(timings) < 5:
+        started = time.perf_counter()
+        predict(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+print("STEP 3: Prediction latency on raw daylight rows (best of repeated calls)...")
+print(f"{'Model':<20}{'Path':<18}" + ''.join(f"{f'{n} row' + ('s' if n > 1 else ''):>14}" for n in BATCH_SIZES))
+print("-"*80)
+for name, result in results.items():
+    model, engine = result['model'], result['engine']
+    paths = [('compiled, fused', engine.predict),
+             ('scaler + sklearn', lambda rows: model.predict(scaler.transform(rows)))]
+    for label, predict in paths:
+        cells = []
+        for n in BATCH_SIZES:
+            seconds = seconds_per_call(predict, X_raw[:n])
+            cells.append(f"{seconds * 1e6:>11.1f} µs" if n == 1 else f"{seconds * 1e3:>11.2f} ms")
+        print(f"{name:<20}{label:<18}" + ''.join(cells))
+print()
+
+forest, boosting = results['random_forest'], results['gradient_boosting']
+print("Summary:")
+print(f"  Training:  {forest['fit_seconds'] / boosting['fit_seconds']:.1f}x faster "
+      f"({boosting['fit_seconds']:.2f} s vs {forest['fit_seconds']:.2f} s)")
+print(f"  Portable:  {forest['portable_mb'] / boosting['portable_mb']:.1f}x smaller "
+      f"({boosting['portable_mb']:.1f} MB vs {forest['portable_mb']:.1f} MB)")
+print(f"  Accuracy:  test R² {boosting['r2']:.5f} vs {forest['r2']:.5f}, "
+      f"MAE {boosting['mae']:.3f} vs {forest['mae']:.3f} W/m²")
+print("  Serve it with ?model=gradient_boosting (save_model.py writes it).")
+print()
+
+print("="*80)
+print("BENCHMARK COMPLETE")
+print("="*80)
@@ -0,0 +1,132 @@
+"""
+================================================================================
+INCREMENTAL RETRAINING BENCHMARK - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Time-to-retrain and accuracy of rolling tree updates
+         (incremental_training.py) against a full refit on the same data
+
+The dataset is replayed month by month: a forest is fully trained up to
+START_WATERMARK, then each following month of rows is added either by
+replacing k trees (for each k in TREES_REPLACED) or by refitting all 100
+trees. Both see exactly the same training rows; both are scored on the
+held-out rows of the new month (never trained on by either) and on every
+held-out row so far.
+================================================================================
+"""
+
+import copy
+import time
+import warnings
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+from incremental_training import (TARGET_COLUMN, WATERMARK_COLUMN, holdout_mask, load_rows,
+                                  rolling_update, scaled_features, update_seed)
+
+warnings.filterwarnings('ignore')
+
+# Initial full training covers rows up to here; later months are increments
+START_WATERMARK = '2023-06-30 23:00:00'
+
+# Trees replaced per monthly update
+TREES_REPLACED = [10, 20, 50]
+
+N_ESTIMATORS = 100
+
+print("="*80)
+print("INCREMENTAL RETRAINING BENCHMARK")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: DATA AND INITIAL FOREST
+# ============================================================================
+
+print("STEP 1: Loading data and training the initial forest...")
+scaler = joblib.load('scaler.pkl')
+data = load_rows('weather_environmental_data.csv')
+data['is_holdout'] = holdout_mask(data)
+data['period'] = data[WATERMARK_COLUMN].str[:7]
+X_all = scaled_features(data, scaler)
+y_all = data[TARGET_COLUMN]
+
+
+def rows_up_to(watermark):
+    return ((data[WATERMARK_COLUMN] <= watermark) & ~data['is_holdout']).values
+
+
+initial = rows_up_to(START_WATERMARK)
+base = RandomForestRegressor(n_estimators=N_ESTIMATORS, random_state=42)
+started = time.perf_counter()
+base.fit(X_all[initial], y_all[initial])
+print(f"✓ {initial.sum()} training rows up to {START_WATERMARK}, "
+      f"fitted in {time.perf_counter() - started:.1f} s")
+print()
+
+# ============================================================================
+# STEP 2: MONTHLY UPDATES
+# ============================================================================
+
+print("STEP 2: Monthly updates...")
+months = sorted(data.loc[data[WATERMARK_COLUMN] > START_WATERMARK, 'period'].unique())
+forests = {k: copy.deepcopy(base) for k in TREES_REPLACED}
+
+header = f"{'Month':<9}{'Rows':>7}{'Full refit':>12}" + ''.join(f"{f'k={k}':>10}" for k in TREES_REPLACED)
+print(f"{'':<28}Time to retrain")
+print(header)
+print("-"*80)
+results = []
+for month in months:
+    watermark = data.loc[data['period'] == month, WATERMARK_COLUMN].max()
+    training = rows_up_to(watermark)
+    new_holdout = ((data['period'] == month) & data['is_holdout']).values
+    all_holdout = ((data[WATERMARK_COLUMN] <= watermark) & data['is_holdout']).values
+
+    full = RandomForestRegressor(n_estimators=N_ESTIMATORS, random_state=42)
+    started = time.perf_counter()
+    full.fit(X_all[training], y_all[training])
+    row = {'month': month, 'rows': int(training.sum()), 'full_seconds': time.perf_counter() - started,
+           'mae': {'full': (mean_absolute_error(y_all[new_holdout], full.predict(X_all[new_holdout])),
+                            mean_absolute_error(y_all[all_holdout], full.predict(X_all[all_holdout])))}}
+    for k, forest in forests.items():
+        started = time.perf_counter()
+        rolling_update(forest, X_all[training], y_all[training], k, update_seed(watermark))
+        row[k] = time.perf_counter() - started
+        row['mae'][k] = (mean_absolute_error(y_all[new_holdout], forest.predict(X_all[new_holdout])),
+                         mean_absolute_error(y_all[all_holdout], forest.predict(X_all[all_holdout])))
+    results.append(row)
+    print(f"{month:<9}{row['rows']:>7}{row['full_seconds']:>10.1f} s"
+          + ''.join(f"{row[k]:>8.1f} s" for k in TREES_REPLACED))
+print()
+
+# ============================================================================
+# STEP 3: ACCURACY AGAINST A FULL REFIT
+# ============================================================================
+
+print("STEP 3: MAE on the new month's held-out rows / all held-out rows so far...")
+print(f"{'Month':<9}{'Full refit':>16}" + ''.join(f"{f'k={k}':>16}" for k in TREES_REPLACED))
+print("-"*80)
+for row in results:
+    cells = [f"{row['mae'][key][0]:>7.2f} /{row['mae'][key][1]:>6.2f}" for key in ['full'] + TREES_REPLACED]
+    print(f"{row['month']:<9}" + ''.join(f"{cell:>16}" for cell in cells))
+print()
+
+print("Summary over all updates:")
+full_time = np.mean([row['full_seconds'] for row in results])
+full_mae = np.mean([row['mae']['full'][1] for row in results])
+print(f"  Full refit:   {full_time:5.1f} s per update, mean holdout MAE {full_mae:.3f} W/m²")
+for k in TREES_REPLACED:
+    k_time = np.mean([row[k] for row in results])
+    k_mae = np.mean([row['mae'][k][1] for row in results])
+    print(f"  k={k:<3} trees: {k_time:5.1f} s per update ({full_time / k_time:4.1f}x faster), "
+          f"mean holdout MAE {k_mae:.3f} W/m² ({k_mae - full_mae:+.3f})")
+print()
+
+print("="*80)
+print("BENCHMARK COMPLETE")
+print("="*80)
@@ -0,0 +1,143 @@
+"""
+================================================================================
+PREDICTION INTERVAL BENCHMARK - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Measure the cost of per-tree quantiles on top of a plain
+         prediction and check how often the intervals contain the
+         actual irradiance on the held-out test set
+================================================================================
+"""
+
+import time
+import warnings
+import joblib
+import numpy as np
+from forest_engine import (CompiledForest, forest_mean, sklearn_tree_predictions,
+                           tree_quantiles)
+from prepared_data import load_prepared
+
+warnings.filterwarnings('ignore')
+
+QUANTILES = [0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95]
+
+# (lower quantile, upper quantile, nominal coverage) checked on the test set
+INTERVALS = [(0.25, 0.75, 0.50), (0.1, 0.9, 0.80), (0.05, 0.95, 0.90)]
+
+print("="*80)
+print("PREDICTION INTERVAL BENCHMARK")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: LOAD MODEL AND BUILD ENGINES
+# ============================================================================
+
+print("STEP 1: Loading model and scaler...")
+model = joblib.load('random_forest_model.pkl')
+scaler = joblib.load('scaler.pkl')
+engine = CompiledForest.from_sklearn(model)
+fused_engine = engine.fuse_scaler(scaler)
+print(f"✓ {engine.n_trees} trees, {engine.n_nodes} nodes")
+print()
+
+
+def compare_us(plain_fn, quantile_fn, n_calls, repeats=7):
+    """
+    Median time per call (µs) of two functions, timed in alternating
+    rounds so machine noise affects both alike
+    """
+    plain_fn()
+    quantile_fn()
+    timings = {plain_fn: [], quantile_fn: []}
+    for _ in range(repeats):
+        for fn in (plain_fn, quantile_fn):
+            start = time.perf_counter()
+            for _ in range(n_calls):
+                fn()
+            timings[fn].append((time.perf_counter() - start) / n_calls * 1e6)
+    return float(np.median(timings[plain_fn])), float(np.median(timings[quantile_fn]))
+
+
+# ============================================================================
+# STEP 2: OVERHEAD OF QUANTILES OVER A PLAIN PREDICTION
+# ============================================================================
+
+print("STEP 2: Measuring quantile overhead (P10/P50/P90)...")
+q = [0.1, 0.5, 0.9]
+rng = np.random.default_rng(42)
+X_raw = np.column_stack([
+    rng.uniform(-10, 50, 10000),
+    rng.uniform(0, 100, 10000),
+    rng.uniform(0, 100, 10000),
+    rng.integers(0, 24, 10000),
+    rng.integers(1, 13, 10000)
+]).astype(float)
+
+print(f"{'Rows':>7}  {'Path':<22}{'Mean only':>14}{'Mean + P10/50/90':>20}{'Overhead':>12}")
+print("-"*80)
+for n_rows, n_calls in [(1, 2000), (24, 500), (64, 200)]:
+    X = X_raw[:n_rows]
+    plain, with_q = compare_us(lambda: fused_engine.predict(X),
+                               lambda: fused_engine.predict_quantiles(X, q), n_calls)
+    print(f"{n_rows:>7}  {'compiled (fused)':<22}{plain:>11.1f} µs{with_q:>17.1f} µs"
+          f"{(with_q - plain) / plain:>11.1%}")
+
+X_scaled = scaler.transform(X_raw)
+
+
+def sklearn_with_quantiles():
+    tree_values = sklearn_tree_predictions(model, X_scaled)
+    return forest_mean(tree_values), tree_quantiles(tree_values, q)
+
+
+plain, with_q = compare_us(lambda: model.predict(X_scaled), sklearn_with_quantiles, 1, repeats=5)
+print(f"{len(X_raw):>7}  {'sklearn per-tree':<22}{plain / 1000:>11.1f} ms{with_q / 1000:>17.1f} ms"
+      f"{(with_q - plain) / plain:>11.1%}")
+
+# The mean from per-tree values must be exactly model.predict
+mean, _ = sklearn_with_quantiles()
+print(f"✓ Mean from per-tree values matches model.predict exactly: "
+      f"{np.array_equal(mean, model.predict(X_scaled))}")
+print()
+
+# ============================================================================
+# STEP 3: COVERAGE ON THE TEST SET
+# ============================================================================
+
+print("STEP 3: Interval coverage on the prepared test set...")
+data = load_prepared()
+X_test, y_test = data['X_test'].values, data['y_test'].values
+
+tree_values = sklearn_tree_predictions(model, X_test)
+quantile_values = np.maximum(tree_quantiles(tree_values, QUANTILES), 0.0)
+column = {quantile: i for i, quantile in enumerate(QUANTILES)}
+daylight = y_test > 0
+print(f"✓ {len(y_test)} test rows ({daylight.sum()} with irradiance > 0)")
+print()
+
+print(f"{'Interval':<12}{'Nominal':>9}{'All rows':>11}{'Daylight':>11}{'Mean width':>13}")
+print("-"*80)
+for lower, upper, nominal in INTERVALS:
+    low = quantile_values[:, column[lower]]
+    high = quantile_values[:, column[upper]]
+    inside = (y_test >= low) & (y_test <= high)
+    width = (high - low)[daylight].mean()
+    label = f"P{lower * 100:g}-P{upper * 100:g}"
+    print(f"{label:<12}{nominal:>9.0%}{inside.mean():>11.1%}{inside[daylight].mean():>11.1%}"
+          f"{width:>9.1f} W/m²")
+
+below_median = (y_test < quantile_values[:, column[0.5]])[daylight].mean()
+print(f"\nDaylight rows below P50: {below_median:.1%} (50% if calibrated)")
+print()
+print("Per-tree quantiles describe disagreement between the trees, not the")
+print("noise in the measurements, so coverage below nominal means the bands")
+print("are narrower than the true error and should be read as model spread.")
+print()
+
+print("="*80)
+print("BENCHMARK COMPLETE")
+print("="*80)
@@ -0,0 +1,167 @@
+"""
+================================================================================
+SOLAR FEATURE BENCHMARK - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Compare the raw and solar feature sets (feature_stage.py) across
+         model sizes: test accuracy, model size, training time and
+         prediction latency including the feature stage
+
+Both feature sets are built from the same cleaned rows and split with the
+same 80/20 split as prepare_prediction_data.py, each with its own scaler.
+Latency is measured on the service's compiled engine with the scaler fused
+(forest_engine.py): the raw set feeds the request rows directly, the solar
+set first runs them through build_features, as app.py does.
+================================================================================
+"""
+
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from feature_stage import FEATURE_SETS, RAW_FEATURES, build_features
+from forest_engine import compile_model
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+from threadpoolctl import threadpool_limits
+from training_runner import TRAIN_CORES
+
+warnings.filterwarnings('ignore')
+
+# Candidate models, from the production forest down to small ones
+MODELS = {
+    'RF 100 trees': lambda: RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=TRAIN_CORES),
+    'RF 20, depth 12': lambda: RandomForestRegressor(n_estimators=20, max_depth=12, random_state=42,
+                                                     n_jobs=TRAIN_CORES),
+    'RF 10, depth 10': lambda: RandomForestRegressor(n_estimators=10, max_depth=10, random_state=42,
+                                                     n_jobs=TRAIN_CORES),
+    'DT depth 10': lambda: DecisionTreeRegressor(max_depth=10, random_state=42),
+    'HGB': lambda: HistGradientBoostingRegressor(max_iter=500, max_leaf_nodes=63, max_depth=10,
+                                                 random_state=42)
+}
+
+# Batch sizes timed (512 is COMPILED_MAX_ROWS in app.py)
+BATCH_SIZES = [1, 512]
+
+
+def seconds_per_call(predict, rows, min_seconds=0.3):
+    """
+    Fastest of repeated timings of predict(rows)
+    """
+    predict(rows)
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(timings) < 5:
+        started = time.perf_counter()
+        predict(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+print("="*80)
+print("SOLAR FEATURE BENCHMARK")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: DATA
+# ============================================================================
+
+print("STEP 1: Loading the dataset and splitting it as prepare_prediction_data.py...")
+df = pd.read_csv('weather_environmental_data.csv')
+df = df[RAW_FEATURES + ['solar_irradiance']].dropna()
+raw_train, raw_test, y_train, y_test = train_test_split(
+    df[RAW_FEATURES].values, df['solar_irradiance'].values, test_size=0.2, random_state=42)
+
+# Raw daylight request rows in the service's validation ranges
+rng = np.random.default_rng(42)
+X_requests = np.column_stack([
+    rng.uniform(-10, 50, max(BATCH_SIZES)),
+    rng.uniform(0, 100, max(BATCH_SIZES)),
+    rng.uniform(0, 100, max(BATCH_SIZES)),
+    rng.integers(7, 18, max(BATCH_SIZES)),
+    rng.integers(1, 13, max(BATCH_SIZES))
+]).astype(float)
+print(f"✓ {len(y_train)} training rows, {len(y_test)} test rows, {TRAIN_CORES} thread(s)")
+print()
+
+# ============================================================================
+# STEP 2: TRAINING AND LATENCY PER FEATURE SET
+# ============================================================================
+
+print("STEP 2: Training and timing each model on both feature sets...")
+results = []
+for feature_set in FEATURE_SETS:
+    scaler = StandardScaler().fit(build_features(raw_train, feature_set))
+    X_train = scaler.transform(build_features(raw_train, feature_set))
+    X_test = scaler.transform(build_features(raw_test, feature_set))
+
+    for name, make_model in MODELS.items():
+        model = make_model()
+        with threadpool_limits(limits=TRAIN_CORES):
+            started = time.perf_counter()
+            model.fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - started
+        predictions = model.predict(X_test)
+
+        # The service path: feature stage, then the fused compiled engine
+        engine = compile_model(model).fuse_scaler(scaler)
+
+        def predict(rows):
+            return engine.predict(build_features(rows, feature_set))
+
+        result = {
+            'model': name,
+            'feature_set': feature_set,
+            'nodes': engine.n_nodes,
+            'fit_seconds': fit_seconds,
+            'mae': mean_absolute_error(y_test, predictions),
+            'r2': r2_score(y_test, predictions),
+            'latency': {n: seconds_per_call(predict, X_requests[:n]) for n in BATCH_SIZES}
+        }
+        results.append(result)
+        print(f"✓ {name} ({feature_set}): MAE {result['mae']:.3f} W/m², fitted in {fit_seconds:.2f} s")
+print()
+
+# ============================================================================
+# STEP 3: RESULTS
+# ============================================================================
+
+print("STEP 3: Results (latency = feature stage + fused compiled engine)")
+print(f"{'Model':<18}{'Features':<10}{'Test MAE':>10}{'Test R²':>10}{'Nodes':>10}{'Fit':>9}"
+      f"{'1 row':>11}{'512 rows':>11}")
+print("-"*89)
+for result in results:
+    print(f"{result['model']:<18}{result['feature_set']:<10}{result['mae']:>10.3f}{result['r2']:>10.5f}"
+          f"{result['nodes']:>10}{result['fit_seconds']:>7.2f} s"
+          f"{result['latency'][1] * 1e6:>8.1f} µs{result['latency'][512] * 1e3:>8.2f} ms")
+print()
+
+stage_seconds = seconds_per_call(lambda rows: build_features(rows, 'solar'), X_requests[:1])
+production = next(r for r in results if r['model'] == 'RF 100 trees' and r['feature_set'] == 'raw')
+smaller = [r for r in results if r['feature_set'] == 'solar' and r['mae'] <= production['mae']]
+print("Summary:")
+print(f"  Solar feature stage: {stage_seconds * 1e6:.1f} µs per request row")
+print(f"  Production forest on raw features: MAE {production['mae']:.3f} W/m², "
+      f"{production['nodes']} nodes, {production['latency'][1] * 1e6:.1f} µs per row")
+if smaller:
+    best = min(smaller, key=lambda r: r['latency'][1])
+    print(f"  Fastest solar model at least as accurate: {best['model']}, MAE {best['mae']:.3f} W/m², "
+          f"{best['nodes']} nodes ({production['nodes'] / best['nodes']:.0f}x fewer), "
+          f"{best['latency'][1] * 1e6:.1f} µs per row "
+          f"({production['latency'][1] / best['latency'][1]:.1f}x faster)")
+else:
+    print("  ⚠ No solar model reached the production forest's accuracy")
+print("  Train with the solar set: FEATURE_SET=solar python prepare_prediction_data.py, "
+      "then save_model.py.")
+print()
+
+print("="*80)
+print("BENCHMARK COMPLETE")
+print("="*80)
@@ -0,0 +1,134 @@
+"""
+================================================================================
+STARTUP BENCHMARK - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Time-to-first-prediction of the pickled artifacts versus the
+         portable NumPy files (portable_model.py), each in a fresh
+         interpreter, for the bare model and for the whole service
+         (run after save_model.py)
+================================================================================
+"""
+
+import os
+import subprocess
+import sys
+
+# Fresh interpreters per measurement; the best run is reported
+RUNS = 3
+
+# Bare model: import the loader, load forest and scaler, predict one row
+MODEL_PROBE = """
+import sys, time
+started = time.perf_counter()
+import numpy as np
+row = np.array([[25.0, 20.0, 50.0, 12, 6]])
+if sys.argv[1] == 'pickle':
+    import joblib
+    model = joblib.load('random_forest_model.pkl')
+    scaler = joblib.load('scaler.pkl')
+    loaded = time.perf_counter()
+    prediction = model.predict(scaler.transform(row))[0]
+else:
+    from portable_model import load_portable
+    model, scaler, header, fused = load_portable('random_forest_model.npz')
+    loaded = time.perf_counter()
+    prediction = model.predict(scaler.transform(row))[0]
+first = time.perf_counter()
+with open('/proc/self/status') as f:
+    peak_kb = int(f.read().split('VmHWM:')[1].split()[0])
+print(loaded - started, first - started, peak_kb, 'sklearn' in sys.modules, prediction)
+"""
+
+# Whole service: import app.py (which loads, compiles and warms the model
+# bundle) and answer one /predict request through the Flask test client
+SERVICE_PROBE = """
+import sys, time
+started = time.perf_counter()
+import app
+loaded = time.perf_counter()
+response = app.app.test_client().post('/predict', json={
+    'temperature': 25, 'humidity': 50, 'cloud_cover': 20, 'hour': 12, 'month': 6})
+first = time.perf_counter()
+with open('/proc/self/status') as f:
+    peak_kb = int(f.read().split('VmHWM:')[1].split()[0])
+print(loaded - started, first - started, peak_kb, 'sklearn' in sys.modules,
+      response.get_json()['predicted_solar_irradiance'])
+"""
+
+
+def best_of(probe, model_format):
+    """
+    Run a probe RUNS times in fresh interpreters and return the fastest
+    (load seconds, first-prediction seconds, peak RSS MB, sklearn imported,
+    prediction)
+    """
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), PYTHONWARNINGS='ignore',
+               MODEL_FORMAT=model_format, RELOAD_POLL_SECONDS='0')
+    runs = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, '-c', probe, model_format], env=env,
+                                capture_output=True, text=True, check=True).stdout
+        load_s, first_s, peak_kb, sklearn_loaded, prediction = output.splitlines()[-1].split()
+        runs.append((float(load_s), float(first_s), int(peak_kb) / 1024,
+                     sklearn_loaded == 'True', float(prediction)))
+    return min(runs, key=lambda run: run[1])
+
+
+def report(probe, load_label):
+    """
+    Print one table row per artifact format and return the first-prediction
+    seconds by format
+    """
+    print(f"{'Format':<10}{load_label:>16}{'First prediction':>19}{'Peak RSS':>11}"
+          f"{'sklearn':>9}{'Prediction':>12}")
+    print("-"*80)
+    first_seconds = {}
+    for model_format in ['pickle', 'portable']:
+        load_s, first_s, peak_mb, sklearn_loaded, prediction = best_of(probe, model_format)
+        first_seconds[model_format] = first_s
+        print(f"{model_format:<10}{load_s:>14.2f} s{first_s:>17.2f} s{peak_mb:>8.0f} MB"
+              f"{'yes' if sklearn_loaded else 'no':>9}{prediction:>12.2f}")
+    print(f"Portable speedup: {first_seconds['pickle'] / first_seconds['portable']:.1f}x")
+    return first_seconds
+
+
+print("="*80)
+print("STARTUP BENCHMARK")
+print("="*80)
+print()
+
+missing = [path for path in ['random_forest_model.pkl', 'scaler.pkl', 'random_forest_model.npz']
+           if not os.path.exists(path)]
+if missing:
+    print(f"✗ Missing artifacts: {', '.join(missing)} (run save_model.py first)")
+    sys.exit(1)
+
+# ============================================================================
+# STEP 1: BARE MODEL
+# ============================================================================
+
+print(f"STEP 1: Import, load and predict one row with the forest (best of {RUNS})...")
+report(MODEL_PROBE, 'Import + load')
+print()
+
+# ============================================================================
+# STEP 2: WHOLE SERVICE
+# ============================================================================
+
+print(f"STEP 2: Import app.py and answer the first /predict (best of {RUNS})...")
+report(SERVICE_PROBE, 'Import app')
+print()
+
+print("The pickle path imports sklearn and unpickles ~1.2M tree nodes, then the")
+print("service compiles the forest and fuses the scaler. Portable files are read")
+print("with np.load and carry the fused thresholds, which are only verified.")
+print("Serve them with MODEL_FORMAT=portable.")
+print()
+
+print("="*80)
+print("BENCHMARK COMPLETE")
+print("="*80)
@@ -0,0 +1,161 @@
+"""
+================================================================================
+BUILD PRECOMPUTED IRRADIANCE GRID
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Evaluate the trained forest over a dense grid of input features
+         and save it as a memory-mappable artifact for O(1) serving
+         (run after save_model.py)
+================================================================================
+"""
+
+import time
+import warnings
+import joblib
+import numpy as np
+import pandas as pd
+from feature_stage import model_inputs
+from irradiance_grid import (GRID_AXES, DEFAULT_AXIS_SPECS, IrradianceGrid,
+                             grid_points)
+from model_artifacts import atomic_save_array, atomic_write_json
+
+warnings.filterwarnings('ignore')
+
+FEATURE_ORDER = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+
+GRID_PATH = 'irradiance_grid.npy'
+METADATA_PATH = 'irradiance_grid.json'
+
+# Rows evaluated per model.predict call while filling the grid
+CHUNK_SIZE = 200000
+
+# Random inputs used to measure the interpolation error
+N_VALIDATION = 50000
+
+print("="*80)
+print("BUILD PRECOMPUTED IRRADIANCE GRID")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: LOAD MODEL AND SCALER
+# ============================================================================
+
+print("STEP 1: Loading model and scaler...")
+model = joblib.load('random_forest_model.pkl')
+scaler = joblib.load('scaler.pkl')
+model.n_jobs = -1
+print("✓ Model and scaler loaded")
+print()
+
+# ============================================================================
+# STEP 2: EVALUATE FOREST ON THE GRID
+# ============================================================================
+
+print("STEP 2: Evaluating forest on the grid...")
+shape = tuple(DEFAULT_AXIS_SPECS[name]['points'] for name in GRID_AXES)
+print("Grid axes:")
+for name in GRID_AXES:
+    spec = DEFAULT_AXIS_SPECS[name]
+    print(f"  {name:<12} {spec['start']:>6} .. {spec['stop']:<6} ({spec['points']} points)")
+print(f"  Total points: {int(np.prod(shape)):,}")
+
+start = time.perf_counter()
+points = grid_points(DEFAULT_AXIS_SPECS)
+values = np.empty(len(points), dtype=np.float32)
+for i in range(0, len(points), CHUNK_SIZE):
+    chunk = points[i:i + CHUNK_SIZE]
+    values[i:i + CHUNK_SIZE] = model.predict(model_inputs(chunk, scaler))
+values = values.reshape(shape)
+build_seconds = time.perf_counter() - start
+print(f"✓ Grid evaluated in {build_seconds:.1f} s")
+print()
+
+# ============================================================================
+# STEP 3: MEASURE INTERPOLATION ERROR AGAINST THE REAL FOREST
+# ============================================================================
+
+print("STEP 3: Measuring interpolation error...")
+
+rng = np.random.default_rng(42)
+X_random = np.column_stack([
+    rng.uniform(-10, 50, N_VALIDATION),
+    rng.uniform(0, 100, N_VALIDATION),
+    rng.uniform(0, 100, N_VALIDATION),
+    rng.integers(0, 24, N_VALIDATION),
+    rng.integers(1, 13, N_VALIDATION)
+]).astype(float)
+X_dataset = pd.read_csv('weather_environmental_data.csv')[FEATURE_ORDER].dropna().values
+
+metadata = {
+    'axes': DEFAULT_AXIS_SPECS,
+    'axis_order': GRID_AXES,
+    'dtype': 'float32',
+    'build_seconds': round(build_seconds, 2),
+    'error': {}
+}
+grid = IrradianceGrid(values, metadata)
+
+for name, X in [('random_inputs', X_random), ('dataset_rows', X_dataset)]:
+    # Compare after the same non-negative clamp /predict applies
+    expected = np.maximum(model.predict(model_inputs(X, scaler)), 0.0)
+    actual = np.maximum(grid.predict(X), 0.0)
+    errors = np.abs(expected - actual)
+    metadata['error'][name] = {
+        'rows': int(len(X)),
+        'max_abs_error': round(float(errors.max()), 3),
+        'mean_abs_error': round(float(errors.mean()), 3),
+        'p99_abs_error': round(float(np.percentile(errors, 99)), 3)
+    }
+    print(f"  {name:<14} max {errors.max():8.2f}  mean {errors.mean():6.2f}  "
+          f"p99 {np.percentile(errors, 99):7.2f} W/m²")
+print()
+
+# ============================================================================
+# STEP 4: SAVE ARTIFACT
+# ============================================================================
+
+print("STEP 4: Saving grid artifact...")
+# Each file is renamed into place, so a service loading the grid never
+# memory-maps a half-written array
+atomic_save_array(values, GRID_PATH)
+atomic_write_json(metadata, METADATA_PATH)
+print(f"✓ {GRID_PATH} ({values.nbytes / 1e6:.1f} MB)")
+print(f"✓ {METADATA_PATH}")
+print()
+
+# ============================================================================
+# STEP 5: LOOKUP LATENCY
+# ============================================================================
+
+print("STEP 5: Measuring lookup latency...")
+grid = IrradianceGrid.load(GRID_PATH, METADATA_PATH)
+x = X_random[:1]
+grid.predict(x)
+n_calls = 2000
+start = time.perf_counter()
+for _ in range(n_calls):
+    grid.predict(x)
+grid_us = (time.perf_counter() - start) / n_calls * 1e6
+
+model.n_jobs = None
+x_scaled = model_inputs(x, scaler)
+n_calls = 50
+start = time.perf_counter()
+for _ in range(n_calls):
+    model.predict(x_scaled)
+forest_us = (time.perf_counter() - start) / n_calls * 1e6
+
+print(f"  Grid lookup (1 row):    {grid_us:8.1f} µs")
+print(f"  Forest predict (1 row): {forest_us:8.1f} µs")
+print()
+
+print("="*80)
+print("IRRADIANCE GRID READY")
+print("="*80)
+print()
+print("Serve it with:  PREDICTION_ENGINE=grid python app.py")
+print("="*80)
@@ -0,0 +1,167 @@
+"""
+================================================================================
+COMPACT FOREST ENCODING - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Narrow on-disk arrays for a compiled forest, and pruning
+
+A compiled forest (forest_engine.py) is stored as plain NumPy arrays
+(inside the portable .npz artifacts of portable_model.py), with narrow
+types:
+
+- feature:   uint8   (5 input features)
+- threshold: float32, rounded down from sklearn's float64 thresholds.
+             Trees compare float32 inputs, and for any float32 x,
+             x <= t exactly when x <= (largest float32 <= t), so every
+             branch is unchanged. Boosted models (BoostedForest) compare
+             float64 inputs and keep float64 thresholds.
+- children:  int32   (node indices of the concatenated trees)
+- value:     float32 leaf values (the only lossy step, ~1e-5 W/m²)
+
+Optionally, a subtree whose leaves all lie within `tolerance` W/m² of its
+root's value is collapsed into a single leaf. Every tree then changes by
+at most `tolerance` for any input, and so does the forest mean. With a
+tolerance of 0 only subtrees that always predict the same value (for
+example the all-zero night branches) are collapsed, so nothing changes.
+
+Index arrays are widened to intp again in memory, because NumPy gathers
+with narrow indices are slower.
+================================================================================
+"""
+
+import numpy as np
+from forest_engine import BoostedForest, CompiledForest
+
+# Threshold stored for leaves, as in sklearn
+TREE_UNDEFINED = -2.0
+
+
+# ============================================================================
+# PRUNING
+# ============================================================================
+
+def _node_depths(forest):
+    """
+    Depth of every node reachable from the roots (-1 for unreachable nodes)
+    """
+    depth = np.full(forest.n_nodes, -1, dtype=np.intp)
+    frontier = forest.roots
+    level = 0
+    while len(frontier) > 0:
+        depth[frontier] = level
+        frontier = frontier[~forest.is_leaf[frontier]]
+        frontier = np.concatenate([forest.children[2 * frontier],
+                                   forest.children[2 * frontier + 1]])
+        level += 1
+    return depth
+
+
+def prune_forest(forest, tolerance):
+    """
+    Collapse every subtree whose leaves all lie within tolerance of the
+    subtree root's value into a leaf with that value
+
+    Each tree's prediction changes by at most tolerance for any input.
+    Returns a new, renumbered CompiledForest.
+    """
+    if forest.fused:
+        raise ValueError('Prune the forest before fusing the scaler')
+
+    depth = _node_depths(forest)
+    left = forest.children[0::2]
+    right = forest.children[1::2]
+
+    # Smallest and largest leaf value below each node, deepest level first
+    low = forest.value.copy()
+    high = forest.value.copy()
+    for level in range(depth.max() - 1, -1, -1):
+        nodes = np.flatnonzero((depth == level) & ~forest.is_leaf)
+        low[nodes] = np.minimum(low[left[nodes]], low[right[nodes]])
+        high[nodes] = np.maximum(high[left[nodes]], high[right[nodes]])
+
+    spread = np.maximum(high - forest.value, forest.value - low)
+    collapse = ~forest.is_leaf & (spread <= tolerance)
+
+    # Keep the nodes reachable without passing through a collapsed node
+    keep = np.zeros(forest.n_nodes, dtype=bool)
+    frontier = forest.roots
+    while len(frontier) > 0:
+        keep[frontier] = True
+        frontier = frontier[~forest.is_leaf[frontier] & ~collapse[frontier]]
+        frontier = np.concatenate([left[frontier], right[frontier]])
+
+    old_ids = np.flatnonzero(keep)
+    new_ids = np.cumsum(keep) - 1
+    becomes_leaf = forest.is_leaf[old_ids] | collapse[old_ids]
+
+    children = np.stack([new_ids[left[old_ids]], new_ids[right[old_ids]]], axis=1)
+    children[becomes_leaf] = np.arange(len(old_ids))[becomes_leaf, None]
+
+    return CompiledForest(
+        feature=np.where(becomes_leaf, 0, forest.feature[old_ids]),
+        threshold=np.where(becomes_leaf, TREE_UNDEFINED, forest.threshold[old_ids]),
+        children=children,
+        value=forest.value[old_ids],
+        roots=new_ids[forest.roots],
+        max_depth=int(depth[old_ids].max())
+    )
+
+
+# ============================================================================
+# FLOAT32 QUANTIZATION
+# ============================================================================
+
+def round_down_float32(threshold):
+    """
+    Largest float32 value <= each float64 threshold
+
+    For float32 inputs, comparing against it takes the same branch as
+    comparing against the original threshold.
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+# ============================================================================
+# ARRAY CODEC
+# ============================================================================
+
+def forest_arrays(forest):
+    """
+    Narrow on-disk arrays of an unfused CompiledForest, keyed by name
+    """
+    if forest.fused:
+        raise ValueError('Export the forest before fusing the scaler')
+    return {
+        'feature': forest.feature.astype(np.uint8),
+        'threshold': (round_down_float32(forest.threshold) if forest.SPLIT_DTYPE == np.float32
+                      else forest.threshold),
+        'children': forest.children.reshape(-1, 2).astype(np.int32),
+        'value': forest.value.astype(np.float32),
+        'roots': forest.roots.astype(np.int32)
+    }
+
+
+def forest_from_arrays(arrays, max_depth, baseline=None):
+    """
+    Rebuild an unfused CompiledForest from forest_arrays() output (a
+    BoostedForest when the boosting baseline is given)
+    """
+    forest = CompiledForest(
+        feature=arrays['feature'],
+        threshold=np.asarray(arrays['threshold'], dtype=np.float64),
+        children=arrays['children'],
+        value=np.asarray(arrays['value'], dtype=np.float64),
+        roots=arrays['roots'],
+        max_depth=max_depth
+    )
+    if baseline is None:
+        return forest
+    return BoostedForest(forest.feature, forest.threshold, forest.children, forest.value,
+                         forest.roots, max_depth, baseline)
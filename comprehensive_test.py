@@ -11,11 +11,22 @@ This script tests all possible scenarios for the prediction system
 
 import requests
 import json
+import os
 import time
 
 API_URL = "http://localhost:5000/predict"
 HEALTH_URL = "http://localhost:5000/"
 MODEL_INFO_URL = "http://localhost:5000/model-info"
+BATCH_URL = "http://localhost:5000/predict/batch"
+CACHE_STATS_URL = "http://localhost:5000/cache-stats"
+DAILY_URL = "http://localhost:5000/predict/daily"
+STREAM_URL = "http://localhost:5000/predict/stream"
+METRICS_URL = "http://localhost:5000/metrics"
+RELOAD_URL = "http://localhost:5000/admin/reload"
+NIGHT_STATS_URL = "http://localhost:5000/night-filter-stats"
+
+# Manifest of the artifacts the server loads (run from the server's directory)
+MANIFEST_PATH = "model_manifest.json"
 
 def print_header(title):
     """Print formatted section header"""
@@ -436,6 +447,470 @@ def test_concurrent_requests():
         print("⚠ Some concurrent requests failed")
         return False
 
+def test_batch_predictions():
+    """Test 44: Batch Prediction Endpoint"""
+    print_header("PART 6: BATCH PREDICTION")
+    
+    print_test("Batch With Mixed Valid/Invalid Rows", 44, 44)
+    
+    instances = [
+        {"temperature": 35, "cloud_cover": 10, "humidity": 40, "hour": 12, "month": 6},
+        {"temperature": 60, "cloud_cover": 10, "humidity": 40, "hour": 12, "month": 6},
+        {"temperature": 15, "cloud_cover": 50, "humidity": 70, "hour": 9, "month": 12}
+    ]
+    
+    try:
+        response = requests.post(BATCH_URL, json={"instances": instances}, timeout=5)
+        print(f"Status Code: {response.status_code}")
+        result = response.json()
+        
+        # Batch results must match the single-row endpoint row by row
+        matches = 0
+        for instance, row in zip(instances, result['predictions']):
+            single = requests.post(API_URL, json=instance, timeout=5).json()
+            if row['status'] == 'success':
+                same = row['predicted_solar_irradiance'] == single['predicted_solar_irradiance']
+            else:
+                same = row['error'] == single['error']
+            print(f"  Row {row['index']}: {row.get('predicted_solar_irradiance', row.get('error'))} "
+                  f"{'✓' if same else '✗'}")
+            matches += same
+        
+        if response.status_code == 200 and result['failed'] == 1 and matches == len(instances):
+            print("✓ Batch predictions match single-row predictions")
+            return True
+        else:
+            print("✗ Batch results differ from single-row endpoint")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def test_prediction_cache():
+    """Test 45: Prediction Cache Hits"""
+    print_test("Repeated Request Served From Cache", 45, 45)
+    
+    data = {"temperature": 25, "cloud_cover": 30, "humidity": 60, "hour": 12, "month": 6}
+    
+    try:
+        before = requests.get(CACHE_STATS_URL, timeout=5).json()
+        if not before.get('enabled'):
+            print("⚠ Prediction cache is disabled (CACHE_SIZE=0)")
+            return True
+        
+        first = requests.post(API_URL, json=data, timeout=5).json()
+        second = requests.post(API_URL, json=data, timeout=5).json()
+        after = requests.get(CACHE_STATS_URL, timeout=5).json()
+        
+        print(f"Hits: {before['hits']} -> {after['hits']}")
+        print(f"Predictions: {first['predicted_solar_irradiance']} / {second['predicted_solar_irradiance']}")
+        
+        if after['hits'] > before['hits'] and \
+                first['predicted_solar_irradiance'] == second['predicted_solar_irradiance']:
+            print("✓ Repeated request served from cache")
+            return True
+        else:
+            print("✗ Cache did not register a hit")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def test_daily_curve():
+    """Test 46: Daily Irradiance Curve"""
+    print_test("24-Hour Curve Matches Hourly Predictions", 46, 46)
+    
+    temperatures = [18 + 0.5 * hour for hour in range(24)]
+    data = {"month": 6, "temperature": temperatures, "cloud_cover": 30, "humidity": 60}
+    
+    try:
+        response = requests.post(DAILY_URL, json=data, timeout=5)
+        print(f"Status Code: {response.status_code}")
+        result = response.json()
+        print(f"Daily insolation: {result['daily_insolation_kwh_m2']} kWh/m²")
+        print(f"Peak: {result['peak_irradiance']} W/m² at hour {result['peak_hour']}")
+        
+        hourly = [row['predicted_solar_irradiance'] for row in result['hourly']]
+        singles = []
+        for hour in range(24):
+            single = {"temperature": temperatures[hour], "cloud_cover": 30,
+                      "humidity": 60, "hour": hour, "month": 6}
+            singles.append(requests.post(API_URL, json=single, timeout=5)
+                           .json()['predicted_solar_irradiance'])
+        
+        # A list of the wrong length is rejected and counted by rule
+        short = dict(data, temperature=temperatures[:23])
+        length_sample = 'solar_validation_errors_total{endpoint="predict_daily",rule="hourly_length"}'
+        _, before, _ = read_metrics()
+        rejected = requests.post(DAILY_URL, json=short, timeout=5)
+        _, after, _ = read_metrics()
+        counted = (not any(sample.startswith('solar_requests_total{') for sample in after)
+                   or after.get(length_sample, 0) == before.get(length_sample, 0) + 1)
+        print(f"23 hourly values → Status Code: {rejected.status_code}, "
+              f"counted as hourly_length: {'✓' if counted else '✗'}")
+        
+        if response.status_code == 200 and hourly == singles and \
+                rejected.status_code == 400 and counted:
+            print("✓ Daily curve matches 24 single-hour predictions")
+            return True
+        else:
+            print("✗ Daily curve differs from single-hour predictions")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def test_model_selection():
+    """Test 47: Per-Request Model Selection"""
+    print_test("Model Selection with ?model=", 47, 47)
+    
+    data = {"temperature": 28.5, "cloud_cover": 15, "humidity": 45, "hour": 12, "month": 6}
+    
+    try:
+        models = requests.get(MODEL_INFO_URL, timeout=5).json()['models']
+        print(f"Available models: {', '.join(models)}")
+        
+        passed = True
+        for name in models:
+            response = requests.post(f"{API_URL}?model={name}", json=data, timeout=5)
+            result = response.json()
+            print(f"  {name:<20} {result.get('predicted_solar_irradiance')} W/m²")
+            passed = passed and response.status_code == 200 and result.get('model') == name
+        
+        response = requests.post(f"{API_URL}?model=unknown", json=data, timeout=5)
+        print(f"Unknown model → Status Code: {response.status_code}")
+        passed = passed and response.status_code == 400
+        
+        if passed:
+            print("✓ Every registry model selectable, unknown model rejected")
+            return True
+        else:
+            print("✗ Model selection failed")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def test_stream_predictions():
+    """Test 48: NDJSON Streaming Endpoint"""
+    print_header("PART 7: STREAMING, METRICS AND OPERATIONS")
+
+    print_test("Stream Keeps Row Order and Reports Per-Row Errors", 48, 48)
+
+    # Valid rows across more than one STREAM_CHUNK_SIZE chunk, with bad
+    # lines of every kind in the first chunk
+    valid = {"temperature": 25, "cloud_cover": 30, "humidity": 60, "hour": 12, "month": 6}
+    lines = [json.dumps(dict(valid, temperature=10 + i % 30, hour=6 + i % 12,
+                             datetime=f"row-{i}")) for i in range(2500)]
+    bad_lines = {
+        3: ('{"temperature": 25,', 'Invalid JSON'),
+        7: ('[1, 2, 3]', 'Record must be a JSON object'),
+        11: (json.dumps(dict(valid, temperature=60, datetime="row-11")), 'Temperature must be'),
+        13: (json.dumps({"temperature": 25, "datetime": "row-13"}), 'Missing required features')
+    }
+    for position, (line, _) in bad_lines.items():
+        lines[position] = line
+
+    try:
+        response = requests.post(STREAM_URL, data='\n'.join(lines) + '\n',
+                                 headers={'Content-Type': 'application/x-ndjson'},
+                                 stream=True, timeout=30)
+        print(f"Status Code: {response.status_code}")
+        results = [json.loads(line) for line in response.iter_lines() if line]
+        summary, rows = results[-1], results[:-1]
+        print(f"Summary: {summary}")
+
+        in_order = [row['index'] for row in rows] == list(range(len(lines)))
+        print(f"Rows returned in input order: {'✓' if in_order else '✗'}")
+
+        errors_ok = True
+        for position, (_, prefix) in bad_lines.items():
+            row = rows[position]
+            ok = row['status'] == 'failed' and row['error'].startswith(prefix)
+            print(f"  Line {position}: {row.get('error')} {'✓' if ok else '✗'}")
+            errors_ok = errors_ok and ok
+
+        # Successful rows match the batch endpoint and echo their datetime
+        sample = [position for position in range(0, len(lines), 250) if position not in bad_lines]
+        instances = [json.loads(lines[position]) for position in sample]
+        batch = requests.post(BATCH_URL, json={"instances": instances}, timeout=10).json()
+        same = all(rows[position]['predicted_solar_irradiance'] == row['predicted_solar_irradiance']
+                   and rows[position]['datetime'] == f"row-{position}"
+                   for position, row in zip(sample, batch['predictions']))
+        print(f"Sampled rows match /predict/batch: {'✓' if same else '✗'}")
+
+        counts_ok = (summary['status'] == 'complete' and summary['count'] == len(lines)
+                     and summary['failed'] == len(bad_lines))
+
+        # A body sent as plain JSON is rejected and counted by rule
+        type_sample = 'solar_validation_errors_total{endpoint="predict_stream",rule="content_type"}'
+        _, before, _ = read_metrics()
+        rejected = requests.post(STREAM_URL, json=valid, timeout=5)
+        _, after, _ = read_metrics()
+        type_ok = rejected.status_code == 400 and (
+            not any(sample.startswith('solar_requests_total{') for sample in after)
+            or after.get(type_sample, 0) == before.get(type_sample, 0) + 1)
+        print(f"application/json → Status Code: {rejected.status_code}, "
+              f"counted as content_type: {'✓' if type_ok else '✗'}")
+
+        if response.status_code == 200 and in_order and errors_ok and same and counts_ok \
+                and type_ok:
+            print("✓ Stream results in order with per-row errors")
+            return True
+        else:
+            print("✗ Stream results out of order or wrong")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def read_metrics():
+    """Fetch /metrics and parse it into ({sample: value}, {family: type}, lines)"""
+    response = requests.get(METRICS_URL, timeout=5)
+    samples, types = {}, {}
+    for line in response.text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, family, kind = line.split(' ', 3)
+            types[family] = kind
+        elif line and not line.startswith('#'):
+            sample, value = line.rsplit(' ', 1)
+            samples[sample] = float(value)
+    return response, samples, types
+
+def test_metrics():
+    """Test 49: Prometheus Metrics Endpoint"""
+    print_test("Metrics Exposition Format and Counters", 49, 49)
+
+    error_sample = 'solar_validation_errors_total{endpoint="predict",rule="humidity_range"}'
+    rejected_sample = 'solar_requests_total{endpoint="predict",code="400"}'
+    data = {"temperature": 25, "cloud_cover": 30, "humidity": 150, "hour": 12, "month": 6}
+
+    try:
+        _, before, _ = read_metrics()
+        requests.post(API_URL, json=data, timeout=5)
+        response, after, types = read_metrics()
+        print(f"Status Code: {response.status_code}")
+        print(f"Content-Type: {response.headers.get('Content-Type')}")
+
+        if not any(sample.startswith('solar_requests_total{') for sample in after):
+            print("⚠ Metrics are disabled (METRICS_ENABLED=0)")
+            return True
+
+        # Every sample belongs to a declared family
+        families = {'solar_stage_duration_seconds': 'histogram',
+                    'solar_stage_duration_quantile_seconds': 'gauge',
+                    'solar_requests_total': 'counter',
+                    'solar_validation_errors_total': 'counter',
+                    'solar_requests_in_flight': 'gauge'}
+        declared = all(types.get(family) == kind for family, kind in families.items())
+        undeclared = [sample for sample in after
+                      if not any(sample.split('{')[0] in (family, family + '_bucket',
+                                                          family + '_sum', family + '_count')
+                                 for family in families)]
+        print(f"Families declared with # TYPE: {'✓' if declared else '✗'}")
+        print(f"Samples outside a family: {len(undeclared)}")
+
+        # Histogram buckets are cumulative and end at _count
+        label = 'endpoint="predict",stage="total"'
+        buckets = [value for sample, value in after.items()
+                   if sample.startswith(f'solar_stage_duration_seconds_bucket{{{label},')]
+        count = after.get(f'solar_stage_duration_seconds_count{{{label}}}')
+        cumulative = buckets == sorted(buckets) and bool(buckets) and buckets[-1] == count
+        print(f"predict/total buckets cumulative, +Inf = count ({count:g}): {'✓' if cumulative else '✗'}")
+
+        errors = after.get(error_sample, 0) - before.get(error_sample, 0)
+        rejected = after.get(rejected_sample, 0) - before.get(rejected_sample, 0)
+        print(f"humidity_range errors +{errors:g}, predict 400s +{rejected:g}")
+
+        content_type = response.headers.get('Content-Type', '')
+        if response.status_code == 200 and content_type.startswith('text/plain') and \
+                'version=0.0.4' in content_type and declared and not undeclared and \
+                cumulative and errors == 1 and rejected == 1:
+            print("✓ Metrics are valid Prometheus text and count the rejected request")
+            return True
+        else:
+            print("✗ Metrics output or counters wrong")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def request_reload(until, timeout=180):
+    """Trigger /admin/reload until the reload stats satisfy until(stats)"""
+    headers = {'X-Admin-Token': os.environ['ADMIN_TOKEN']} if os.environ.get('ADMIN_TOKEN') else {}
+    deadline = time.time() + timeout
+    requested = False
+    while time.time() < deadline:
+        stats = requests.get(MODEL_INFO_URL, timeout=5).json()['reload']
+        if not stats['reloading']:
+            if requested and until(stats):
+                return stats
+            # 409 means the file watcher started a reload first
+            if requests.post(RELOAD_URL, headers=headers, timeout=5).status_code == 202:
+                requested = True
+        time.sleep(0.5)
+    raise TimeoutError('reload did not finish')
+
+def write_manifest(manifest):
+    """Replace the manifest in one step, as save_model.py does"""
+    with open(MANIFEST_PATH + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(MANIFEST_PATH + '.tmp', MANIFEST_PATH)
+
+def test_admin_reload():
+    """Test 50: Hot Model Reload"""
+    print_test("Reload Swaps Verified Artifacts, Rejects a Mismatched Pair", 50, 50)
+
+    data = {"temperature": 28.5, "cloud_cover": 15, "humidity": 45, "hour": 12, "month": 6}
+
+    try:
+        before = requests.get(MODEL_INFO_URL, timeout=5).json()['reload']
+        prediction = requests.post(API_URL, json=data, timeout=5).json()['predicted_solar_irradiance']
+
+        # Same files on disk: a new load of the same version. Its warmup
+        # predictions are not requests and must not show up in /metrics.
+        _, metrics_before, _ = read_metrics()
+        reloaded = request_reload(lambda stats: stats['loads'] > before['loads'])
+        _, metrics_after, _ = read_metrics()
+        after = requests.post(API_URL, json=data, timeout=5).json()['predicted_solar_irradiance']
+        print(f"Reload: loads {before['loads']} -> {reloaded['loads']}, "
+              f"version {reloaded['version']}, last error {reloaded['last_error']}")
+        changed = [sample for sample in set(metrics_before) | set(metrics_after)
+                   if not sample.startswith('solar_requests_in_flight')
+                   and metrics_before.get(sample) != metrics_after.get(sample)]
+        print(f"Metrics samples changed by the reload: {len(changed)}")
+        swapped = (reloaded['last_error'] is None and after == prediction and not changed
+                   and reloaded['content_hash'] == before['content_hash'])
+
+        if not os.path.exists(MANIFEST_PATH):
+            print(f"⚠ {MANIFEST_PATH} not found; mismatched pair not tested")
+            rejected = True
+        else:
+            # A manifest whose hashes match none of the files on disk
+            with open(MANIFEST_PATH) as f:
+                manifest = json.load(f)
+            tampered = json.loads(json.dumps(manifest))
+            for entry in tampered['artifacts'].values():
+                entry['sha256'] = '0' * 64
+            try:
+                write_manifest(tampered)
+                failed = request_reload(lambda stats: stats['failed_loads'] > reloaded['failed_loads'])
+                still = requests.post(API_URL, json=data, timeout=5)
+            finally:
+                write_manifest(manifest)
+            print(f"Mismatched pair: {failed['last_error']}")
+            print(f"Still serving {failed['version']} → {still.json()['predicted_solar_irradiance']} W/m²")
+            rejected = ('does not match manifest' in (failed['last_error'] or '')
+                        and failed['content_hash'] == before['content_hash']
+                        and still.status_code == 200
+                        and still.json()['predicted_solar_irradiance'] == prediction)
+
+            # Back to the matching manifest
+            restored = request_reload(lambda stats: stats['last_error'] is None)
+            rejected = rejected and restored['content_hash'] == before['content_hash']
+
+        if swapped and rejected:
+            print("✓ Reload swapped in verified artifacts and refused a mismatched pair")
+            return True
+        else:
+            print("✗ Reload did not behave as expected")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def test_quantiles():
+    """Test 51: Prediction Quantiles"""
+    print_test("Quantiles From the Forest, Rejected for Other Models", 51, 51)
+
+    data = {"temperature": 25, "cloud_cover": 60, "humidity": 70, "hour": 10, "month": 3}
+
+    try:
+        plain = requests.post(API_URL, json=data, timeout=5).json()
+        response = requests.post(f"{API_URL}?model=random_forest&quantiles=0.1,0.5,0.9",
+                                 json=data, timeout=5)
+        result = response.json()
+        quantiles = result.get('quantiles', {})
+        print(f"Status Code: {response.status_code}")
+        print(f"Prediction {result.get('predicted_solar_irradiance')} W/m² "
+              f"(without quantiles {plain['predicted_solar_irradiance']}), quantiles {quantiles}")
+        passed = (response.status_code == 200 and list(quantiles) == ['p10', 'p50', 'p90']
+                  and quantiles['p10'] <= quantiles['p50'] <= quantiles['p90']
+                  and abs(result['predicted_solar_irradiance']
+                          - plain['predicted_solar_irradiance']) <= 0.01)
+
+        response = requests.post(f"{API_URL}?quantiles=0.1,abc", json=data, timeout=5)
+        print(f"Malformed quantiles → Status Code: {response.status_code}")
+        passed = passed and response.status_code == 400
+
+        # Only a forest of trees has a spread of per-tree predictions
+        models = requests.get(MODEL_INFO_URL, timeout=5).json()['models']
+        for name in models:
+            if name == 'random_forest':
+                continue
+            response = requests.post(f"{API_URL}?model={name}&quantiles=0.5", json=data, timeout=5)
+            error = response.json().get('error', '')
+            print(f"  {name:<20} Status Code: {response.status_code}")
+            passed = passed and response.status_code == 400 and \
+                error.startswith('Quantiles are not available')
+
+        if passed:
+            print("✓ Forest quantiles ordered, other models rejected")
+            return True
+        else:
+            print("✗ Quantile output or rejection wrong")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
+def test_night_filter():
+    """Test 52: Night-Hour Short-Circuit"""
+    print_test("Night Hours Answered Without the Model", 52, 52)
+
+    try:
+        before = requests.get(NIGHT_STATS_URL, timeout=5).json()
+        if not before.get('enabled'):
+            print("⚠ Night filter is disabled (NIGHT_FILTER=0)")
+            return True
+
+        night_hour = min(set(range(24)) - set(before['daylight_hours']))
+        day_hour = before['daylight_hours'][len(before['daylight_hours']) // 2]
+        night = {"temperature": 31.5, "cloud_cover": 5, "humidity": 35, "hour": night_hour, "month": 6}
+        day = dict(night, hour=day_hour)
+        print(f"Night hour {night_hour}, daylight hour {day_hour}")
+
+        cache_before = requests.get(CACHE_STATS_URL, timeout=5).json()
+        single = requests.post(API_URL, json=night, timeout=5).json()
+        cache_after = requests.get(CACHE_STATS_URL, timeout=5).json()
+        with_quantiles = requests.post(f"{API_URL}?quantiles=0.1,0.9", json=night, timeout=5).json()
+        batch = requests.post(BATCH_URL, json={"instances": [night, day, night]}, timeout=5).json()
+        after = requests.get(NIGHT_STATS_URL, timeout=5).json()
+
+        values = [row['predicted_solar_irradiance'] for row in batch['predictions']]
+        print(f"/predict: {single['predicted_solar_irradiance']} W/m², "
+              f"quantiles {with_quantiles.get('quantiles')}, batch {values}")
+        skipped = after['requests_skipped'] - before['requests_skipped']
+        rows_skipped = after['rows_skipped'] - before['rows_skipped']
+        print(f"Requests skipped +{skipped}, rows skipped +{rows_skipped}")
+
+        # The single-row short-circuit comes before the prediction cache
+        cache_untouched = not cache_before.get('enabled') or (
+            cache_after['hits'] + cache_after['misses'] == cache_before['hits'] + cache_before['misses'])
+
+        if single['predicted_solar_irradiance'] == 0.0 and \
+                set(with_quantiles['quantiles'].values()) == {0.0} and \
+                values[0] == values[2] == 0.0 and values[1] > 0.0 and \
+                skipped == 2 and rows_skipped == 4 and cache_untouched:
+            print("✓ Night rows answered with 0 W/m² without the model or cache")
+            return True
+        else:
+            print("✗ Night filter did not short-circuit as expected")
+            return False
+    except Exception as e:
+        print(f"✗ Error: {str(e)}")
+        return False
+
 def run_all_tests():
     """Run complete test suite"""
     print("\n" + "="*80)
@@ -452,7 +927,16 @@ def run_all_tests():
         "Invalid Inputs": test_invalid_inputs(),
         "Dropdown Values": test_dropdown_values(),
         "Performance": test_performance(),
-        "Concurrent Requests": test_concurrent_requests()
+        "Concurrent Requests": test_concurrent_requests(),
+        "Batch Predictions": test_batch_predictions(),
+        "Prediction Cache": test_prediction_cache(),
+        "Daily Curve": test_daily_curve(),
+        "Model Selection": test_model_selection(),
+        "Stream Predictions": test_stream_predictions(),
+        "Metrics": test_metrics(),
+        "Admin Reload": test_admin_reload(),
+        "Quantiles": test_quantiles(),
+        "Night Filter": test_night_filter()
     }
     
     # Final Summary
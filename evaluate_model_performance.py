@@ -11,13 +11,14 @@ Phase: Prediction - Model Evaluation
 ================================================================================
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from model_cache import fit_cached
+from prepared_data import load_prepared
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -39,17 +40,15 @@ print()
 
 print("STEP 1: Loading prepared datasets...")
 
-X_train = pd.read_csv('X_train_scaled.csv')
-X_test = pd.read_csv('X_test_scaled.csv')
-y_train = pd.read_csv('y_train.csv')['solar_irradiance']
-y_test = pd.read_csv('y_test.csv')['solar_irradiance']
+data = load_prepared()
+X_train, X_test = data['X_train'], data['X_test']
+y_train, y_test = data['y_train'], data['y_test']
 
 print(f"✓ Testing set loaded: {X_test.shape[0]} samples")
 print()
 
 print("STEP 2: Training best model (Random Forest)...")
-best_model = RandomForestRegressor(n_estimators=100, random_state=42)
-best_model.fit(X_train, y_train)
+best_model = fit_cached(RandomForestRegressor(n_estimators=100, random_state=42), X_train, y_train)
 print("✓ Random Forest model trained")
 print()
 
@@ -190,20 +189,17 @@ print()
 # Train all models for comparison
 print("Training all models for comparison...")
 
-lr_model = LinearRegression()
-lr_model.fit(X_train, y_train)
+lr_model = fit_cached(LinearRegression(), X_train, y_train)
 lr_pred = lr_model.predict(X_test)
 lr_r2 = r2_score(y_test, lr_pred)
 lr_mae = mean_absolute_error(y_test, lr_pred)
 
-dt_model = DecisionTreeRegressor(random_state=42)
-dt_model.fit(X_train, y_train)
+dt_model = fit_cached(DecisionTreeRegressor(random_state=42), X_train, y_train)
 dt_pred = dt_model.predict(X_test)
 dt_r2 = r2_score(y_test, dt_pred)
 dt_mae = mean_absolute_error(y_test, dt_pred)
 
-rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-rf_model.fit(X_train, y_train)
+rf_model = fit_cached(RandomForestRegressor(n_estimators=100, random_state=42), X_train, y_train)
 rf_pred = rf_model.predict(X_test)
 rf_r2 = r2_score(y_test, rf_pred)
 rf_mae = mean_absolute_error(y_test, rf_pred)
@@ -0,0 +1,119 @@
+"""
+================================================================================
+FEATURE STAGE - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Model inputs computed from the raw request features, shared by
+         training (prepare_prediction_data.py) and serving (app.py)
+
+Two feature sets:
+
+- raw:   temperature, cloud_cover, humidity, hour, month (as requested)
+- solar: temperature, cloud_cover, humidity, the hour and the day of year
+         on the unit circle (hour_sin, hour_cos, day_sin, day_cos) and the
+         clear-sky solar elevation (solar_geometry.py)
+
+From raw hour and month integers the trees have to build the sun's daily
+arc and the seasons out of many deep splits; 23:00 and 0:00, or December
+and January, are far apart on the integer scale. The solar set hands them
+the sun's position directly, so much smaller models reach the accuracy of
+the full forest (benchmark_solar_features.py).
+
+The stage is vectorized NumPy on a (rows, 5) matrix, so one function
+builds the training matrix and a single request's row. Requests carry only
+the month, so the day of year is the middle of the month in both. With
+whole hours and months the solar columns take only 24 x 12 values; they
+are computed once at import and looked up per row.
+
+Artifacts record the set they were trained on (the feature names of the
+scaler and the models, or the portable file headers). Training and
+serving read it from there (feature_set_of), so only
+prepare_prediction_data.py reads FEATURE_SET.
+================================================================================
+"""
+
+import os
+
+import numpy as np
+from solar_geometry import clear_sky_elevation, month_mid_day
+
+RAW_FEATURES = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+SOLAR_FEATURES = ['temperature', 'cloud_cover', 'humidity', 'hour_sin', 'hour_cos',
+                  'day_sin', 'day_cos', 'solar_elevation']
+
+FEATURE_SETS = {'raw': RAW_FEATURES, 'solar': SOLAR_FEATURES}
+
+# Feature set prepare_prediction_data.py writes ('raw' or 'solar'); the
+# training scripts and the service follow the prepared files
+FEATURE_SET = os.environ.get('FEATURE_SET', 'raw')
+
+
+def _solar_table():
+    """
+    Solar columns (hour_sin .. solar_elevation) of every hour 0..23 and
+    month 1..12, shape (24, 12, 5)
+    """
+    hour = np.arange(24, dtype=np.float64)[:, None]
+    day = month_mid_day(np.arange(1, 13))[None, :].astype(np.float64)
+    hour_angle = 2 * np.pi * hour / 24
+    day_angle = 2 * np.pi * day / 365
+    columns = np.broadcast_arrays(np.sin(hour_angle), np.cos(hour_angle), np.sin(day_angle),
+                                  np.cos(day_angle), clear_sky_elevation(hour, day))
+    return np.stack(columns, axis=-1)
+
+
+# Hours and months are whole numbers (the dataset and the request
+# validation), so the solar columns are looked up rather than computed
+SOLAR_TABLE = _solar_table()
+
+
+def solar_features(raw):
+    """
+    Solar feature matrix (rows, 8) from raw features (rows, 5) in
+    RAW_FEATURES order
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    features = np.empty((len(raw), len(SOLAR_FEATURES)))
+    features[:, :3] = raw[:, :3]
+    features[:, 3:] = SOLAR_TABLE[raw[:, 3].astype(np.intp), raw[:, 4].astype(np.intp) - 1]
+    return features
+
+
+def build_features(raw, feature_set):
+    """
+    Model features of raw feature rows for a feature set
+    """
+    if feature_set == 'raw':
+        return np.asarray(raw, dtype=np.float64)
+    if feature_set == 'solar':
+        return solar_features(raw)
+    raise ValueError(f"Unknown feature set '{feature_set}' (expected one of {', '.join(FEATURE_SETS)})")
+
+
+def feature_set_of(names):
+    """
+    Name of the feature set with exactly these columns
+    """
+    for feature_set, columns in FEATURE_SETS.items():
+        if list(names) == columns:
+            return feature_set
+    raise ValueError(f'Features {list(names)} match no feature set; re-run prepare_prediction_data.py')
+
+
+def fitted_feature_set(estimator):
+    """
+    Feature set a fitted scaler or model was fitted on (raw if it has no
+    feature names)
+    """
+    names = getattr(estimator, 'feature_names_in_', None)
+    return 'raw' if names is None else feature_set_of(names)
+
+
+def model_inputs(raw, scaler):
+    """
+    Scaled model inputs for raw feature rows, in the scaler's feature set
+    """
+    return scaler.transform(build_features(raw, fitted_feature_set(scaler)))
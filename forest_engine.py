@@ -0,0 +1,635 @@
+"""
+================================================================================
+COMPILED RANDOM FOREST ENGINE - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Low-latency inference for the trained Random Forest Regressor
+
+The fitted forest is exported once into flat, contiguous NumPy buffers
+(feature, threshold, children, leaf value). Prediction walks all trees
+together, one tree level per step, with no sklearn input validation or
+joblib dispatch. Output is identical to model.predict().
+
+The StandardScaler can also be folded into the split thresholds
+(fuse_scaler), so the fused forest takes raw features (°C, %, hour, month)
+and the serving path skips scaler.transform entirely.
+
+The same traversal yields every tree's prediction, so quantiles of the
+per-tree predictions (prediction intervals) come at the cost of one
+partial sort instead of a second pass over the forest.
+
+Batches can also be evaluated a block of trees at a time, stopping for
+each row once its running mean has converged (early exit).
+
+BoostedForest walks the trees of a HistGradientBoostingRegressor the same
+way; its prediction is the baseline plus the sum of the tree outputs.
+================================================================================
+"""
+
+import threading
+
+import numpy as np
+
+# sklearn marks leaf nodes with this child index
+TREE_LEAF = -1
+
+INT64_MIN = np.iinfo(np.int64).min
+
+# For several rows, (row, tree) pairs that reached a leaf are dropped from
+# the traversal every few levels instead of being walked to max_depth
+ACTIVE_SET_FIRST_LEVEL = 4
+ACTIVE_SET_EVERY = 2
+
+
+def _ordered_keys(x):
+    """
+    Map float64 values to int64 keys that sort in the same order
+    """
+    bits = np.asarray(x, dtype=np.float64).view(np.int64)
+    return np.where(bits < 0, INT64_MIN - bits, bits)
+
+
+def _from_ordered_keys(keys):
+    """
+    Inverse of _ordered_keys
+    """
+    bits = np.where(keys < 0, INT64_MIN - keys, keys)
+    return bits.view(np.float64)
+
+
+def _scaler_params(scaler):
+    """
+    Return the per-feature (mean, scale) applied by a fitted StandardScaler
+    """
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+    scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
+
+
+def forest_mean(tree_values):
+    """
+    Mean of per-tree predictions (n_rows, n_trees), bit-identical to sklearn
+
+    sklearn adds tree outputs one at a time in estimator order; a
+    cumulative sum reproduces that order bit for bit.
+    """
+    return np.cumsum(tree_values, axis=1)[:, -1] / tree_values.shape[1]
+
+
+def tree_quantiles(tree_values, quantiles):
+    """
+    Quantiles of the per-tree predictions, shape (n_rows, n_quantiles)
+
+    Same linear interpolation as np.quantile's default method, but a plain
+    sort and gather avoids its ~100 µs fixed overhead per call.
+    """
+    ordered = np.sort(tree_values, axis=1)
+    position = np.asarray(quantiles, dtype=np.float64) * (ordered.shape[1] - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, ordered.shape[1] - 1)
+    weight = position - lower
+    return ordered[:, lower] * (1 - weight) + ordered[:, upper] * weight
+
+
+def sklearn_tree_predictions(model, X):
+    """
+    Per-tree predictions of a fitted sklearn forest, shape (n_rows, n_trees)
+
+    Validates and casts X to float32 once instead of once per tree, so
+    collecting every tree's output costs the same as model.predict.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    tree_values = np.empty((X.shape[0], len(model.estimators_)), order='F')
+    for i, estimator in enumerate(model.estimators_):
+        tree_values[:, i] = estimator.predict(X, check_input=False)
+    return tree_values
+
+
+def sklearn_predict_early_exit(model, X, tolerance, block_size=25, min_trees=25):
+    """
+    Early-exit forest mean of a fitted sklearn forest, evaluating its
+    estimators block by block like CompiledForest.predict_early_exit
+
+    Returns (predictions, number of trees used per row).
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    estimators = model.estimators_
+
+    def tree_block(rows, trees):
+        subset = X[rows]
+        return np.column_stack([estimator.predict(subset, check_input=False)
+                                for estimator in estimators[trees]])
+
+    return _early_exit_mean(X.shape[0], len(estimators), tree_block,
+                            tolerance, block_size, min_trees)
+
+
+def _early_exit_mean(n_rows, n_trees, tree_block, tolerance, block_size, min_trees):
+    """
+    Blocked early-exit loop shared by the compiled and sklearn forests;
+    tree_block(rows, trees) returns the per-tree values of those rows for a
+    slice of trees
+    """
+    total = np.zeros(n_rows)
+    total_squares = np.zeros(n_rows)
+    trees_used = np.zeros(n_rows, dtype=np.intp)
+    predictions = np.empty(n_rows)
+    active = np.arange(n_rows)
+
+    for start in range(0, n_trees, block_size):
+        tree_values = tree_block(active, slice(start, start + block_size))
+        # Add trees one at a time, in estimator order, like forest_mean
+        total[active] = np.cumsum(np.column_stack([total[active], tree_values]), axis=1)[:, -1]
+        total_squares[active] += (tree_values ** 2).sum(axis=1)
+        trees_used[active] += tree_values.shape[1]
+
+        k = trees_used[active]
+        if k[0] < min(min_trees, n_trees) or k[0] == n_trees:
+            continue
+        mean = total[active] / k
+        variance = np.maximum(total_squares[active] / k - mean ** 2, 0.0) * k / (k - 1)
+        converged = np.sqrt(variance / k) <= tolerance
+        predictions[active[converged]] = mean[converged]
+        active = active[~converged]
+        if len(active) == 0:
+            break
+
+    predictions[active] = total[active] / n_trees
+    return predictions, trees_used
+
+
+def _goes_left_after_scaling(x_raw, mean, scale, threshold, split_dtype=np.float32):
+    """
+    Reproduce the two-stage split test exactly: StandardScaler arithmetic in
+    float64, the tree's cast to split_dtype, then the float64 threshold
+    compare
+    """
+    return ((x_raw - mean) / scale).astype(split_dtype) <= threshold
+
+
+class CompiledForest:
+    """
+    Array-backed evaluator for a fitted RandomForestRegressor
+
+    All trees are stored back to back in shared node arrays. Leaves point
+    to themselves as both children, so every tree can be walked for a fixed
+    number of levels (the deepest tree's depth) without branching on
+    whether a node is a leaf.
+    """
+
+    # Inputs are cast to this type before the split compares (sklearn
+    # trees use float32)
+    SPLIT_DTYPE = np.float32
+
+    # The prediction is the mean of exchangeable bootstrap trees, which
+    # per-tree quantiles and early exit rely on
+    averages_trees = True
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth,
+                 fused=False):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        # children[2 * node] is the left child, children[2 * node + 1] the right
+        self.children = np.ascontiguousarray(children, dtype=np.intp).ravel()
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        # A fused forest takes raw float64 features; otherwise inputs are
+        # scaled features that sklearn would cast to float32
+        self.fused = bool(fused)
+        self.n_trees = len(self.roots)
+        self.n_nodes = len(self.feature)
+        self.is_leaf = self.children[0::2] == np.arange(self.n_nodes)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Export the tree_ arrays of every estimator in a fitted forest (a
+        fitted DecisionTreeRegressor is exported as a one-tree forest)
+        """
+        estimators = getattr(model, 'estimators_', [model])
+        features = []
+        thresholds = []
+        children = []
+        values = []
+        roots = []
+        offset = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == TREE_LEAF
+
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            children.append(np.stack([left, right], axis=1))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+
+        max_depth = max(estimator.tree_.max_depth for estimator in estimators)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children),
+            value=np.concatenate(values),
+            roots=np.array(roots),
+            max_depth=max_depth
+        )
+
+    def _as_input(self, X):
+        """
+        sklearn trees compare float32 inputs against float64 thresholds;
+        fused thresholds are exact in raw float64 units
+        """
+        return np.asarray(X, dtype=np.float64 if self.fused else self.SPLIT_DTYPE)
+
+    def leaf_nodes(self, X, roots=None):
+        """
+        Return the leaf index reached in every tree (or only in the trees
+        starting at roots), shape (n_rows, n_trees)
+        """
+        X = self._as_input(X)
+        if roots is None:
+            roots = self.roots
+        n_trees = len(roots)
+
+        if X.shape[0] == 1:
+            # Single row: plain 1-D gathers are the cheapest path
+            x = X[0]
+            nodes = roots
+            for _ in range(self.max_depth):
+                go_right = x[self.feature[nodes]] > self.threshold[nodes]
+                nodes = self.children[2 * nodes + go_right]
+            return nodes.reshape(1, -1)
+
+        # Several rows: most paths end well above max_depth, so finished
+        # (row, tree) pairs are set aside as the walk goes deeper
+        n_rows = X.shape[0]
+        flat_X = np.ascontiguousarray(X).ravel()
+        # Pair i is row i // n_trees, tree i % n_trees
+        pairs = np.arange(n_rows * n_trees)
+        offsets = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        nodes = np.tile(roots, n_rows)
+        leaves = np.empty(n_rows * n_trees, dtype=np.intp)
+
+        for level in range(self.max_depth):
+            if level >= ACTIVE_SET_FIRST_LEVEL and (level - ACTIVE_SET_FIRST_LEVEL) % ACTIVE_SET_EVERY == 0:
+                done = self.is_leaf[nodes]
+                leaves[pairs[done]] = nodes[done]
+                walking = ~done
+                pairs, offsets, nodes = pairs[walking], offsets[walking], nodes[walking]
+                if len(pairs) == 0:
+                    break
+            go_right = flat_X[offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+
+        leaves[pairs] = nodes
+        return leaves.reshape(n_rows, n_trees)
+
+    def tree_predictions(self, X):
+        """
+        Return the prediction of every tree, shape (n_rows, n_trees)
+        """
+        return self.value[self.leaf_nodes(X)]
+
+    def predict(self, X):
+        """
+        Predict the forest mean for each row
+
+        X holds scaled features, or raw features for a fused forest.
+        """
+        return forest_mean(self.tree_predictions(X))
+
+    def predict_quantiles(self, X, quantiles):
+        """
+        Predict the forest mean and quantiles of the per-tree predictions
+        from one traversal
+
+        Returns (mean, quantile matrix of shape (n_rows, len(quantiles))).
+        """
+        tree_values = self.tree_predictions(X)
+        return forest_mean(tree_values), tree_quantiles(tree_values, quantiles)
+
+    def predict_early_exit(self, X, tolerance, block_size=25, min_trees=25):
+        """
+        Predict the forest mean, evaluating trees block by block and
+        stopping for each row once its mean has converged
+
+        A row stops when the standard error of its running mean (spread of
+        the trees seen so far / sqrt(trees seen)) is at most tolerance, after
+        at least min_trees trees. Bootstrap trees are exchangeable, so the
+        first k trees are a fair sample of all of them. Rows that use every
+        tree get exactly predict()'s result. Returns (predictions, number
+        of trees used per row).
+        """
+        X = self._as_input(X)
+
+        def tree_block(rows, trees):
+            return self.value[self.leaf_nodes(X[rows], self.roots[trees])]
+
+        return _early_exit_mean(X.shape[0], self.n_trees, tree_block,
+                                tolerance, block_size, min_trees)
+
+    # ========================================================================
+    # SCALER FUSION
+    # ========================================================================
+
+    def internal_nodes(self):
+        """
+        Return the indices of all split (non-leaf) nodes
+        """
+        node_ids = np.arange(self.n_nodes)
+        return np.flatnonzero(self.children[2 * node_ids] != node_ids)
+
+    def fuse_scaler(self, scaler):
+        """
+        Fold a fitted StandardScaler into the split thresholds
+
+        For each split the raw threshold is the largest float64 value whose
+        scaled, float32-cast form still goes left. Scaling and rounding are
+        monotone, so "raw <= raw threshold" takes exactly the same branch as
+        the two-stage path for every possible input. The boundary is found
+        by binary search over the ordered float64 bit patterns.
+        """
+        if self.fused:
+            raise ValueError('Forest is already fused with a scaler')
+
+        mean, scale = _scaler_params(scaler)
+        nodes = self.internal_nodes()
+        feature = self.feature[nodes]
+        node_mean = mean[feature]
+        node_scale = scale[feature]
+        threshold = self.threshold[nodes]
+
+        def goes_left(keys):
+            return _goes_left_after_scaling(
+                _from_ordered_keys(keys), node_mean, node_scale, threshold, self.SPLIT_DTYPE)
+
+        # Bracket the boundary around the algebraic inverse of the scaling
+        guess = threshold * node_scale + node_mean
+        delta = (np.abs(guess) + node_scale) * 1e-6
+        lo = _ordered_keys(guess - delta)
+        hi = _ordered_keys(guess + delta)
+        while True:
+            lo_bad = ~goes_left(lo)
+            hi_bad = goes_left(hi)
+            if not (lo_bad.any() or hi_bad.any()):
+                break
+            delta *= 2
+            lo = np.where(lo_bad, _ordered_keys(guess - delta), lo)
+            hi = np.where(hi_bad, _ordered_keys(guess + delta), hi)
+
+        # Invariant: lo goes left, hi goes right
+        while True:
+            gap = hi - lo
+            if (gap <= 1).all():
+                break
+            mid = lo + gap // 2
+            left = goes_left(mid)
+            lo = np.where(left, mid, lo)
+            hi = np.where(left, hi, mid)
+
+        raw_threshold = self.threshold.copy()
+        raw_threshold[nodes] = _from_ordered_keys(lo)
+        return self.with_thresholds(raw_threshold, fused=True)
+
+    def with_thresholds(self, threshold, fused):
+        """
+        The same trees with other split thresholds (fused ones, for example)
+        """
+        return CompiledForest(
+            feature=self.feature,
+            threshold=threshold,
+            children=self.children,
+            value=self.value,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            fused=fused
+        )
+
+    def verify_fusion(self, fused, scaler):
+        """
+        Prove that a fused forest branches exactly like this one
+
+        At every split the raw threshold must go left after scaling and the
+        next representable float64 above it must go right. With monotone
+        scaling this fixes the branch for every input. Returns the number of
+        splits that fail the check (0 means the forests are equivalent).
+        """
+        mean, scale = _scaler_params(scaler)
+        nodes = self.internal_nodes()
+        feature = self.feature[nodes]
+        raw_threshold = fused.threshold[nodes]
+
+        at_boundary = _goes_left_after_scaling(
+            raw_threshold, mean[feature], scale[feature], self.threshold[nodes],
+            self.SPLIT_DTYPE)
+        above_boundary = _goes_left_after_scaling(
+            np.nextafter(raw_threshold, np.inf), mean[feature], scale[feature],
+            self.threshold[nodes], self.SPLIT_DTYPE)
+
+        same_structure = (
+            np.array_equal(self.feature, fused.feature)
+            and np.array_equal(self.children, fused.children)
+            and np.array_equal(self.value, fused.value)
+        )
+        if not same_structure:
+            return len(nodes)
+        return int(np.count_nonzero(~at_boundary | above_boundary))
+
+
+def boosted_sum(baseline, tree_values):
+    """
+    Baseline plus per-tree outputs (n_rows, n_trees), bit-identical to sklearn
+
+    HistGradientBoostingRegressor starts every row at the baseline and adds
+    the trees one at a time in iteration order, as the cumulative sum does.
+    """
+    start = np.full((tree_values.shape[0], 1), float(baseline))
+    return np.cumsum(np.hstack([start, tree_values]), axis=1)[:, -1]
+
+
+class BoostedForest(CompiledForest):
+    """
+    Array-backed evaluator for a fitted HistGradientBoostingRegressor
+
+    The trees are stored and walked like a forest's, but they compare
+    float64 inputs (HistGradientBoosting does not cast to float32) and the
+    prediction is the baseline plus the sum of the tree outputs. Boosted
+    trees correct each other instead of sampling one distribution, so
+    there are no per-tree quantiles or early exit. Inputs must be finite:
+    sklearn sends missing values down a learned side of each split, which
+    is not exported.
+    """
+
+    SPLIT_DTYPE = np.float64
+
+    averages_trees = False
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth, baseline,
+                 fused=False):
+        super().__init__(feature, threshold, children, value, roots, max_depth, fused=fused)
+        self.baseline = float(baseline)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Export the tree predictors of every boosting iteration
+        """
+        if model.n_trees_per_iteration_ != 1:
+            raise ValueError('Only single-output gradient boosting models can be compiled')
+        features = []
+        thresholds = []
+        children = []
+        values = []
+        roots = []
+        offset = 0
+        max_depth = 0
+
+        for (predictor,) in model._predictors:
+            nodes = predictor.nodes
+            if nodes['is_categorical'].any():
+                raise ValueError('Categorical splits cannot be compiled')
+            node_ids = np.arange(len(nodes))
+            is_leaf = nodes['is_leaf'].astype(bool)
+
+            left = np.where(is_leaf, node_ids, nodes['left']) + offset
+            right = np.where(is_leaf, node_ids, nodes['right']) + offset
+
+            features.append(np.where(is_leaf, 0, nodes['feature_idx']))
+            thresholds.append(np.where(is_leaf, 0.0, nodes['num_threshold']))
+            children.append(np.stack([left, right], axis=1))
+            values.append(nodes['value'])
+            roots.append(offset)
+            offset += len(nodes)
+            max_depth = max(max_depth, int(nodes['depth'].max()))
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children),
+            value=np.concatenate(values),
+            roots=np.array(roots),
+            max_depth=max_depth,
+            baseline=np.ravel(model._baseline_prediction)[0]
+        )
+
+    def predict(self, X):
+        """
+        Predict the baseline plus the sum of the tree outputs for each row
+
+        X holds scaled features, or raw features for a fused model.
+        """
+        return boosted_sum(self.baseline, self.tree_predictions(X))
+
+    def predict_quantiles(self, X, quantiles):
+        raise ValueError('Quantiles need a forest of averaged trees, not a boosted model')
+
+    def predict_early_exit(self, X, tolerance, block_size=25, min_trees=25):
+        raise ValueError('Early exit needs a forest of averaged trees, not a boosted model')
+
+    def with_thresholds(self, threshold, fused):
+        return BoostedForest(
+            feature=self.feature,
+            threshold=threshold,
+            children=self.children,
+            value=self.value,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            baseline=self.baseline,
+            fused=fused
+        )
+
+
+def is_tree_model(model):
+    """
+    True for fitted sklearn models the compiled engine can serve: forests,
+    single trees and histogram gradient boosting
+    """
+    return any(hasattr(model, name) for name in ('estimators_', 'tree_', '_predictors'))
+
+
+def compile_model(model):
+    """
+    Export a fitted sklearn tree model into the matching compiled engine
+    """
+    if hasattr(model, '_predictors'):
+        return BoostedForest.from_sklearn(model)
+    return CompiledForest.from_sklearn(model)
+
+
+class EarlyExitPolicy:
+    """
+    Serving settings and counters for early-exit forest evaluation
+
+    A single-row walk costs about the same for 25 trees as for 100 (NumPy
+    overhead per tree level dominates), so every extra block makes it
+    slower. Early exit therefore only applies from min_rows rows, where the
+    cost grows with rows x trees and skipped trees are saved time. Batches
+    too large for the compiled engine are evaluated the same way on the
+    sklearn estimators.
+    """
+
+    def __init__(self, tolerance, block_size=25, min_rows=128):
+        self.tolerance = float(tolerance)
+        self.block_size = int(block_size)
+        self.min_rows = int(min_rows)
+
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rows = 0
+        self.trees_evaluated = 0
+        self.trees_available = 0
+
+    def applies(self, engine, n_rows):
+        """
+        True if early exit should be used for this engine and batch size
+        """
+        return (engine.averages_trees and n_rows >= self.min_rows
+                and engine.n_trees > self.block_size)
+
+    def predict(self, engine, X, record=True, sklearn_model=None):
+        """
+        Predict with early exit and count the trees used (unless record is
+        False); with sklearn_model, its estimators are evaluated instead of
+        the compiled engine
+        """
+        if sklearn_model is not None:
+            predictions, trees_used = sklearn_predict_early_exit(
+                sklearn_model, X, self.tolerance, block_size=self.block_size,
+                min_trees=self.block_size)
+        else:
+            predictions, trees_used = engine.predict_early_exit(
+                X, self.tolerance, block_size=self.block_size, min_trees=self.block_size)
+        if not record:
+            return predictions
+        with self._lock:
+            self.calls += 1
+            self.rows += len(trees_used)
+            self.trees_evaluated += int(trees_used.sum())
+            self.trees_available += len(trees_used) * engine.n_trees
+        return predictions
+
+    def stats(self):
+        """
+        Return the settings and the average number of trees used per row
+        """
+        with self._lock:
+            return {
+                'tolerance': self.tolerance,
+                'block_size': self.block_size,
+                'min_rows': self.min_rows,
+                'calls': self.calls,
+                'rows': self.rows,
+                'mean_trees_used': round(self.trees_evaluated / self.rows, 2) if self.rows else 0.0,
+                'trees_skipped_fraction': (round(1 - self.trees_evaluated / self.trees_available, 4)
+                                           if self.trees_available else 0.0)
+            }
@@ -0,0 +1,123 @@
+"""
+================================================================================
+INCREMENTAL TRAINING - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Rolling tree window for updating the forest with newly appended
+         hourly rows instead of refitting all of it
+
+The trained model carries a watermark: the timestamp of the newest row of
+weather_environmental_data.csv it has seen (save_model.py and
+retrain_incremental.py store it in model_manifest.json and in the portable
+file headers). An update fits a few new trees with warm_start on every
+training row up to the new watermark and drops the same number of the
+oldest trees, so the forest keeps its size and, after enough updates, every
+tree has been refitted on recent data. Fitting k of n trees costs about
+k/n of a full refit.
+
+New trees are fitted on all history, not just the new rows: a tree that
+only saw the last weeks would know nothing about the other months and
+hours.
+
+Rows are held out for evaluation by a hash of their timestamp, so a row
+stays in (or out of) the holdout as the dataset grows. The test rows of
+prepare_prediction_data.py's split are never fitted either, so the test
+MAE of evaluate_model_performance.py and the manifest stays clean after an
+update.
+================================================================================
+"""
+
+import zlib
+
+import numpy as np
+import pandas as pd
+from feature_stage import FEATURE_SETS, build_features, fitted_feature_set
+from prepared_data import SPLIT_RANDOM_STATE, TEST_SIZE
+from sklearn.model_selection import train_test_split
+
+# Raw dataset column with the row timestamp (the watermark is its maximum)
+WATERMARK_COLUMN = 'datetime'
+
+FEATURE_COLUMNS = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+TARGET_COLUMN = 'solar_irradiance'
+
+# Percentage of rows held out from incremental fits for evaluation
+HOLDOUT_PERCENT = 20
+
+
+def load_rows(path, watermark=None):
+    """
+    Raw rows with complete features and target, optionally only those
+    after a watermark
+    """
+    data = pd.read_csv(path)
+    data = data.dropna(subset=FEATURE_COLUMNS + [TARGET_COLUMN])
+    if watermark is not None:
+        data = data[data[WATERMARK_COLUMN] > watermark]
+    return data.reset_index(drop=True)
+
+
+def holdout_mask(data):
+    """
+    True for rows in the stable evaluation holdout
+    """
+    buckets = np.array([zlib.crc32(str(stamp).encode()) % 100 for stamp in data[WATERMARK_COLUMN]])
+    return buckets < HOLDOUT_PERCENT
+
+
+def prepared_test_mask(data, split_watermark):
+    """
+    True for rows in the test split of prepare_prediction_data.py
+
+    The split is repeated over the rows up to the watermark it was prepared
+    at: load_rows drops the same incomplete rows as the preparation, so
+    train_test_split draws the same positions. Rows appended later are
+    never in it.
+    """
+    prepared = np.flatnonzero((data[WATERMARK_COLUMN] <= split_watermark).values)
+    _, test_positions = train_test_split(prepared, test_size=TEST_SIZE,
+                                         random_state=SPLIT_RANDOM_STATE)
+    mask = np.zeros(len(data), dtype=bool)
+    mask[test_positions] = True
+    return mask
+
+
+def scaled_features(data, scaler):
+    """
+    Feature matrix in the model's scaled space, as a DataFrame, through the
+    feature stage the scaler was fitted on (feature_stage.py)
+    """
+    feature_set = fitted_feature_set(scaler)
+    columns = FEATURE_SETS[feature_set]
+    features = pd.DataFrame(build_features(data[FEATURE_COLUMNS].values, feature_set), columns=columns)
+    return pd.DataFrame(scaler.transform(features), columns=columns)
+
+
+def rolling_update(model, X, y, n_trees, seed):
+    """
+    Add n_trees trees fitted on (X, y) with warm_start and drop the
+    n_trees oldest ones; returns the model (updated in place)
+
+    seed sets the random state of the new trees. warm_start derives new
+    trees' seeds from the forest's random_state and its current size,
+    which stays the same from one update to the next, so each update needs
+    its own seed.
+    """
+    if not 0 < n_trees <= len(model.estimators_):
+        raise ValueError(f'Can replace 1 to {len(model.estimators_)} trees, not {n_trees}')
+    size = len(model.estimators_)
+    model.set_params(warm_start=True, n_estimators=size + n_trees, random_state=seed)
+    model.fit(X, y)
+    model.estimators_ = model.estimators_[n_trees:]
+    model.set_params(warm_start=False, n_estimators=size)
+    return model
+
+
+def update_seed(watermark):
+    """
+    Random state for the trees added at a watermark
+    """
+    return zlib.crc32(str(watermark).encode()) % (2 ** 31)
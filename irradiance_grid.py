@@ -0,0 +1,133 @@
+"""
+================================================================================
+PRECOMPUTED IRRADIANCE GRID - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: O(1) irradiance lookups from a forest evaluated offline on a grid
+
+The grid (built by build_irradiance_grid.py) holds the forest prediction
+at every (hour, month, temperature, cloud_cover, humidity) grid point.
+Hour and month are integers and are indexed exactly; temperature, cloud
+cover and humidity are trilinearly interpolated between grid points.
+The .npy file is memory-mapped, so every worker process shares one copy
+through the OS page cache and none of them has to unpickle the forest.
+================================================================================
+"""
+
+import json
+import numpy as np
+
+# Grid axis order (the .npy array has one dimension per axis, in this order)
+GRID_AXES = ['hour', 'month', 'temperature', 'cloud_cover', 'humidity']
+
+# Axes indexed exactly (integer inputs); the others are interpolated
+DISCRETE_AXES = ['hour', 'month']
+
+# Default resolution, covering exactly the ranges /predict accepts
+DEFAULT_AXIS_SPECS = {
+    'hour': {'start': 0, 'stop': 23, 'points': 24},
+    'month': {'start': 1, 'stop': 12, 'points': 12},
+    'temperature': {'start': -10.0, 'stop': 50.0, 'points': 25},
+    'cloud_cover': {'start': 0.0, 'stop': 100.0, 'points': 21},
+    'humidity': {'start': 0.0, 'stop': 100.0, 'points': 21}
+}
+
+
+def axis_values(spec):
+    """
+    Return the grid coordinates of one axis
+    """
+    return np.linspace(spec['start'], spec['stop'], spec['points'])
+
+
+def grid_points(axis_specs):
+    """
+    Return every grid point as a matrix in FEATURE_ORDER, with the rows in
+    C order of the grid array (hour slowest, humidity fastest)
+    """
+    axes = [axis_values(axis_specs[name]) for name in GRID_AXES]
+    mesh = np.meshgrid(*axes, indexing='ij')
+    columns = {name: values.ravel() for name, values in zip(GRID_AXES, mesh)}
+    feature_order = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+    return np.column_stack([columns[name] for name in feature_order])
+
+
+class IrradianceGrid:
+    """
+    Memory-mapped irradiance grid with interpolated lookups
+    """
+
+    def __init__(self, values, metadata):
+        self.values = values
+        self.metadata = metadata
+        self.axis_specs = metadata['axes']
+
+        hour = self.axis_specs['hour']
+        month = self.axis_specs['month']
+        self._hour_start = int(hour['start'])
+        self._month_start = int(month['start'])
+
+        # (start, step, points) of each interpolated axis, in grid order
+        self._continuous = []
+        for name in GRID_AXES:
+            if name in DISCRETE_AXES:
+                continue
+            spec = self.axis_specs[name]
+            step = (spec['stop'] - spec['start']) / (spec['points'] - 1)
+            self._continuous.append((spec['start'], step, spec['points']))
+
+        # Flat view of the grid plus element strides, so the 8 corners of
+        # every lookup are fetched with a single take()
+        self._flat = self.values.reshape(-1)
+        self._strides = np.array(self.values.strides) // self.values.itemsize
+        t_stride, c_stride, u_stride = self._strides[2:]
+        self._corner_offsets = np.array([
+            dt * t_stride + dc * c_stride + du * u_stride
+            for dt in (0, 1) for dc in (0, 1) for du in (0, 1)
+        ])
+        self._corner_bits = np.array([
+            (dt, dc, du) for dt in (0, 1) for dc in (0, 1) for du in (0, 1)
+        ], dtype=bool)
+
+    @classmethod
+    def load(cls, grid_path='irradiance_grid.npy', metadata_path='irradiance_grid.json'):
+        """
+        Memory-map a grid artifact and read its metadata
+        """
+        values = np.load(grid_path, mmap_mode='r')
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        return cls(values, metadata)
+
+    def _locate(self, x, start, step, points):
+        """
+        Return the lower grid index and interpolation weight along one axis
+        """
+        position = np.clip((x - start) / step, 0, points - 1)
+        lower = np.minimum(position.astype(np.intp), points - 2)
+        return lower, position - lower
+
+    def predict(self, X):
+        """
+        Interpolate the grid for a matrix of raw features in FEATURE_ORDER
+        """
+        X = np.asarray(X, dtype=np.float64)
+        hour = X[:, 3].astype(np.intp) - self._hour_start
+        month = X[:, 4].astype(np.intp) - self._month_start
+
+        (t0, wt), (c0, wc), (u0, wu) = [
+            self._locate(X[:, column], *axis)
+            for column, axis in zip((0, 1, 2), self._continuous)
+        ]
+
+        base = (hour * self._strides[0] + month * self._strides[1]
+                + t0 * self._strides[2] + c0 * self._strides[3] + u0 * self._strides[4])
+        corners = self._flat.take(base[:, None] + self._corner_offsets)
+
+        # Trilinear weight of each of the 8 surrounding grid points
+        upper = np.stack([wt, wc, wu], axis=1)[:, None, :]
+        weights = np.where(self._corner_bits, upper, 1 - upper).prod(axis=2)
+        return (weights * corners).sum(axis=1)
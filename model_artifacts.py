@@ -0,0 +1,93 @@
+"""
+================================================================================
+MODEL ARTIFACT FILES - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Writing deployment artifacts and their manifest, shared by
+         save_model.py (full training), retrain_incremental.py and
+         build_irradiance_grid.py
+
+Every file is written under a temporary name and renamed into place, and
+the manifest (version, SHA-256 hashes, training watermark) is written
+last. A running service reloads only once the files on disk match the
+manifest, so it never mixes a new model with an old scaler or reads a
+half-written file.
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+
+
+def atomic_dump(obj, path):
+    """
+    Pickle obj next to path and rename it into place in one step
+    """
+    tmp_path = path + '.tmp'
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def atomic_save_array(array, path):
+    """
+    Save a NumPy array (.npy) next to path and rename it into place in one step
+    """
+    tmp_path = path + '.tmp'
+    # A file object, since np.save appends .npy to a path that lacks it
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(obj, path):
+    """
+    Write obj as JSON next to path and rename it into place in one step
+    """
+    with open(path + '.tmp', 'w') as f:
+        json.dump(obj, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def portable_path(path):
+    """
+    Path of the portable NumPy file that goes with a pickle path
+    """
+    return os.path.splitext(path)[0] + '.npz'
+
+
+def file_sha256(path):
+    """
+    Return the SHA-256 hex digest of a file
+    """
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def artifact_entry(path):
+    """
+    Manifest entry (hash and size) of one artifact file
+    """
+    return {'sha256': file_sha256(path), 'bytes': os.path.getsize(path)}
+
+
+def new_version():
+    """
+    Manifest version string and creation time, from the current UTC time
+    """
+    now = time.gmtime()
+    return time.strftime('%Y%m%d-%H%M%S', now), time.strftime('%Y-%m-%dT%H:%M:%SZ', now)
+
+
+def write_manifest(manifest, path):
+    """
+    Write the manifest atomically
+    """
+    atomic_write_json(manifest, path)
@@ -0,0 +1,279 @@
+"""
+================================================================================
+MODEL CACHE - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Content-addressed cache of fitted models shared by the training
+         and evaluation scripts
+
+save_model.py, train_baseline_models.py and evaluate_model_performance.py
+fit the same estimators on the same prepared split (prepared_data.py).
+fit_cached() keys each fit on a SHA-256 of the estimator type and
+hyperparameters, the training data (values, column names, dtypes) and the
+Python, NumPy and scikit-learn versions. A model fitted before with the same key is loaded
+from disk instead of being refitted; any change to the data, a parameter
+or a library version gives a new key.
+
+Only reproducible fits are cached: an estimator with a random_state of
+None is always refitted. Parameters that do not change the fitted model
+(n_jobs, verbose) are left out of the key; a model loaded from the cache
+takes the caller's values for them.
+
+Usage:
+    python model_cache.py list
+    python model_cache.py evict --max-size-mb 500 --max-age-days 30
+    python model_cache.py clear
+================================================================================
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import time
+
+import joblib
+import numpy as np
+
+# Cache directory; MODEL_CACHE=0 disables the cache (always refit)
+CACHE_DIR = os.environ.get('MODEL_CACHE_DIR', '.model_cache')
+CACHE_ENABLED = os.environ.get('MODEL_CACHE', '1') == '1'
+
+# Hyperparameters that do not affect the fitted model
+IGNORED_PARAMS = {'n_jobs', 'verbose'}
+
+
+# ============================================================================
+# CACHE KEY
+# ============================================================================
+
+def library_versions():
+    """
+    Versions that can change what a fit produces
+    """
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+
+def _hash_array(digest, data):
+    """
+    Feed the column names, dtypes and values of a table into a hash
+    """
+    columns = list(getattr(data, 'columns', [])) or [getattr(data, 'name', None)]
+    values = np.ascontiguousarray(np.asarray(data))
+    digest.update(json.dumps([str(column) for column in columns]).encode())
+    digest.update(f'{values.dtype.str}{values.shape}'.encode())
+    digest.update(values.tobytes())
+
+
+def cache_key(estimator, X, y):
+    """
+    SHA-256 hex key of an estimator's fit on (X, y)
+    """
+    params = {name: value for name, value in estimator.get_params(deep=False).items()
+              if name not in IGNORED_PARAMS}
+    digest = hashlib.sha256()
+    digest.update(f'{type(estimator).__module__}.{type(estimator).__name__}'.encode())
+    digest.update(json.dumps(params, sort_keys=True, default=repr).encode())
+    digest.update(json.dumps(library_versions(), sort_keys=True).encode())
+    _hash_array(digest, X)
+    _hash_array(digest, y)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# FIT OR LOAD
+# ============================================================================
+
+def _entry_paths(key, cache_dir):
+    return (os.path.join(cache_dir, f'{key}.joblib'),
+            os.path.join(cache_dir, f'{key}.json'))
+
+
+def _atomic_write(path, write):
+    # Per-process temporary name, so parallel fits never share one
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_json(data, path):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def fit_cached(estimator, X, y, cache_dir=None, return_cached=False):
+    """
+    Fit estimator on (X, y), or load the identical fit from the cache
+
+    Returns the fitted estimator: the one passed in after a fit, or the
+    cached copy on a hit, with the caller's n_jobs and verbose (which the
+    key ignores) set on it. With return_cached, returns (estimator, cached)
+    so callers timing the call can tell a load from a fit.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    name = type(estimator).__name__
+    if not CACHE_ENABLED or estimator.get_params(deep=False).get('random_state', 0) is None:
+        estimator.fit(X, y)
+        return (estimator, False) if return_cached else estimator
+
+    key = cache_key(estimator, X, y)
+    model_path, info_path = _entry_paths(key, cache_dir)
+    if os.path.exists(model_path):
+        started = time.perf_counter()
+        try:
+            model = joblib.load(model_path)
+        except Exception as e:
+            print(f"⚠ Cached {name} unreadable ({e}), refitting")
+        else:
+            # The modification time records the last use, for eviction
+            os.utime(model_path)
+            model.set_params(**{param: value for param, value
+                                in estimator.get_params(deep=False).items()
+                                if param in IGNORED_PARAMS})
+            print(f"✓ {name} loaded from model cache "
+                  f"(key {key[:12]}, {time.perf_counter() - started:.2f} s)")
+            return (model, True) if return_cached else model
+
+    started = time.perf_counter()
+    estimator.fit(X, y)
+    fit_seconds = time.perf_counter() - started
+
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_write(model_path, lambda path: joblib.dump(estimator, path))
+    info = {
+        'key': key,
+        'model_type': name,
+        'params': {param: repr(value) for param, value in estimator.get_params(deep=False).items()},
+        'training_rows': len(X),
+        'fit_seconds': round(fit_seconds, 2),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'versions': library_versions()
+    }
+    _atomic_write(info_path, lambda path: _write_json(info, path))
+    print(f"✓ {name} fitted in {fit_seconds:.1f} s and cached (key {key[:12]})")
+    return (estimator, False) if return_cached else estimator
+
+
+# ============================================================================
+# LISTING AND EVICTION
+# ============================================================================
+
+def list_entries(cache_dir=None):
+    """
+    Cached fits, most recently used first, with their size and last use
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = []
+    for file_name in os.listdir(cache_dir):
+        if not file_name.endswith('.joblib'):
+            continue
+        key = file_name[:-len('.joblib')]
+        model_path, info_path = _entry_paths(key, cache_dir)
+        try:
+            with open(info_path) as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            info = {'key': key, 'model_type': '?'}
+        info['bytes'] = os.path.getsize(model_path)
+        info['last_used'] = os.path.getmtime(model_path)
+        entries.append(info)
+    return sorted(entries, key=lambda entry: entry['last_used'], reverse=True)
+
+
+def remove_entry(key, cache_dir=None):
+    """
+    Delete one cached fit and its metadata
+    """
+    for path in _entry_paths(key, cache_dir or CACHE_DIR):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def evict(max_bytes=None, max_age_seconds=None, cache_dir=None):
+    """
+    Remove fits unused for longer than max_age_seconds, then the least
+    recently used ones until the cache fits in max_bytes
+
+    Returns the removed entries.
+    """
+    entries = list_entries(cache_dir)
+    now = time.time()
+    removed = []
+    if max_age_seconds is not None:
+        removed = [entry for entry in entries if now - entry['last_used'] > max_age_seconds]
+        entries = [entry for entry in entries if entry not in removed]
+    if max_bytes is not None:
+        while entries and sum(entry['bytes'] for entry in entries) > max_bytes:
+            removed.append(entries.pop())
+
+    for entry in removed:
+        remove_entry(entry['key'], cache_dir)
+    return removed
+
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def print_entries(entries):
+    print(f"{'Key':<14}{'Model':<24}{'Size':>10}{'Fit':>9}{'Created':>22}{'Last used':>12}")
+    print("-"*91)
+    now = time.time()
+    for entry in entries:
+        age_days = (now - entry['last_used']) / 86400
+        fit_seconds = entry.get('fit_seconds')
+        print(f"{entry['key'][:12]:<14}{entry['model_type']:<24}"
+              f"{entry['bytes'] / 1e6:>7.1f} MB"
+              f"{f'{fit_seconds:.1f} s' if fit_seconds is not None else '?':>9}"
+              f"{entry.get('created_at', '?'):>22}{age_days:>9.1f} d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and evict cached model fits')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='show cached fits, most recently used first')
+    evict_parser = commands.add_parser('evict', help='remove old or least recently used fits')
+    evict_parser.add_argument('--max-size-mb', type=float,
+                              help='keep the most recently used fits within this total size')
+    evict_parser.add_argument('--max-age-days', type=float,
+                              help='remove fits not used for this many days')
+    commands.add_parser('clear', help='remove every cached fit')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        entries = list_entries(args.cache_dir)
+        print_entries(entries)
+        print(f"{len(entries)} cached fits, "
+              f"{sum(entry['bytes'] for entry in entries) / 1e6:.1f} MB in {args.cache_dir}")
+        return
+
+    if args.command == 'evict':
+        if args.max_size_mb is None and args.max_age_days is None:
+            parser.error('evict needs --max-size-mb and/or --max-age-days')
+        removed = evict(
+            max_bytes=None if args.max_size_mb is None else args.max_size_mb * 1e6,
+            max_age_seconds=None if args.max_age_days is None else args.max_age_days * 86400,
+            cache_dir=args.cache_dir)
+    else:
+        removed = evict(max_bytes=0, cache_dir=args.cache_dir)
+
+    for entry in removed:
+        print(f"✓ Evicted {entry['key'][:12]} ({entry['model_type']}, {entry['bytes'] / 1e6:.1f} MB)")
+    print(f"{len(removed)} fits removed, {len(list_entries(args.cache_dir))} remaining")
+
+
+if __name__ == '__main__':
+    main()
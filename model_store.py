@@ -0,0 +1,511 @@
+"""
+================================================================================
+MODEL STORE - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Versioned serving artifacts with background hot reload
+
+Everything one prediction needs (the registry of named models, the scaler,
+their compiled forests, or the grid) is held in a single ModelBundle. A
+reload builds and warms a complete new bundle in a background thread, then
+replaces the active one with a single reference assignment. Requests read
+the active bundle once, so an in-flight request finishes on the bundle it
+started with and nothing waits on the reload. save_model.py writes a
+manifest with the artifact version and SHA-256 hashes; a model/scaler pair
+that does not match it (for example a retrain that is still writing files)
+is rejected and the old bundle keeps serving.
+================================================================================
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from feature_stage import feature_set_of, fitted_feature_set
+from forest_engine import CompiledForest, compile_model, is_tree_model
+from irradiance_grid import IrradianceGrid
+from portable_model import load_portable
+
+
+# ============================================================================
+# ARTIFACT FILES
+# ============================================================================
+
+def read_artifact(path):
+    """
+    Read an artifact file and return its bytes and SHA-256 hex digest
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def read_manifest(path):
+    """
+    Return the parsed artifact manifest, or None if there is none
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def artifact_signature(paths):
+    """
+    Return (mtime, size) for each file, or None for a missing file
+    """
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def unpickle_artifact(data):
+    """
+    Unpickle a joblib artifact from its bytes
+
+    joblib (and with it sklearn) is imported only here, so a service that
+    loads portable .npz files never imports either.
+    """
+    import joblib
+    return joblib.load(io.BytesIO(data))
+
+
+def combined_hash(hashes):
+    """
+    Hash a list of artifact digests into one content hash for the set
+    """
+    return hashlib.sha256(''.join(hashes).encode()).hexdigest()
+
+
+# ============================================================================
+# MODEL BUNDLE
+# ============================================================================
+
+class ModelBundle:
+    """
+    One consistent, immutable set of serving artifacts
+
+    models maps registry names to fitted estimators that share the scaler
+    (for a portable .npz file, its scaled-input CompiledForest or
+    LinearModel); engines holds a CompiledForest for each model that is a
+    forest, and headers the file header of each portable model.
+    feature_set names the features (feature_stage.py) that the scaler and
+    models take, built from the raw request features.
+    """
+
+    def __init__(self, models=None, scaler=None, engines=None, grid=None,
+                 version=None, content_hash=None, artifacts=None,
+                 signature=None, load_seconds=0.0, manifest=None, headers=None,
+                 feature_set='raw'):
+        self.models = models or {}
+        self.headers = headers or {}
+        self.scaler = scaler
+        self.feature_set = feature_set
+        self.engines = engines or {}
+        self.grid = grid
+        self.manifest = manifest or {}
+        self.version = version
+        self.content_hash = content_hash
+        self.artifacts = artifacts or {}
+        self.signature = signature
+        self.load_seconds = load_seconds
+        self.warmup_seconds = 0.0
+        self.loaded_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        # Single-row latency of each model, measured during warmup
+        self.latency_us = {}
+
+
+# ============================================================================
+# MODEL STORE
+# ============================================================================
+
+class ModelStore:
+    """
+    Holds the active ModelBundle and replaces it on reload
+
+    Reloads are triggered explicitly (reload / reload_async) or by a
+    watcher thread that polls the artifact files every poll_interval
+    seconds and reloads once a change has been stable for one poll. The
+    watcher is started lazily in the process that serves requests.
+
+    Under serve.py the master watches and reloads instead, so the workers
+    it forks afterwards share the new bundle copy-on-write: it sets
+    external_reload in each worker, which then starts no watcher and hands
+    reload_async() to the master.
+    """
+
+    def __init__(self, prediction_engine, model_paths, default_model, scaler_path,
+                 grid_path, grid_metadata_path, manifest_path, fuse_scaler=True,
+                 warmup_fn=None, poll_interval=5.0):
+        self.prediction_engine = prediction_engine
+        # Registry name -> .pkl or portable .npz path; only the default
+        # model is required
+        self.model_paths = dict(model_paths)
+        self.default_model = default_model
+        # None when every model is a portable file (they carry the scaler)
+        self.scaler_path = scaler_path
+        self.grid_path = grid_path
+        self.grid_metadata_path = grid_metadata_path
+        self.manifest_path = manifest_path
+        self.fuse_scaler = fuse_scaler
+        self.warmup_fn = warmup_fn
+        self.poll_interval = float(poll_interval)
+
+        # Empty until the first successful load
+        self.active = ModelBundle()
+
+        self._reload_lock = threading.Lock()
+        self._watch_lock = threading.Lock()
+        self._watcher_pid = None
+        self._swap_listeners = []
+
+        # Callable that reloads in another process instead (serve.py)
+        self.external_reload = None
+
+        self.loads = 0
+        self.failed_loads = 0
+        self.last_error = None
+        self._failed_signature = None
+        self._pending_signature = None
+
+    def artifact_paths(self):
+        """
+        Files whose content defines the active bundle (the watcher also
+        notices an optional model file appearing or disappearing)
+        """
+        if self.prediction_engine == 'grid':
+            return [self.grid_path, self.grid_metadata_path]
+        paths = list(self.model_paths.values())
+        return paths + [self.scaler_path] if self.scaler_path else paths
+
+    def _present_paths(self):
+        """
+        Artifact files to load: every required file plus the optional
+        registry models that exist on disk
+        """
+        if self.prediction_engine == 'grid':
+            return self.artifact_paths()
+        default_path = self.model_paths[self.default_model]
+        return [path for path in self.artifact_paths()
+                if path in (default_path, self.scaler_path) or os.path.exists(path)]
+
+    def on_swap(self, callback):
+        """
+        Register callback(bundle), called after a new bundle goes live
+        """
+        self._swap_listeners.append(callback)
+
+    # ========================================================================
+    # LOADING
+    # ========================================================================
+
+    def load(self):
+        """
+        Load, verify and compile a new bundle without activating it
+        """
+        started = time.perf_counter()
+        signature = artifact_signature(self.artifact_paths() + [self.manifest_path])
+        paths = self._present_paths()
+
+        # Hash the exact bytes that are unpickled, and refuse a set of
+        # files that does not match the manifest before doing any work
+        contents = [read_artifact(path) for path in paths]
+        hashes = [digest for _, digest in contents]
+        artifacts = {os.path.basename(path): digest for path, digest in zip(paths, hashes)}
+        manifest = self._check_manifest(artifacts)
+
+        if self.prediction_engine == 'grid':
+            del contents
+            # Memory-mapped, so worker processes share a single copy
+            grid = IrradianceGrid.load(self.grid_path, self.grid_metadata_path)
+            max_error = grid.metadata['error']['random_inputs']['max_abs_error']
+            print(f"✓ Grid loaded {grid.values.shape} (max error {max_error} W/m²)")
+            bundle_parts = {'grid': grid}
+        else:
+            files = {path: data for path, (data, _) in zip(paths, contents)}
+            del contents
+            scaler = None
+            if self.scaler_path:
+                scaler = unpickle_artifact(files.pop(self.scaler_path))
+                print("✓ Scaler loaded successfully")
+
+            models = {}
+            engines = {}
+            headers = {}
+            for name, path in self.model_paths.items():
+                fused = None
+                if path not in files:
+                    print(f"⚠ Model '{name}' not found ({path}), skipping")
+                    continue
+                if path.endswith('.npz'):
+                    models[name], file_scaler, headers[name], fused = load_portable(
+                        io.BytesIO(files.pop(path)))
+                    scaler = self._shared_scaler(scaler, file_scaler, path)
+                    print(f"✓ Model '{name}' loaded (portable {headers[name]['model_type']})")
+                else:
+                    models[name] = unpickle_artifact(files.pop(path))
+                    print(f"✓ Model '{name}' loaded ({type(models[name]).__name__})")
+                # Forests, single trees and gradient boosting get the
+                # array-backed engine
+                if isinstance(models[name], CompiledForest) or is_tree_model(models[name]):
+                    engine = self._compile(models[name], scaler, fused)
+                    if engine is not None:
+                        engines[name] = engine
+            del files
+
+            bundle_parts = {'models': models, 'scaler': scaler, 'engines': engines,
+                            'headers': headers,
+                            'feature_set': self._feature_set(scaler, models, headers)}
+
+        return ModelBundle(
+            version=(manifest or {}).get('version', 'unversioned'),
+            manifest=manifest,
+            content_hash=combined_hash(hashes),
+            artifacts=artifacts,
+            signature=signature,
+            load_seconds=time.perf_counter() - started,
+            **bundle_parts
+        )
+
+    @staticmethod
+    def _shared_scaler(scaler, file_scaler, path):
+        """
+        Return the bundle's scaler, refusing a portable file that was saved
+        with a different one
+        """
+        if scaler is None:
+            return file_scaler
+        if not (np.array_equal(scaler.mean_, file_scaler.mean_)
+                and np.array_equal(scaler.scale_, file_scaler.scale_)):
+            raise ValueError(f'{path} was saved with a different scaler than the other artifacts')
+        return scaler
+
+    @staticmethod
+    def _feature_set(scaler, models, headers):
+        """
+        Feature set of the loaded artifacts, refusing a scaler and models
+        fitted on different ones; their recorded feature names are dropped
+        once it is known
+        """
+        feature_sets = {feature_set_of(header['features']) for header in headers.values()}
+        for fitted in [scaler] + list(models.values()):
+            if hasattr(fitted, 'feature_names_in_'):
+                feature_sets.add(fitted_feature_set(fitted))
+        if len(feature_sets) > 1:
+            raise ValueError(f"Artifacts mix feature sets: {', '.join(sorted(feature_sets))}")
+        feature_set = feature_sets.pop() if feature_sets else 'raw'
+        print(f"✓ Feature set: {feature_set}")
+
+        # The service passes bare matrices in the feature set's column
+        # order; with the names recorded at fit time sklearn would warn
+        # "X does not have valid feature names" on every call
+        for fitted in [scaler] + list(models.values()):
+            if hasattr(fitted, 'feature_names_in_'):
+                del fitted.feature_names_in_
+        return feature_set
+
+    def _compile(self, model, scaler, fused=None):
+        """
+        Export the forest into flat arrays and fold the scaler into it
+
+        fused is a forest with precomputed fused thresholds (from a portable
+        file); it is used when it passes verification, which is much faster
+        than fusing.
+        """
+        if self.prediction_engine != 'compiled':
+            return None
+
+        if isinstance(model, CompiledForest):
+            engine = model
+        else:
+            engine = compile_model(model)
+        print(f"✓ Compiled forest ready ({engine.n_trees} trees, {engine.n_nodes} nodes)")
+
+        if self.fuse_scaler and fused is not None:
+            if engine.verify_fusion(fused, scaler) == 0:
+                print("✓ Stored fused thresholds verified on every split")
+                return fused
+            print("⚠ Stored fused thresholds do not match the scaler, fusing again")
+        if self.fuse_scaler:
+            fused_engine = engine.fuse_scaler(scaler)
+            mismatches = engine.verify_fusion(fused_engine, scaler)
+            if mismatches == 0:
+                print("✓ Scaler fused into split thresholds (verified on every split)")
+                return fused_engine
+            print(f"✗ Scaler fusion failed verification on {mismatches} splits, "
+                  f"keeping two-stage path")
+        return engine
+
+    def _check_manifest(self, artifacts):
+        """
+        Return the manifest that describes the loaded files (None if there
+        is none, or if it records none of them), or raise if any file it
+        records does not match its hash
+
+        Files the manifest does not record (a model added after it was
+        written) are loaded unverified with a warning; every other file is
+        still checked.
+        """
+        manifest = read_manifest(self.manifest_path)
+        if manifest is None:
+            return None
+
+        recorded = manifest.get('artifacts', {})
+        unrecorded = [name for name in artifacts if name not in recorded]
+        for name, digest in artifacts.items():
+            if name in recorded and recorded[name]['sha256'] != digest:
+                raise ValueError(f'{name} does not match manifest version '
+                                 f'{manifest.get("version")} (artifacts still being written?)')
+        if len(unrecorded) == len(artifacts):
+            # Manifest describes other artifacts (e.g. grid mode)
+            return None
+        if unrecorded:
+            print(f"⚠ Not in manifest version {manifest.get('version')}, loaded unverified: "
+                  f"{', '.join(unrecorded)}")
+        return manifest
+
+    # ========================================================================
+    # RELOAD AND SWAP
+    # ========================================================================
+
+    def reload(self):
+        """
+        Load and warm a new bundle, then make it the active one
+
+        On failure the current bundle keeps serving and the error is
+        re-raised.
+        """
+        with self._reload_lock:
+            return self._reload()
+
+    def reload_async(self):
+        """
+        Start a reload in a background thread
+
+        Returns False if a reload is already running.
+        """
+        if self.external_reload is not None:
+            self.external_reload()
+            return True
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self._reload()
+            except Exception:
+                pass
+            finally:
+                self._reload_lock.release()
+
+        threading.Thread(target=run, daemon=True, name='model-reload').start()
+        return True
+
+    def _reload(self):
+        try:
+            bundle = self.load()
+            if self.warmup_fn is not None:
+                started = time.perf_counter()
+                self.warmup_fn(bundle)
+                bundle.warmup_seconds = time.perf_counter() - started
+        except Exception as e:
+            self.failed_loads += 1
+            self.last_error = str(e)
+            # Do not retry the same files until they change again
+            self._failed_signature = artifact_signature(
+                self.artifact_paths() + [self.manifest_path])
+            print(f"✗ Model reload failed, keeping version {self.active.version}: {str(e)}")
+            raise
+
+        # Single reference assignment: requests see the old or the new
+        # bundle, never a mix of both
+        self.active = bundle
+        self.loads += 1
+        self.last_error = None
+        for callback in self._swap_listeners:
+            callback(bundle)
+
+        print(f"✓ Serving model version {bundle.version} "
+              f"(sha256 {bundle.content_hash[:12]}, loaded in {bundle.load_seconds:.2f} s)")
+        return bundle
+
+    @property
+    def reloading(self):
+        return self._reload_lock.locked()
+
+    # ========================================================================
+    # FILE WATCHER
+    # ========================================================================
+
+    def ensure_watcher(self):
+        """
+        Start the artifact watcher thread in this process if it is not running
+        """
+        if self.poll_interval <= 0 or self.external_reload is not None:
+            return
+        pid = os.getpid()
+        if self._watcher_pid == pid:
+            return
+        with self._watch_lock:
+            if self._watcher_pid != pid:
+                threading.Thread(target=self._watch, daemon=True,
+                                 name='model-watcher').start()
+                self._watcher_pid = pid
+
+    def changed_on_disk(self):
+        """
+        One watcher poll: True once the artifact files differ from the
+        active bundle and have not changed since the previous poll
+        """
+        signature = artifact_signature(self.artifact_paths() + [self.manifest_path])
+        if signature == self.active.signature or signature == self._failed_signature:
+            self._pending_signature = None
+            return False
+        if signature != self._pending_signature:
+            # Changed since the last poll; wait until writes settle
+            self._pending_signature = signature
+            return False
+        self._pending_signature = None
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            if self.changed_on_disk():
+                self.reload_async()
+
+    # ========================================================================
+    # STATUS
+    # ========================================================================
+
+    def stats(self):
+        """
+        Return the active version and load counters
+        """
+        bundle = self.active
+        return {
+            'version': bundle.version,
+            'content_hash': bundle.content_hash,
+            'artifacts': bundle.artifacts,
+            'loaded_at': bundle.loaded_at,
+            'load_seconds': round(bundle.load_seconds, 3),
+            'warmup_seconds': round(bundle.warmup_seconds, 3),
+            'loads': self.loads,
+            'failed_loads': self.failed_loads,
+            'last_error': self.last_error,
+            'reloading': self.reloading,
+            'watch_interval_seconds': self.poll_interval
+        }
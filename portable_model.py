@@ -0,0 +1,172 @@
+"""
+================================================================================
+PORTABLE MODEL FORMAT - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Versioned, NumPy-only model files that need neither sklearn nor
+         unpickling to load
+
+One .npz file holds a complete serving model: the StandardScaler
+parameters plus either a forest (a RandomForestRegressor, or a
+DecisionTreeRegressor as a one-tree forest, in compact_forest.py's
+encoding), the trees and baseline of a HistGradientBoostingRegressor
+(kind 'boosting', same encoding) or the coefficients of a
+LinearRegression. A JSON header records
+the format version, model kind and feature order. Loading is np.load
+with allow_pickle=False, so it does not depend on the installed
+scikit-learn version and never runs pickled code.
+
+Forest files also carry the split thresholds with the scaler fused in
+(CompiledForest.fuse_scaler), which take most of the time to compute at
+startup; the service only has to verify them.
+
+The NumPy replacements below reproduce sklearn's arithmetic exactly:
+PortableScaler.transform gives the same result as StandardScaler.transform
+and LinearModel.predict as LinearRegression.predict.
+================================================================================
+"""
+
+import io
+import json
+import os
+
+import numpy as np
+from compact_forest import forest_arrays, forest_from_arrays
+from forest_engine import BoostedForest, compile_model, is_tree_model
+
+FORMAT_NAME = 'solar-irradiance-model'
+
+# Bumped whenever the file layout changes; loaders refuse other versions
+PORTABLE_FORMAT_VERSION = 1
+
+
+# ============================================================================
+# NUMPY MODEL OBJECTS
+# ============================================================================
+
+class PortableScaler:
+    """
+    Fitted StandardScaler parameters with the same transform()
+    """
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        # Attributes read by CompiledForest.fuse_scaler, as on StandardScaler
+        self.with_mean = True
+        self.with_std = True
+        self.n_features_in_ = len(self.mean_)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class LinearModel:
+    """
+    Fitted LinearRegression coefficients with the same predict()
+    """
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+# ============================================================================
+# SAVE AND LOAD
+# ============================================================================
+
+def save_portable(model, scaler, path, feature_names, forest=None, metadata=None):
+    """
+    Write a fitted sklearn model and its scaler as a portable .npz file
+
+    Forests and trees are exported through CompiledForest, gradient
+    boosting through BoostedForest; pass forest to store an already
+    exported (for example pruned) one instead. The file
+    is written under a temporary name and renamed into place, so a
+    watching service never reads half of it. Returns the file size.
+    """
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+    scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+
+    header = dict(metadata or {})
+    header.update({
+        'format': FORMAT_NAME,
+        'format_version': PORTABLE_FORMAT_VERSION,
+        'model_type': type(model).__name__,
+        'features': list(feature_names)
+    })
+    arrays = {'scaler_mean': np.asarray(mean, dtype=np.float64),
+              'scaler_scale': np.asarray(scale, dtype=np.float64)}
+
+    if is_tree_model(model):
+        if forest is None:
+            forest = compile_model(model)
+        boosted = isinstance(forest, BoostedForest)
+        header.update({'kind': 'boosting' if boosted else 'forest', 'n_trees': forest.n_trees,
+                       'n_nodes': forest.n_nodes, 'max_depth': forest.max_depth})
+        if hasattr(model, 'n_estimators'):
+            header['n_estimators'] = model.n_estimators
+        arrays.update(forest_arrays(forest))
+        if boosted:
+            arrays['baseline'] = np.array([forest.baseline], dtype=np.float64)
+        # Fuse the trees as they will be loaded (forests: float32 thresholds)
+        stored = forest_from_arrays(arrays, forest.max_depth,
+                                    forest.baseline if boosted else None)
+        fused = stored.fuse_scaler(PortableScaler(mean, scale))
+        arrays['fused_threshold'] = fused.threshold[stored.internal_nodes()]
+    elif hasattr(model, 'coef_'):
+        header['kind'] = 'linear'
+        arrays['coef'] = np.ravel(model.coef_).astype(np.float64)
+        arrays['intercept'] = np.array([np.ravel(model.intercept_)[0]], dtype=np.float64)
+    else:
+        raise ValueError(f'Cannot export {type(model).__name__} to the portable format')
+
+    arrays['header'] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    os.replace(temp_path, path)
+    return os.path.getsize(path)
+
+
+def load_portable(source):
+    """
+    Load a portable model file (path or file object)
+
+    Returns (model, scaler, header, fused): model is an unfused
+    CompiledForest (BoostedForest for gradient boosting) or a
+    LinearModel, scaler a PortableScaler, and fused the same trees with
+    the stored fused thresholds (None for linear models).
+    Verify fused with model.verify_fusion(fused, scaler) before use.
+    """
+    with np.load(source, allow_pickle=False) as arrays:
+        header = json.loads(arrays['header'].tobytes().decode())
+        if header.get('format') != FORMAT_NAME:
+            raise ValueError('Not a portable solar irradiance model file')
+        if header.get('format_version') != PORTABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported portable model format version "
+                             f"{header.get('format_version')} "
+                             f"(expected {PORTABLE_FORMAT_VERSION}); re-run save_model.py")
+
+        scaler = PortableScaler(arrays['scaler_mean'], arrays['scaler_scale'])
+        fused = None
+        if header['kind'] in ('forest', 'boosting'):
+            baseline = arrays['baseline'][0] if header['kind'] == 'boosting' else None
+            model = forest_from_arrays(arrays, header['max_depth'], baseline)
+            threshold = model.threshold.copy()
+            threshold[model.internal_nodes()] = arrays['fused_threshold']
+            fused = model.with_thresholds(threshold, fused=True)
+        elif header['kind'] == 'linear':
+            model = LinearModel(arrays['coef'], arrays['intercept'][0])
+        else:
+            raise ValueError(f"Unknown portable model kind: {header['kind']}")
+    return model, scaler, header, fused
@@ -0,0 +1,138 @@
+"""
+================================================================================
+PREDICTION CACHE - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Bounded in-process LRU cache in front of the prediction model
+
+Requests repeat the same feature combinations often (24 hours x 12 months,
+dropdown steps for humidity, coarse temperature and cloud cover), so the
+same forest evaluation is recomputed again and again. The cache keys on the
+normalized feature tuple, optionally snapping inputs to a configured step.
+It does not watch the artifact files itself: the model store
+(model_store.py) clears it whenever a reloaded bundle goes live.
+================================================================================
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def parse_quantization(spec, feature_order):
+    """
+    Parse a quantization spec such as "temperature=0.5,cloud_cover=5"
+
+    Returns a list of steps aligned with feature_order (None = exact).
+    """
+    steps = dict.fromkeys(feature_order)
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, step = item.partition('=')
+        name = name.strip()
+        if name not in steps:
+            raise ValueError(f'Unknown feature in cache quantization: {name}')
+        step = float(step)
+        if step <= 0:
+            raise ValueError(f'Quantization step for {name} must be positive')
+        steps[name] = step
+    return [steps[name] for name in feature_order]
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache mapping normalized features to predictions
+
+    Hit, miss, eviction and flush counters are kept for the /cache-stats
+    endpoint.
+    """
+
+    def __init__(self, max_size=4096, steps=None):
+        self.max_size = int(max_size)
+        self.steps = list(steps) if steps else None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+
+    # ========================================================================
+    # KEY NORMALIZATION
+    # ========================================================================
+
+    def normalize(self, features):
+        """
+        Snap features to their quantization step and return the cache key
+
+        The key doubles as the (possibly quantized) input to predict, so a
+        cached value always belongs to exactly the features it is keyed on.
+        """
+        if self.steps is None:
+            return tuple(float(value) for value in features)
+        return tuple(
+            float(value) if step is None else round(value / step) * step
+            for value, step in zip(features, self.steps)
+        )
+
+    # ========================================================================
+    # LOOKUP AND INSERT
+    # ========================================================================
+
+    def get(self, key):
+        """
+        Return the cached prediction for key, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Insert a prediction, evicting the least recently used entry if full
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every cached prediction (counters are kept)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.flushes += 1
+
+    # ========================================================================
+    # STATISTICS
+    # ========================================================================
+
+    def stats(self):
+        """
+        Return cache counters as a JSON-serializable dict
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'flushes': self.flushes,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'quantization': self.steps
+            }
@@ -13,6 +13,8 @@ Phase: Prediction - Data Preparation Only
 
 import pandas as pd
 import numpy as np
+from feature_stage import FEATURE_SET, FEATURE_SETS, RAW_FEATURES, build_features
+from prepared_data import PREPARED_FORMAT, SPLIT_RANDOM_STATE, TEST_SIZE, save_prepared
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
@@ -37,7 +39,7 @@ print()
 print("STEP 2: Selecting features and target variable...")
 
 # Input features (X)
-feature_columns = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
+feature_columns = RAW_FEATURES
 X = df[feature_columns].copy()
 
 # Target variable (y)
@@ -81,17 +83,30 @@ print(f"✓ Clean dataset: {len(X)} rows")
 print()
 
 # ============================================================================
-# STEP 4: TRAIN-TEST SPLIT
+# STEP 4: FEATURE STAGE
 # ============================================================================
 
-print("STEP 4: Splitting data into training and testing sets...")
+print(f"STEP 4: Building model features (feature set '{FEATURE_SET}')...")
+
+# The service computes the same features per request (feature_stage.py)
+feature_columns = FEATURE_SETS[FEATURE_SET]
+X = pd.DataFrame(build_features(X.values, FEATURE_SET), columns=feature_columns, index=X.index)
+
+print(f"✓ Model features: {', '.join(feature_columns)}")
+print()
+
+# ============================================================================
+# STEP 5: TRAIN-TEST SPLIT
+# ============================================================================
+
+print("STEP 5: Splitting data into training and testing sets...")
 
 # Split ratio: 80% training, 20% testing
 # random_state=42 ensures reproducibility
 X_train, X_test, y_train, y_test = train_test_split(
     X, y, 
-    test_size=0.2, 
-    random_state=42
+    test_size=TEST_SIZE, 
+    random_state=SPLIT_RANDOM_STATE
 )
 
 print("Split Configuration:")
@@ -108,10 +123,10 @@ print(f"  y_test:  {y_test.shape}")
 print()
 
 # ============================================================================
-# STEP 5: FEATURE SCALING
+# STEP 6: FEATURE SCALING
 # ============================================================================
 
-print("STEP 5: Applying feature scaling...")
+print("STEP 6: Applying feature scaling...")
 
 # Initialize StandardScaler
 scaler = StandardScaler()
@@ -134,7 +149,7 @@ print("✓ Testing features scaled")
 print()
 
 # ============================================================================
-# STEP 6: OUTPUT VALIDATION
+# STEP 7: OUTPUT VALIDATION
 # ============================================================================
 
 print("="*80)
@@ -173,18 +188,19 @@ print()
 # SAVE PREPARED DATA (OPTIONAL)
 # ============================================================================
 
-print("Saving prepared datasets...")
+print(f"Saving prepared datasets (format '{PREPARED_FORMAT}')...")
 
-# Save to CSV for future use
-X_train_scaled.to_csv('X_train_scaled.csv', index=False)
-X_test_scaled.to_csv('X_test_scaled.csv', index=False)
-y_train.to_csv('y_train.csv', index=False, header=['solar_irradiance'])
-y_test.to_csv('y_test.csv', index=False, header=['solar_irradiance'])
+# Memory-mapped .npy files by default, CSV with PREPARED_FORMAT=csv or
+# both (prepared_data.py)
+written = save_prepared({
+    'X_train': X_train_scaled,
+    'X_test': X_test_scaled,
+    'y_train': y_train,
+    'y_test': y_test
+})
 
-print("✓ X_train_scaled.csv")
-print("✓ X_test_scaled.csv")
-print("✓ y_train.csv")
-print("✓ y_test.csv")
+for path in written:
+    print(f"✓ {path}")
 print()
 
 print("="*80)
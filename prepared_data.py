@@ -0,0 +1,136 @@
+"""
+================================================================================
+PREPARED DATASETS - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Write and load the scaled train/test split that
+         prepare_prediction_data.py produces for the training scripts
+
+Two formats:
+
+- npy: one float64 .npy file per array plus prepared_datasets.json with the
+       column names and row counts. Loading memory-maps the files
+       (np.load with mmap_mode='r'), so there is no text parsing and no
+       copy; worker processes that load the same split share the page cache.
+- csv: X_train_scaled.csv, X_test_scaled.csv, y_train.csv and y_test.csv,
+       as shipped in the repository.
+
+The arrays stay float64, so the npy files hold exactly the values
+prepare_prediction_data.py computed. Reading the CSV files back with
+pandas' default float parser can be off by one unit in the last place,
+so a switch of format gives new model cache keys (model_cache.py) once.
+
+load_prepared() uses the npy files when prepared_datasets.json exists and
+the CSV files otherwise. The index is written last and removed first, so
+an interrupted or CSV-only run never leaves a stale binary split in front
+of newer CSVs.
+================================================================================
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Format prepare_prediction_data.py writes: 'npy', 'csv' or 'both'
+PREPARED_FORMAT = os.environ.get('PREPARED_FORMAT', 'npy')
+PREPARED_FORMATS = ['npy', 'csv', 'both']
+
+TARGET_COLUMN = 'solar_irradiance'
+
+# Train/test split of prepare_prediction_data.py (incremental_training.py
+# repeats it to keep the test rows out of incremental fits)
+TEST_SIZE = 0.2
+SPLIT_RANDOM_STATE = 42
+
+CSV_FILES = {
+    'X_train': 'X_train_scaled.csv',
+    'X_test': 'X_test_scaled.csv',
+    'y_train': 'y_train.csv',
+    'y_test': 'y_test.csv'
+}
+NPY_FILES = {
+    'X_train': 'X_train_scaled.npy',
+    'X_test': 'X_test_scaled.npy',
+    'y_train': 'y_train.npy',
+    'y_test': 'y_test.npy'
+}
+
+# Column names and row counts of the npy files; its presence selects them
+INDEX_PATH = 'prepared_datasets.json'
+
+
+def save_prepared(datasets, prepared_format=PREPARED_FORMAT):
+    """
+    Write the split (DataFrames X_train/X_test, Series y_train/y_test) in a
+    format; returns the paths written
+    """
+    if prepared_format not in PREPARED_FORMATS:
+        raise ValueError(f"Unknown prepared format '{prepared_format}' "
+                         f"(expected one of {', '.join(PREPARED_FORMATS)})")
+    if os.path.exists(INDEX_PATH):
+        os.remove(INDEX_PATH)
+
+    written = []
+    if prepared_format in ('csv', 'both'):
+        for name, path in CSV_FILES.items():
+            if name.startswith('X'):
+                datasets[name].to_csv(path, index=False)
+            else:
+                datasets[name].to_csv(path, index=False, header=[TARGET_COLUMN])
+            written.append(path)
+
+    if prepared_format in ('npy', 'both'):
+        for name, path in NPY_FILES.items():
+            np.save(path, np.ascontiguousarray(datasets[name].values, dtype=np.float64))
+            written.append(path)
+        index = {
+            'columns': list(datasets['X_train'].columns),
+            'target': TARGET_COLUMN,
+            'dtype': 'float64',
+            'files': NPY_FILES,
+            'rows': {name: len(datasets[name]) for name in NPY_FILES}
+        }
+        with open(INDEX_PATH, 'w') as f:
+            json.dump(index, f, indent=2)
+        written.append(INDEX_PATH)
+    return written
+
+
+def stored_format():
+    """
+    Format load_prepared() reads: 'npy' or 'csv'
+    """
+    return 'npy' if os.path.exists(INDEX_PATH) else 'csv'
+
+
+def load_prepared():
+    """
+    The prepared split: DataFrames X_train/X_test and Series y_train/y_test
+    (memory-mapped when stored as npy)
+    """
+    if stored_format() == 'csv':
+        return {
+            'X_train': pd.read_csv(CSV_FILES['X_train']),
+            'X_test': pd.read_csv(CSV_FILES['X_test']),
+            'y_train': pd.read_csv(CSV_FILES['y_train'])[TARGET_COLUMN],
+            'y_test': pd.read_csv(CSV_FILES['y_test'])[TARGET_COLUMN]
+        }
+
+    with open(INDEX_PATH) as f:
+        index = json.load(f)
+    datasets = {}
+    for name, path in index['files'].items():
+        values = np.load(path, mmap_mode='r')
+        if len(values) != index['rows'][name]:
+            raise ValueError(f'{path} has {len(values)} rows, {INDEX_PATH} expects '
+                             f"{index['rows'][name]}; re-run prepare_prediction_data.py")
+        if name.startswith('X'):
+            datasets[name] = pd.DataFrame(values, columns=index['columns'], copy=False)
+        else:
+            datasets[name] = pd.Series(values, name=index['target'], copy=False)
+    return datasets
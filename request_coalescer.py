@@ -0,0 +1,157 @@
+"""
+================================================================================
+REQUEST COALESCER - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Micro-batch concurrent single-row predictions
+
+Each Flask thread hands its row to the coalescer and waits. A background
+thread collects rows arriving within a short window (or until the batch is
+full), runs them through one vectorized predict call, and hands each caller
+back its own result. Batch size and queue wait statistics are recorded so
+the window can be tuned.
+================================================================================
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class RequestCoalescer:
+    """
+    Collects single-row requests into batches for one predict call
+
+    predict_fn takes an (n, n_features) matrix and returns n predictions.
+    The worker thread is started lazily in the process that first submits,
+    so the coalescer also works after the service forks worker processes.
+    """
+
+    def __init__(self, predict_fn, window_ms=2.0, max_batch_size=64,
+                 history_size=1000):
+        self.predict_fn = predict_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = int(max_batch_size)
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+        self.batches = 0
+        self.requests = 0
+        self.max_seen_batch = 0
+        self._batch_sizes = deque(maxlen=history_size)
+        self._wait_times = deque(maxlen=history_size)
+
+    # ========================================================================
+    # CALLER SIDE
+    # ========================================================================
+
+    def submit(self, features):
+        """
+        Queue one feature row and block until its prediction is ready
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((features, time.perf_counter(), future))
+        return future.result()
+
+    def _ensure_worker(self):
+        """
+        Start the batching thread in this process if it is not running
+        """
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid != pid:
+                # Queued items from a parent process did not survive the fork
+                self._queue = queue.Queue()
+                worker = threading.Thread(target=self._run, daemon=True,
+                                          name='prediction-coalescer')
+                worker.start()
+                self._worker_pid = pid
+
+    # ========================================================================
+    # BATCHING THREAD
+    # ========================================================================
+
+    def _collect_batch(self):
+        """
+        Block for the first request, then gather more until the window
+        closes or the batch is full
+        """
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            started = time.perf_counter()
+
+            rows = np.array([features for features, _, _ in batch], dtype=float)
+            try:
+                predictions = self.predict_fn(rows)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, _, future), value in zip(batch, predictions):
+                    future.set_result(float(value))
+
+            self._record(len(batch), [started - queued for _, queued, _ in batch])
+
+    # ========================================================================
+    # STATISTICS
+    # ========================================================================
+
+    def _record(self, batch_size, wait_times):
+        with self._lock:
+            self.batches += 1
+            self.requests += batch_size
+            self.max_seen_batch = max(self.max_seen_batch, batch_size)
+            self._batch_sizes.append(batch_size)
+            self._wait_times.extend(wait_times)
+
+    def stats(self):
+        """
+        Return batching counters and recent batch size / wait percentiles
+        """
+        with self._lock:
+            sizes = np.array(self._batch_sizes, dtype=float)
+            waits_ms = np.array(self._wait_times, dtype=float) * 1000.0
+
+        def percentiles(values):
+            if len(values) == 0:
+                return {'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            return {'p50': round(float(p50), 3), 'p90': round(float(p90), 3),
+                    'p99': round(float(p99), 3), 'max': round(float(values.max()), 3)}
+
+        return {
+            'window_ms': self.window * 1000.0,
+            'max_batch_size': self.max_batch_size,
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_batch_size': round(self.requests / self.batches, 3) if self.batches else 0.0,
+            'largest_batch': self.max_seen_batch,
+            'recent_batch_size': percentiles(sizes),
+            'recent_wait_ms': percentiles(waits_ms)
+        }
@@ -0,0 +1,157 @@
+"""
+================================================================================
+INCREMENTAL RETRAINING - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Update the deployed Random Forest with the rows appended to
+         weather_environmental_data.csv since its training watermark,
+         replacing INCREMENTAL_TREES trees instead of refitting all of them
+         (see incremental_training.py)
+
+The scaler is kept as it is: the existing trees split on features scaled
+with it. The updated forest is written to random_forest_model.pkl and its
+portable file, and the manifest gets a new version and hashes, so a running
+service hot-reloads it. Only the forest's own watermark
+(manifest['models']['random_forest']['watermark']) advances; the top-level
+watermark stays at the data save_model.py trained every model on and
+prepare_prediction_data.py split, so the split's test rows can be kept out
+of the update. Run save_model.py for a full refit
+(and a new scaler) from time to time.
+================================================================================
+"""
+
+import os
+import sys
+import time
+import warnings
+import joblib
+from sklearn.metrics import mean_absolute_error
+from compact_forest import prune_forest
+from forest_engine import CompiledForest
+from incremental_training import (TARGET_COLUMN, WATERMARK_COLUMN, holdout_mask, load_rows,
+                                  prepared_test_mask, rolling_update, scaled_features,
+                                  update_seed)
+from model_artifacts import (artifact_entry, atomic_dump, new_version, portable_path,
+                             write_manifest)
+from model_store import read_manifest
+from portable_model import load_portable, save_portable
+
+warnings.filterwarnings('ignore')
+
+DATA_PATH = 'weather_environmental_data.csv'
+MODEL_PATH = 'random_forest_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+MANIFEST_PATH = 'model_manifest.json'
+
+# Trees replaced per update (of the forest's 100)
+INCREMENTAL_TREES = int(os.environ.get('INCREMENTAL_TREES', '20'))
+
+print("="*80)
+print("INCREMENTAL RETRAINING - RANDOM FOREST")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: LOAD DEPLOYED MODEL AND WATERMARK
+# ============================================================================
+
+print("STEP 1: Loading deployed model and watermark...")
+manifest = read_manifest(MANIFEST_PATH)
+if not manifest or 'watermark' not in manifest:
+    print(f"✗ {MANIFEST_PATH} has no training watermark; run save_model.py first")
+    sys.exit(1)
+# Manifests written before per-model watermarks only have the top-level one
+entry = manifest['models']['random_forest']
+watermark = entry.get('watermark', manifest['watermark'])
+model = joblib.load(MODEL_PATH)
+scaler = joblib.load(SCALER_PATH)
+print(f"✓ {len(model.estimators_)} trees trained up to {watermark}")
+print()
+
+# ============================================================================
+# STEP 2: NEW ROWS SINCE THE WATERMARK
+# ============================================================================
+
+print("STEP 2: Reading rows appended since the watermark...")
+data = load_rows(DATA_PATH)
+new_rows = data[data[WATERMARK_COLUMN] > watermark]
+if new_rows.empty:
+    print(f"✓ No new rows after {watermark}; model is up to date")
+    sys.exit(0)
+new_watermark = new_rows[WATERMARK_COLUMN].max()
+holdout = holdout_mask(data)
+# Never fit the test rows the manifest's test MAE is measured on
+prepared_test = prepared_test_mask(data, manifest['watermark'])
+training = data[~holdout & ~prepared_test]
+new_holdout = new_rows[holdout_mask(new_rows)]
+print(f"✓ {len(new_rows)} new rows ({new_rows[WATERMARK_COLUMN].min()} to {new_watermark})")
+print(f"✓ Fitting on {len(training)} rows; {len(new_holdout)} new rows held out for evaluation, "
+      f"{int((prepared_test & ~holdout).sum())} prepared test rows excluded")
+print()
+
+# ============================================================================
+# STEP 3: ROLLING TREE UPDATE
+# ============================================================================
+
+print(f"STEP 3: Replacing the {INCREMENTAL_TREES} oldest trees...")
+X_new_holdout = scaled_features(new_holdout, scaler)
+mae_before = mean_absolute_error(new_holdout[TARGET_COLUMN], model.predict(X_new_holdout))
+
+started = time.perf_counter()
+rolling_update(model, scaled_features(training, scaler), training[TARGET_COLUMN],
+               INCREMENTAL_TREES, update_seed(new_watermark))
+update_seconds = time.perf_counter() - started
+
+mae_after = mean_absolute_error(new_holdout[TARGET_COLUMN], model.predict(X_new_holdout))
+print(f"✓ Updated in {update_seconds:.1f} s "
+      f"({INCREMENTAL_TREES / len(model.estimators_):.0%} of the trees refitted)")
+print(f"✓ MAE on held-out new rows: {mae_before:.2f} → {mae_after:.2f} W/m²")
+print()
+
+# ============================================================================
+# STEP 4: SAVE ARTIFACTS AND MANIFEST
+# ============================================================================
+
+print("STEP 4: Saving artifacts...")
+atomic_dump(model, MODEL_PATH)
+print(f"✓ Model saved: {MODEL_PATH}")
+
+portable = portable_path(MODEL_PATH)
+header = load_portable(portable)[2] if os.path.exists(portable) else {}
+prune_tolerance = header.get('prune_tolerance', 0.0)
+forest = CompiledForest.from_sklearn(model)
+if prune_tolerance > 0:
+    forest = prune_forest(forest, prune_tolerance)
+feature_names = list(model.feature_names_in_)
+save_portable(model, scaler, portable, feature_names, forest=forest,
+              metadata={'prune_tolerance': prune_tolerance, 'watermark': new_watermark})
+print(f"✓ Portable model saved: {portable}")
+
+version, created_at = new_version()
+# The full-training test MAE no longer describes this forest
+entry.pop('test_mae', None)
+entry.pop('portable_test_mae', None)
+entry.setdefault('incremental_updates', []).append({
+    'version': version,
+    'from_watermark': watermark,
+    'watermark': new_watermark,
+    'new_rows': len(new_rows),
+    'trees_replaced': INCREMENTAL_TREES,
+    'seconds': round(update_seconds, 2),
+    'new_rows_holdout_mae': round(float(mae_after), 3)
+})
+entry['watermark'] = new_watermark
+manifest.update({'version': version, 'created_at': created_at})
+for path in [MODEL_PATH, portable]:
+    if path in manifest['artifacts']:
+        manifest['artifacts'][path] = artifact_entry(path)
+write_manifest(manifest, MANIFEST_PATH)
+print(f"✓ Manifest saved: {MANIFEST_PATH} (version {version}, watermark {new_watermark})")
+print()
+
+print("="*80)
+print("INCREMENTAL RETRAINING COMPLETE")
+print("="*80)
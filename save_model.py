@@ -6,14 +6,62 @@ Project: Intelligent Solar Energy Analytics & Prediction System
 Role: Machine Learning Engineer
 Organization: Emmvee Solar Systems Pvt. Ltd.
 
-Purpose: Save trained Random Forest model and scaler for deployment
+Purpose: Save trained Random Forest model and scaler for deployment,
+         plus the Decision Tree and Linear Regression baselines that the
+         service offers as faster, less accurate alternatives (?model=),
+         and the Histogram Gradient Boosting model, which matches the
+         forest at a fraction of its training and prediction cost
+
+Every model is also written with its scaler as a portable NumPy file
+(portable_model.py) that the service can load instead of the pickles,
+without sklearn (MODEL_FORMAT=portable).
+
+Artifacts are written to temporary files and renamed into place, then a
+manifest records their version and SHA-256 hashes (model_artifacts.py). A
+running service reloads the pair only once it matches the manifest, so it
+never serves a new model with an old scaler (or a half-written file). The
+manifest and portable headers also record the training watermark, the
+newest row of the dataset, at the top level and per model;
+retrain_incremental.py advances only the entry of the model it updates.
 ================================================================================
 """
 
 import pandas as pd
-import joblib
-from sklearn.ensemble import RandomForestRegressor
+from compact_forest import prune_forest
+from feature_stage import RAW_FEATURES, build_features, feature_set_of
+from forest_engine import CompiledForest
+from incremental_training import WATERMARK_COLUMN
+from model_artifacts import (artifact_entry, atomic_dump, new_version, portable_path,
+                             write_manifest)
+from model_cache import fit_cached
+from portable_model import load_portable, save_portable
+from prepared_data import load_prepared
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error
 from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+
+MODEL_PATH = 'random_forest_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+MANIFEST_PATH = 'model_manifest.json'
+
+# Subtrees of the portable random forest whose leaves all stay within this
+# many W/m² are collapsed into one leaf (0 only drops subtrees that always
+# predict the same value); see benchmark_compact_model.py for the tradeoff
+COMPACT_PRUNE_TOLERANCE = 0.0
+
+# Registry name -> (pickle path, estimator); names match MODEL_REGISTRY in
+# app.py. The portable file of each model is the same path ending in .npz
+MODELS = {
+    'random_forest': (MODEL_PATH, RandomForestRegressor(n_estimators=100, random_state=42)),
+    'decision_tree': ('decision_tree_model.pkl', DecisionTreeRegressor(random_state=42)),
+    'linear_regression': ('linear_regression_model.pkl', LinearRegression()),
+    'gradient_boosting': ('gradient_boosting_model.pkl',
+                          HistGradientBoostingRegressor(max_iter=500, max_leaf_nodes=63,
+                                                        max_depth=10, random_state=42))
+}
+
 
 print("="*80)
 print("SAVING TRAINED MODEL AND SCALER")
@@ -22,40 +70,101 @@ print()
 
 # Load training data
 print("Loading training data...")
-X_train = pd.read_csv('X_train_scaled.csv')
-y_train = pd.read_csv('y_train.csv')['solar_irradiance']
+data = load_prepared()
+X_train, y_train = data['X_train'], data['y_train']
+X_test, y_test = data['X_test'], data['y_test']
 
-# Load original unscaled data to fit scaler
-X_train_original = pd.read_csv('weather_environmental_data.csv')
-feature_columns = ['temperature', 'cloud_cover', 'humidity', 'hour', 'month']
-X_train_original = X_train_original[feature_columns].dropna()
+# Load original unscaled data to fit scaler, with the feature set the
+# prepared files were built with (feature_stage.py)
+raw_data = pd.read_csv('weather_environmental_data.csv')
+feature_columns = list(X_train.columns)
+feature_set = feature_set_of(feature_columns)
+X_train_original = pd.DataFrame(build_features(raw_data[RAW_FEATURES].dropna().values, feature_set),
+                                columns=feature_columns)
 
-print("✓ Data loaded")
+# Newest row the models are trained up to
+watermark = raw_data[WATERMARK_COLUMN].max()
+
+print(f"✓ Data loaded (watermark {watermark}, feature set '{feature_set}')")
 print()
 
-# Train and save scaler
-print("Fitting and saving StandardScaler...")
+# Fit scaler
+print("Fitting StandardScaler...")
 scaler = StandardScaler()
 scaler.fit(X_train_original)
-joblib.dump(scaler, 'scaler.pkl')
-print("✓ Scaler saved: scaler.pkl")
+print("✓ Scaler fitted")
+print()
+
+# Train models
+test_mae = {}
+for name, (path, model) in MODELS.items():
+    print(f"Training {type(model).__name__} ({name})...")
+    model = fit_cached(model, X_train, y_train)
+    MODELS[name] = (path, model)
+    test_mae[name] = mean_absolute_error(y_test, model.predict(X_test))
+    print(f"✓ Model trained (test MAE {test_mae[name]:.2f} W/m²)")
 print()
 
-# Train and save model
-print("Training and saving Random Forest model...")
-model = RandomForestRegressor(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
-joblib.dump(model, 'random_forest_model.pkl')
-print("✓ Model saved: random_forest_model.pkl")
+# Save everything only after training finished, then the manifest last
+print("Saving artifacts...")
+atomic_dump(scaler, SCALER_PATH)
+print(f"✓ Scaler saved: {SCALER_PATH}")
+for name, (path, model) in MODELS.items():
+    atomic_dump(model, path)
+    print(f"✓ Model saved: {path}")
+
+portable_mae = {}
+for name, (path, model) in MODELS.items():
+    # The portable forest may be pruned; other models are exported as-is
+    forest = None
+    metadata = {'watermark': watermark}
+    if name == 'random_forest':
+        forest = CompiledForest.from_sklearn(model)
+        if COMPACT_PRUNE_TOLERANCE > 0:
+            forest = prune_forest(forest, COMPACT_PRUNE_TOLERANCE)
+        metadata['prune_tolerance'] = COMPACT_PRUNE_TOLERANCE
+    save_portable(model, scaler, portable_path(path), feature_columns,
+                  forest=forest, metadata=metadata)
+    portable_model, _, _, _ = load_portable(portable_path(path))
+    portable_mae[name] = mean_absolute_error(y_test, portable_model.predict(X_test.values))
+    print(f"✓ Portable model saved: {portable_path(path)} "
+          f"(test MAE {portable_mae[name]:.2f} W/m²)")
+
+version, created_at = new_version()
+manifest = {
+    'version': version,
+    'created_at': created_at,
+    'watermark': watermark,
+    'feature_set': feature_set,
+    'models': {
+        name: {'path': path, 'model_type': type(model).__name__,
+               'watermark': watermark,
+               'test_mae': round(float(test_mae[name]), 3),
+               'portable_path': portable_path(path),
+               'portable_test_mae': round(float(portable_mae[name]), 3)}
+        for name, (path, model) in MODELS.items()
+    },
+    'artifacts': {
+        path: artifact_entry(path)
+        for path in ([path for path, _ in MODELS.values()]
+                     + [portable_path(path) for path, _ in MODELS.values()] + [SCALER_PATH])
+    }
+}
+write_manifest(manifest, MANIFEST_PATH)
+print(f"✓ Manifest saved: {MANIFEST_PATH} (version {version})")
 print()
 
 print("="*80)
-print("MODEL AND SCALER SAVED SUCCESSFULLY")
+print("MODELS AND SCALER SAVED SUCCESSFULLY")
 print("="*80)
 print()
 print("Files created:")
-print("  - random_forest_model.pkl")
-print("  - scaler.pkl")
+for path, _ in MODELS.values():
+    print(f"  - {path}")
+    print(f"  - {portable_path(path)}")
+print(f"  - {SCALER_PATH}")
+print(f"  - {MANIFEST_PATH}")
 print()
-print("Ready for Flask deployment!")
+print("Ready for Flask deployment! A running service picks up the new version")
+print("automatically (or immediately with POST /admin/reload).")
 print("="*80)
@@ -0,0 +1,287 @@
+"""
+================================================================================
+PRODUCTION SERVER - SOLAR IRRADIANCE PREDICTION API
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Pre-fork multi-worker serving with a shared, copy-on-write model
+
+The master process imports app.py once (loading the model, scaler and
+compiled forest), binds the listening socket and forks N worker processes.
+Workers inherit the loaded artifacts copy-on-write, so the model's memory
+is shared instead of being loaded once per worker. Linux only (os.fork and
+/proc memory accounting).
+
+Hot reloads happen in the master too. It watches the artifact files every
+RELOAD_POLL_SECONDS (app.py) and also reloads on SIGHUP or when a worker
+receives POST /admin/reload. After a successful reload it does a rolling
+restart: each worker is replaced by a fresh fork that shares the new bundle,
+and the old one finishes its in-flight requests before it exits. Workers
+never load a model themselves, which would give each one a private copy.
+
+Usage:
+    python serve.py --workers 4 --port 5000
+    kill -USR1 <master pid>        # print per-worker memory report
+    kill -HUP <master pid>         # reload model artifacts, then restart workers
+================================================================================
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+# Fields of /proc/<pid>/smaps_rollup reported per process (values in kB)
+MEMORY_FIELDS = ['Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty',
+                 'Private_Clean', 'Private_Dirty']
+
+# Seconds a stopping worker gets to finish its in-flight requests
+WORKER_DRAIN_SECONDS = float(os.environ.get('WORKER_DRAIN_SECONDS', '30'))
+
+# Seconds between checks of the master loop (exited workers, reload requests)
+MASTER_TICK_SECONDS = 0.5
+
+
+# ============================================================================
+# MEMORY MEASUREMENT
+# ============================================================================
+
+def process_memory(pid):
+    """
+    Return resident memory figures (MB) for one process
+
+    Rss counts shared pages in full for every process; Pss splits shared
+    pages between the processes that map them, so summing Pss over all
+    workers gives the real total. Private_Dirty is what copy-on-write
+    has duplicated for this process alone.
+    """
+    memory = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            key = parts[0].rstrip(':')
+            if key in MEMORY_FIELDS:
+                memory[key] = int(parts[1]) / 1024.0
+    return memory
+
+
+def print_memory_report(master_pid, worker_pids):
+    """
+    Print a per-process memory table for the master and its workers
+    """
+    print()
+    print("="*80)
+    print("MEMORY REPORT (MB)")
+    print("="*80)
+    print(f"{'Process':<18}{'PID':>8}{'RSS':>10}{'PSS':>10}{'Shared':>10}{'Private':>10}")
+    print("-"*80)
+
+    total_pss = 0.0
+    for label, pid in [('master', master_pid)] + [(f'worker {i}', p) for i, p in enumerate(worker_pids)]:
+        try:
+            memory = process_memory(pid)
+        except OSError:
+            continue
+        shared = memory.get('Shared_Clean', 0) + memory.get('Shared_Dirty', 0)
+        private = memory.get('Private_Clean', 0) + memory.get('Private_Dirty', 0)
+        total_pss += memory.get('Pss', 0)
+        print(f"{label:<18}{pid:>8}{memory.get('Rss', 0):>10.1f}{memory.get('Pss', 0):>10.1f}"
+              f"{shared:>10.1f}{private:>10.1f}")
+
+    print("-"*80)
+    print(f"{'Total (sum of PSS)':<26}{total_pss:>20.1f}")
+    print("="*80)
+    sys.stdout.flush()
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+def run_worker(listen_socket, threaded):
+    """
+    Serve requests on the inherited socket until terminated
+
+    SIGTERM stops accepting connections and lets in-flight requests finish
+    (at most WORKER_DRAIN_SECONDS). Reloads are left to the master.
+    """
+    from werkzeug.serving import make_server
+    import app as service
+
+    master_pid = os.getppid()
+    service.model_store.external_reload = lambda: os.kill(master_pid, signal.SIGHUP)
+
+    host, port = listen_socket.getsockname()[:2]
+    server = make_server(host, port, service.app, threaded=threaded,
+                         fd=listen_socket.fileno())
+    # Request threads are joined when the server closes
+    server.daemon_threads = False
+
+    def stop(*_):
+        # shutdown() waits for serve_forever, so it cannot run in this handler
+        threading.Thread(target=server.shutdown, daemon=True).start()
+        threading.Timer(WORKER_DRAIN_SECONDS, os._exit, args=(0,)).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    server.serve_forever()
+
+
+def freeze_loaded_objects():
+    """
+    Move everything loaded so far out of the garbage collector's reach so
+    collections in the workers do not write to (and copy) shared pages
+    """
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
+
+
+def forward_signal(worker_pids, signum):
+    """
+    Send a signal to every worker
+    """
+    for pid in worker_pids:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def spawn_worker(listen_socket, threaded):
+    """
+    Fork one worker and return its PID
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(listen_socket, threaded)
+        finally:
+            os._exit(0)
+    return pid
+
+
+# ============================================================================
+# MASTER PROCESS
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-fork prediction server')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WORKERS', os.cpu_count() or 1)),
+                        help='number of worker processes (default: CPU count)')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--no-threads', action='store_true',
+                        help='handle one request at a time per worker')
+    parser.add_argument('--memory-report-delay', type=float, default=2.0,
+                        help='seconds after startup to print the memory report '
+                             '(negative disables it)')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("SOLAR IRRADIANCE PREDICTION API - PRODUCTION SERVER")
+    print("="*80)
+
+    # Load every artifact once, before forking
+    import app as service
+    store = service.model_store
+    freeze_loaded_objects()
+
+    listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listen_socket.bind((args.host, args.port))
+    listen_socket.listen(128)
+    listen_socket.set_inheritable(True)
+
+    threaded = not args.no_threads
+    workers = [spawn_worker(listen_socket, threaded) for _ in range(args.workers)]
+
+    print(f"✓ Master PID {os.getpid()} serving http://{args.host}:{args.port}")
+    print(f"✓ {len(workers)} workers: {', '.join(map(str, workers))}")
+    print("  Send SIGUSR1 to the master for a memory report, SIGHUP to reload the model")
+    sys.stdout.flush()
+
+    # Set by SIGHUP (from the operator or a worker's /admin/reload); a plain
+    # flag, since the handler runs between bytecodes of the loop below
+    pending = {'reload': False}
+
+    def reload_and_restart():
+        """
+        Reload in the master, then replace the workers one at a time
+        """
+        pending['reload'] = False
+        try:
+            store.reload()
+        except Exception:
+            # The store printed the error; workers keep the current model
+            sys.stdout.flush()
+            return
+        freeze_loaded_objects()
+        for index, old_pid in enumerate(workers):
+            workers[index] = spawn_worker(listen_socket, threaded)
+            forward_signal([old_pid], signal.SIGTERM)
+            try:
+                os.waitpid(old_pid, 0)
+            except ChildProcessError:
+                pass
+        print(f"✓ Workers restarted on version {store.active.version}: "
+              f"{', '.join(map(str, workers))}")
+        sys.stdout.flush()
+
+    def shutdown(*_):
+        forward_signal(workers, signal.SIGTERM)
+        for pid in workers:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGUSR1, lambda *_: print_memory_report(os.getpid(), workers))
+    signal.signal(signal.SIGHUP, lambda *_: pending.update(reload=True))
+
+    if args.memory_report_delay >= 0:
+        time.sleep(args.memory_report_delay)
+        print_memory_report(os.getpid(), workers)
+
+    # Replace workers that exit unexpectedly, watch the artifact files and
+    # reload on request
+    next_poll = time.monotonic() + store.poll_interval
+    while True:
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid == 0:
+                break
+            if pid in workers:
+                index = workers.index(pid)
+                workers[index] = spawn_worker(listen_socket, threaded)
+                print(f"⚠ Worker {pid} exited, restarted as {workers[index]}")
+                sys.stdout.flush()
+
+        if store.poll_interval > 0 and time.monotonic() >= next_poll:
+            next_poll = time.monotonic() + store.poll_interval
+            if store.changed_on_disk():
+                pending['reload'] = True
+        if pending['reload']:
+            reload_and_restart()
+
+        time.sleep(MASTER_TICK_SECONDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+"""
+================================================================================
+SERVICE METRICS - SOLAR IRRADIANCE PREDICTION API
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Low-overhead per-stage latency histograms, request/error counters
+         and in-flight gauge, rendered in Prometheus text format for /metrics
+
+Timing uses time.perf_counter() marks between stages and fixed-bucket
+histograms (one bisect and three integer updates per observation), so no
+samples are stored and percentiles are estimated from the buckets.
+================================================================================
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Histogram bucket upper bounds in seconds (50 µs .. 5 s, plus +Inf)
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """
+    Cumulative-bucket latency histogram (Prometheus style)
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'total')
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                if i == len(self.bounds):
+                    # Overflow bucket has no upper bound
+                    return lower
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.bounds[-1]
+
+
+class RequestTimer:
+    """
+    Records the time spent in each stage of one request
+
+    Call mark(stage) at the end of each stage; the time since the previous
+    mark (or the request start) is added to that stage's histogram.
+    """
+
+    __slots__ = ('metrics', 'endpoint', 'start', 'last')
+
+    def __init__(self, metrics, endpoint):
+        self.metrics = metrics
+        self.endpoint = endpoint
+        self.start = self.last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.metrics.observe(self.endpoint, stage, now - self.last)
+        self.last = now
+
+
+def _finish_after(body, finish):
+    """
+    Yield a streamed response body, then call finish when it is exhausted
+    or closed
+    """
+    try:
+        yield from body
+    finally:
+        finish()
+
+
+class ServiceMetrics:
+    """
+    Process-wide registry of latency histograms and counters
+    """
+
+    def __init__(self, enabled=True, prefix='solar'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = {}
+        self._errors = {}
+        self.in_flight = 0
+
+    # ========================================================================
+    # RECORDING
+    # ========================================================================
+
+    def observe(self, endpoint, stage, seconds):
+        """
+        Add one stage duration to its histogram
+        """
+        if not self.enabled:
+            return
+        key = (endpoint, stage)
+        histogram = self._histograms.get(key)
+        with self._lock:
+            if histogram is None:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+            histogram.observe(seconds)
+
+    def count_error(self, endpoint, rule):
+        """
+        Count one rejected request by the validation rule it failed
+        """
+        if not self.enabled:
+            return
+        key = (endpoint, rule)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def track(self, endpoint):
+        """
+        Decorator for a Flask view: counts requests by status code, keeps
+        the in-flight gauge and records total latency. The view receives a
+        RequestTimer through flask.g.request_timer for its own stage marks.
+
+        A streamed response (a generator body) is produced after the view
+        returns, so it stays in flight and is timed until its body is
+        exhausted or closed.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                from flask import g
+
+                timer = RequestTimer(self, endpoint)
+                g.request_timer = timer
+                if self.enabled:
+                    with self._lock:
+                        self.in_flight += 1
+
+                status = 500
+                streamed = False
+                try:
+                    result = view(*args, **kwargs)
+                    if isinstance(result, tuple):
+                        status = result[1]
+                    else:
+                        status = getattr(result, 'status_code', 200)
+                    if self.enabled and getattr(result, 'is_streamed', False):
+                        streamed = True
+                        finish = self._finisher(endpoint, timer, status)
+                        result.response = _finish_after(result.response, finish)
+                        # Also covers a client that disconnects before the
+                        # first chunk, when the generator never starts
+                        result.call_on_close(finish)
+                    return result
+                finally:
+                    if self.enabled and not streamed:
+                        self._finish(endpoint, timer, status)
+            return wrapper
+        return decorator
+
+    def _finish(self, endpoint, timer, status):
+        """
+        Record one finished request: total latency, status count and the
+        in-flight gauge
+        """
+        self.observe(endpoint, 'total', time.perf_counter() - timer.start)
+        key = (endpoint, str(status))
+        with self._lock:
+            self.in_flight -= 1
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def _finisher(self, endpoint, timer, status):
+        """
+        _finish for a streamed request, recording it only once
+        """
+        once = threading.Lock()
+
+        def finish():
+            if once.acquire(blocking=False):
+                self._finish(endpoint, timer, status)
+        return finish
+
+    # ========================================================================
+    # EXPOSITION
+    # ========================================================================
+
+    def render(self):
+        """
+        Render all metrics in the Prometheus text exposition format
+        """
+        with self._lock:
+            histograms = {key: (list(h.counts), h.count, h.total, h)
+                          for key, h in self._histograms.items()}
+            requests = dict(self._requests)
+            errors = dict(self._errors)
+            in_flight = self.in_flight
+
+        p = self.prefix
+        lines = []
+
+        lines.append(f'# HELP {p}_stage_duration_seconds Time spent in each request stage')
+        lines.append(f'# TYPE {p}_stage_duration_seconds histogram')
+        for (endpoint, stage), (counts, count, total, _) in sorted(histograms.items()):
+            labels = f'endpoint="{endpoint}",stage="{stage}"'
+            cumulative = 0
+            for bound, bucket_count in zip(DEFAULT_BUCKETS, counts):
+                cumulative += bucket_count
+                lines.append(f'{p}_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{p}_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{p}_stage_duration_seconds_sum{{{labels}}} {total:.9f}')
+            lines.append(f'{p}_stage_duration_seconds_count{{{labels}}} {count}')
+
+        lines.append(f'# HELP {p}_stage_duration_quantile_seconds '
+                     f'Latency percentiles estimated from the histogram buckets')
+        lines.append(f'# TYPE {p}_stage_duration_quantile_seconds gauge')
+        for (endpoint, stage), (_, _, _, histogram) in sorted(histograms.items()):
+            for q in REPORTED_QUANTILES:
+                lines.append(f'{p}_stage_duration_quantile_seconds{{endpoint="{endpoint}",'
+                             f'stage="{stage}",quantile="{q}"}} {histogram.quantile(q):.9f}')
+
+        lines.append(f'# HELP {p}_requests_total Requests handled, by endpoint and status code')
+        lines.append(f'# TYPE {p}_requests_total counter')
+        for (endpoint, code), value in sorted(requests.items()):
+            lines.append(f'{p}_requests_total{{endpoint="{endpoint}",code="{code}"}} {value}')
+
+        lines.append(f'# HELP {p}_validation_errors_total Rejected requests, by validation rule')
+        lines.append(f'# TYPE {p}_validation_errors_total counter')
+        for (endpoint, rule), value in sorted(errors.items()):
+            lines.append(f'{p}_validation_errors_total{{endpoint="{endpoint}",rule="{rule}"}} {value}')
+
+        lines.append(f'# HELP {p}_requests_in_flight Requests currently being handled')
+        lines.append(f'# TYPE {p}_requests_in_flight gauge')
+        lines.append(f'{p}_requests_in_flight {in_flight}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,157 @@
+"""
+================================================================================
+SHADOW SCORER - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Score a candidate model on live traffic without affecting responses
+
+After a request has been answered by its model, the same feature rows and
+the served predictions are queued for a background thread, which runs the
+candidate (shadow) model on them and records its latency and how far its
+predictions diverge from the served ones. The queue is bounded; when the
+shadow model cannot keep up, rows are dropped and counted instead of
+slowing the request path down.
+================================================================================
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class ShadowScorer:
+    """
+    Mirrors a sample of scored rows to a shadow model
+
+    predict_fn(rows, model_name) returns raw predictions for a raw feature
+    matrix. Like the request coalescer, the worker thread is started lazily
+    in the process that first submits, so it also runs after a fork.
+    """
+
+    def __init__(self, predict_fn, model_name, sample_rate=1.0, queue_size=1000,
+                 history_size=10000):
+        self.predict_fn = predict_fn
+        self.model_name = model_name
+        self.sample_rate = float(sample_rate)
+        self.queue_size = int(queue_size)
+
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+        self.submitted = 0
+        self.dropped = 0
+        self.errors = 0
+        self.scored_calls = 0
+        self.scored_rows = 0
+        self.last_error = None
+        self._latencies = deque(maxlen=history_size)
+        self._divergences = deque(maxlen=history_size)
+        self._served = deque(maxlen=history_size)
+
+    # ========================================================================
+    # CALLER SIDE
+    # ========================================================================
+
+    def submit(self, features_matrix, served_predictions):
+        """
+        Queue rows and their served predictions for shadow scoring
+
+        Never blocks: a full queue drops the rows.
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((features_matrix, served_predictions))
+            self.submitted += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self):
+        """
+        Start the shadow thread in this process if it is not running
+        """
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+        with self._lock:
+            if self._worker_pid != pid:
+                # Queued items from a parent process did not survive the fork
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                worker = threading.Thread(target=self._run, daemon=True,
+                                          name='shadow-scorer')
+                worker.start()
+                self._worker_pid = pid
+
+    # ========================================================================
+    # SHADOW THREAD
+    # ========================================================================
+
+    def _run(self):
+        while True:
+            features_matrix, served = self._queue.get()
+            started = time.perf_counter()
+            try:
+                shadow = self.predict_fn(features_matrix, self.model_name)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = str(e)
+                continue
+            latency = time.perf_counter() - started
+
+            # Compare what callers would have received (non-negative values)
+            served = np.maximum(np.asarray(served, dtype=float), 0.0)
+            shadow = np.maximum(np.asarray(shadow, dtype=float), 0.0)
+
+            with self._lock:
+                self.scored_calls += 1
+                self.scored_rows += len(served)
+                self._latencies.append(latency)
+                self._divergences.extend(np.abs(shadow - served))
+                self._served.extend(served)
+
+    # ========================================================================
+    # STATISTICS
+    # ========================================================================
+
+    def stats(self):
+        """
+        Return shadow latency and divergence statistics over recent rows
+        """
+        with self._lock:
+            latencies_ms = np.array(self._latencies, dtype=float) * 1000.0
+            divergences = np.array(self._divergences, dtype=float)
+            served = np.array(self._served, dtype=float)
+
+        def percentiles(values):
+            if len(values) == 0:
+                return {'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            return {'p50': round(float(p50), 3), 'p90': round(float(p90), 3),
+                    'p99': round(float(p99), 3), 'max': round(float(values.max()), 3)}
+
+        return {
+            'shadow_model': self.model_name,
+            'sample_rate': self.sample_rate,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'last_error': self.last_error,
+            'queue_depth': self._queue.qsize(),
+            'scored_calls': self.scored_calls,
+            'scored_rows': self.scored_rows,
+            'recent_latency_ms': percentiles(latencies_ms),
+            'recent_abs_divergence': percentiles(divergences),
+            'recent_mean_abs_divergence': round(float(divergences.mean()), 3) if len(divergences) else 0.0,
+            'recent_mean_served': round(float(served.mean()), 3) if len(served) else 0.0
+        }
@@ -0,0 +1,135 @@
+"""
+================================================================================
+SOLAR GEOMETRY - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Sun position by hour, and a night pre-filter for the prediction path
+
+The same day curve generate_weather_data.py uses, sin(2π(hour - 6) / 24),
+gives the relative solar elevation for each hour. When it is not above
+zero the sun is down, irradiance is exactly zero, and the forest does not
+need to be evaluated at all.
+
+clear_sky_elevation gives the astronomical sun position at the site for an
+hour and day of year, which the solar feature set (feature_stage.py) feeds
+to the models.
+================================================================================
+"""
+
+import threading
+
+import numpy as np
+
+# Column of the hour feature in FEATURE_ORDER
+HOUR_COLUMN = 3
+
+# sin(2π(18 - 6) / 24) evaluates to 1.2e-16 rather than 0, so "sun down"
+# means at or below this tiny elevation instead of exactly <= 0
+DEFAULT_MIN_ELEVATION = 1e-9
+
+# Site latitude in degrees north (Bengaluru)
+SITE_LATITUDE = 13.0
+
+# Day of year in the middle of each month (January first). Requests carry
+# only the month, so features of a month use this day in training and
+# serving alike
+MID_MONTH_DAY = np.array([15, 46, 74, 105, 135, 166, 196, 227, 258, 288, 319, 349])
+
+
+def solar_elevation_factor(hour):
+    """
+    Relative solar elevation for an hour of day (scalar or array): 1 at
+    solar noon, 0 at 6:00 and 18:00, negative at night
+    """
+    return np.sin(2 * np.pi * (np.asarray(hour, dtype=np.float64) - 6) / 24)
+
+
+def month_mid_day(month):
+    """
+    Day of year in the middle of a month 1..12 (scalar or array)
+    """
+    return MID_MONTH_DAY[np.asarray(month).astype(np.intp) - 1]
+
+
+def solar_declination(day_of_year):
+    """
+    Declination of the sun in radians for a day of year (Cooper's equation)
+    """
+    return np.radians(23.45) * np.sin(2 * np.pi * (284 + np.asarray(day_of_year, dtype=np.float64)) / 365)
+
+
+def clear_sky_elevation(hour, day_of_year, latitude=SITE_LATITUDE):
+    """
+    Sine of the sun's elevation angle at the site, 0 below the horizon
+    (scalars or arrays)
+
+    This is the clear-sky irradiance on a horizontal surface relative to
+    the sun at the zenith. Hours are local solar time (noon at 12:00), as
+    in the dataset.
+    """
+    latitude = np.radians(latitude)
+    declination = solar_declination(day_of_year)
+    hour_angle = np.radians(15 * (np.asarray(hour, dtype=np.float64) - 12))
+    elevation = (np.sin(latitude) * np.sin(declination)
+                 + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle))
+    return np.maximum(elevation, 0.0)
+
+
+class NightFilter:
+    """
+    Decides which rows can skip the model because the sun is down
+
+    Counts the rows and requests it answered without the model, for
+    /night-filter-stats.
+    """
+
+    def __init__(self, min_elevation=DEFAULT_MIN_ELEVATION):
+        self.min_elevation = float(min_elevation)
+        # Hours are validated integers 0..23, so the test is a table lookup
+        self._daylight_by_hour = solar_elevation_factor(np.arange(24)) > self.min_elevation
+
+        self._lock = threading.Lock()
+        self.rows_seen = 0
+        self.rows_skipped = 0
+        self.requests_skipped = 0
+
+    def is_daylight(self, hour):
+        """
+        True if the sun is up at this hour
+        """
+        return bool(self._daylight_by_hour[int(hour)])
+
+    def daylight_mask(self, features_matrix):
+        """
+        Boolean mask of the rows (raw features in FEATURE_ORDER) with sun
+        """
+        hours = np.asarray(features_matrix)[:, HOUR_COLUMN].astype(np.intp)
+        return self._daylight_by_hour[hours]
+
+    def record(self, rows_seen, rows_skipped):
+        """
+        Count one request; it saved a model call if any row was skipped and
+        none needed the model
+        """
+        with self._lock:
+            self.rows_seen += rows_seen
+            self.rows_skipped += rows_skipped
+            if rows_skipped == rows_seen:
+                self.requests_skipped += 1
+
+    def stats(self):
+        """
+        Return the filter settings and how much model work it saved
+        """
+        with self._lock:
+            return {
+                'min_elevation': self.min_elevation,
+                'daylight_hours': [int(h) for h in np.flatnonzero(self._daylight_by_hour)],
+                'rows_seen': self.rows_seen,
+                'rows_skipped': self.rows_skipped,
+                'requests_skipped': self.requests_skipped,
+                'skip_rate': round(self.rows_skipped / self.rows_seen, 4) if self.rows_seen else 0.0
+            }
@@ -0,0 +1,190 @@
+"""
+================================================================================
+TRAINING RUNNER - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Fit and evaluate candidate models concurrently in a process pool
+
+Each candidate is fitted (through the model cache, model_cache.py) and
+scored in its own worker process, so the baselines train side by side
+instead of one after another. Every candidate gets a thread budget: its
+n_jobs and the BLAS/OpenMP pools inside the worker are capped to it, so
+workers x threads never oversubscribes the cores. Ensembles (estimators with
+n_jobs and n_estimators, which fit their members in parallel, and
+histogram gradient boosting, whose OpenMP threads split each tree's
+histograms) share the cores left after every other candidate gets one
+thread.
+
+Workers return only metrics and timings (wall-clock and CPU seconds of the
+worker process, which counts all of its threads), never the fitted model.
+A candidate loaded from the model cache is flagged as cached: its fit
+timings are the load time, not a fit (MODEL_CACHE=0 times real fits).
+================================================================================
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from threadpoolctl import threadpool_limits
+from model_cache import fit_cached
+from prepared_data import load_prepared
+
+# Cores the runner may use (default: all) and pool size (default: one
+# worker per candidate, at most TRAIN_CORES)
+TRAIN_CORES = int(os.environ.get('TRAIN_CORES', os.cpu_count() or 1))
+TRAIN_WORKERS = int(os.environ.get('TRAIN_WORKERS', '0'))
+
+# Per-candidate thread budgets, e.g. "random_forest=6,decision_tree=1";
+# candidates not listed get the automatic split
+TRAIN_THREADS = os.environ.get('TRAIN_THREADS', '')
+
+# Loaded once per worker process by the pool initializer
+_worker_data = {}
+
+
+# ============================================================================
+# THREAD BUDGETS
+# ============================================================================
+
+def parse_thread_budgets(spec, names):
+    """
+    Parse a budget spec such as "random_forest=4,decision_tree=1"
+    """
+    budgets = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, threads = item.partition('=')
+        name = name.strip()
+        if name not in names:
+            raise ValueError(f'Unknown model in thread budgets: {name}')
+        threads = int(threads)
+        if threads < 1:
+            raise ValueError(f'Thread budget for {name} must be at least 1')
+        budgets[name] = threads
+    return budgets
+
+
+def plan_thread_budgets(candidates, cores, overrides=None):
+    """
+    Threads per candidate name
+
+    Explicit overrides are kept. Ensembles split what is left of the cores
+    evenly (at least one thread each); every other candidate gets one.
+    LinearRegression's n_jobs only helps multi-target fits, so it is not
+    counted as parallel.
+    """
+    budgets = dict(overrides or {})
+    pending = [name for name, estimator in candidates if name not in budgets]
+    parallel = [name for name, estimator in candidates
+                if name in pending and (
+                    {'n_jobs', 'n_estimators'} <= set(estimator.get_params())
+                    or type(estimator).__name__.startswith('HistGradientBoosting'))]
+    for name in pending:
+        if name not in parallel:
+            budgets[name] = 1
+    if parallel:
+        spare = cores - sum(budgets.values())
+        for name in parallel:
+            budgets[name] = max(1, spare // len(parallel))
+    return budgets
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def load_datasets():
+    """
+    Read the prepared train/test split (memory-mapped when stored as npy,
+    so every worker shares the same pages)
+    """
+    return load_prepared()
+
+
+def _init_worker():
+    _worker_data.update(load_datasets())
+
+
+def regression_metrics(y_true, y_pred):
+    """
+    MAE, RMSE and R² of one set of predictions
+    """
+    return {
+        'mae': mean_absolute_error(y_true, y_pred),
+        'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'r2': r2_score(y_true, y_pred)
+    }
+
+
+def fit_and_evaluate(name, estimator, threads):
+    """
+    Fit one candidate within its thread budget and score it on the train
+    and test sets (runs in a worker process)
+    """
+    data = _worker_data or load_datasets()
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=threads)
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    with threadpool_limits(limits=threads):
+        model, cached = fit_cached(estimator, data['X_train'], data['y_train'],
+                                   return_cached=True)
+        fit_wall = time.perf_counter() - wall_started
+        fit_cpu = time.process_time() - cpu_started
+        train_pred = model.predict(data['X_train'])
+        test_pred = model.predict(data['X_test'])
+
+    return {
+        'name': name,
+        'model_type': type(estimator).__name__,
+        'threads': threads,
+        'pid': os.getpid(),
+        'cached': cached,
+        'fit_wall_seconds': fit_wall,
+        'fit_cpu_seconds': fit_cpu,
+        'wall_seconds': time.perf_counter() - wall_started,
+        'cpu_seconds': time.process_time() - cpu_started,
+        'train': regression_metrics(data['y_train'], train_pred),
+        'test': regression_metrics(data['y_test'], test_pred)
+    }
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_candidates(candidates, cores=None, workers=None, budgets=None):
+    """
+    Fit and evaluate (name, estimator) candidates concurrently
+
+    Returns (results in candidate order, thread budgets, total wall seconds).
+    """
+    cores = cores or TRAIN_CORES
+    names = [name for name, _ in candidates]
+    if budgets is None:
+        budgets = plan_thread_budgets(candidates, cores,
+                                      parse_thread_budgets(TRAIN_THREADS, names))
+    workers = workers or TRAIN_WORKERS or min(len(candidates), cores)
+
+    started = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        # Candidates with the largest thread budgets (the ensembles, the
+        # longest fits) first, so they never queue behind short ones
+        ordered = sorted(candidates, key=lambda candidate: -budgets[candidate[0]])
+        futures = [pool.submit(fit_and_evaluate, name, estimator, budgets[name])
+                   for name, estimator in ordered]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['name']] = result
+            source = 'loaded from cache' if result['cached'] else 'fitted'
+            print(f"✓ {result['model_type']} ({result['name']}) {source}, done in "
+                  f"{result['wall_seconds']:.1f} s wall, {result['cpu_seconds']:.1f} s CPU, "
+                  f"{result['threads']} thread(s), worker {result['pid']}")
+    return [results[name] for name in names], budgets, time.perf_counter() - started
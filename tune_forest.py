@@ -0,0 +1,299 @@
+"""
+================================================================================
+FOREST TUNING - SOLAR IRRADIANCE PREDICTION
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Successive-halving search over forest size, depth and leaf size,
+         with a latency/accuracy Pareto report
+
+Every candidate of the grid is fitted on a small slice of the training
+rows; each rung keeps the best 1/HALVING_FACTOR and gives them
+HALVING_FACTOR times more rows, until at least MIN_FINALISTS survivors
+use all of them. Fits run in parallel in a process pool (one thread
+each, TRAIN_CORES workers, see training_runner.py).
+
+"Best" is not accuracy alone: survivors are ranked by Pareto rank on
+validation MAE, single-row latency and batch latency first, so a fast
+forest that is a little less accurate is not discarded in the first
+rung. For every fit the report records validation MAE/RMSE/R²,
+single-row and batch latency of the compiled engine the service uses
+(forest_engine.py), node count and the size of the portable file
+(portable_model.py). Finalists are scored on the test set and the Pareto
+front (test MAE vs both latencies) is printed and written to
+TUNING_REPORT_PATH, with the fastest forest within each accuracy budget.
+
+Latencies are timed inside the pool workers while the other workers fit
+and time their own candidates on the same cores. They rank candidates
+against each other; they are not serving latencies, which have to be
+measured for the chosen forest on an otherwise idle machine.
+================================================================================
+"""
+
+import itertools
+import json
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from forest_engine import CompiledForest
+from portable_model import save_portable
+from training_runner import TRAIN_CORES, load_datasets, regression_metrics
+import warnings
+warnings.filterwarnings('ignore')
+
+# Search space: forest size, depth and leaf constraints (the production
+# forest is n_estimators=100, max_depth=None, min_samples_leaf=1)
+PARAM_GRID = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_depth': [None, 10, 15, 20],
+    'min_samples_leaf': [1, 3, 10]
+}
+
+# Each rung keeps 1/HALVING_FACTOR of the candidates and gives them
+# HALVING_FACTOR times more training rows
+HALVING_FACTOR = 3
+
+# Candidates that reach the last rung (all fitting rows), so the Pareto
+# front has more than the one or two most accurate forests on it
+MIN_FINALISTS = 6
+
+# Share of the training rows held out to rank candidates (the test set is
+# only used for the finalists)
+VALIDATION_FRACTION = 0.2
+
+# Rows per batch latency measurement (COMPILED_MAX_ROWS in app.py)
+BATCH_ROWS = 512
+
+# Test MAE budgets above the most accurate finalist (W/m²)
+ACCURACY_BUDGETS = [0.1, 0.25, 0.5, 1.0, 2.0]
+
+TUNING_REPORT_PATH = 'forest_tuning_report.json'
+
+# Loaded once per worker process by the pool initializer
+_worker_data = {}
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def best_seconds(fn, rows, min_seconds=0.3, min_calls=5):
+    """
+    Fastest seconds per call of fn(rows); the minimum is the least
+    disturbed by other work on the machine
+    """
+    fn(rows)
+    timings = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(timings) < min_calls:
+        started = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - started)
+    return float(np.min(timings))
+
+
+def _init_worker():
+    data = load_datasets()
+    rng = np.random.default_rng(42)
+    order = rng.permutation(len(data['X_train']))
+    n_validation = int(len(order) * VALIDATION_FRACTION)
+    fit_rows, validation_rows = order[n_validation:], order[:n_validation]
+    _worker_data.update({
+        'X_fit': data['X_train'].iloc[fit_rows],
+        'y_fit': data['y_train'].iloc[fit_rows],
+        'X_val': data['X_train'].iloc[validation_rows],
+        'y_val': data['y_train'].iloc[validation_rows],
+        'X_test': data['X_test'],
+        'y_test': data['y_test'],
+        'scaler': joblib.load('scaler.pkl')
+    })
+
+
+def evaluate_candidate(params, n_rows, final=False):
+    """
+    Fit one candidate on the first n_rows fitting rows and measure its
+    accuracy, latency and size (runs in a worker process)
+    """
+    data = _worker_data
+    model = RandomForestRegressor(random_state=42, n_jobs=1, **params)
+    started = time.perf_counter()
+    model.fit(data['X_fit'].iloc[:n_rows], data['y_fit'].iloc[:n_rows])
+    fit_seconds = time.perf_counter() - started
+
+    engine = CompiledForest.from_sklearn(model)
+    X_val = data['X_val'].values
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, 'candidate.npz')
+        portable_bytes = save_portable(model, data['scaler'], path, list(data['X_val'].columns))
+
+    result = {
+        'params': params,
+        'rows': n_rows,
+        'fit_seconds': fit_seconds,
+        'n_nodes': engine.n_nodes,
+        'max_depth': engine.max_depth,
+        'portable_mb': portable_bytes / 1e6,
+        'single_row_us': best_seconds(engine.predict, X_val[:1]) * 1e6,
+        'batch_ms': best_seconds(engine.predict, X_val[:BATCH_ROWS]) * 1e3,
+        'validation': regression_metrics(data['y_val'], engine.predict(X_val))
+    }
+    if final:
+        result['test'] = regression_metrics(data['y_test'], engine.predict(data['X_test'].values))
+    return result
+
+
+# ============================================================================
+# PARETO RANKING
+# ============================================================================
+
+def objectives(result, split):
+    """
+    Minimized objectives of one fit: MAE on split, single-row and batch
+    latency
+    """
+    return (result[split]['mae'], result['single_row_us'], result['batch_ms'])
+
+
+def pareto_ranks(points):
+    """
+    Non-dominated sorting rank (0 = Pareto front) of points whose
+    coordinates are all minimized
+    """
+    ranks = [None] * len(points)
+    remaining = set(range(len(points)))
+    rank = 0
+    while remaining:
+        front = {i for i in remaining
+                 if not any(all(a <= b for a, b in zip(points[j], points[i]))
+                            and points[j] != points[i] for j in remaining)}
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+def survivors(results, keep):
+    """
+    The keep best results by (Pareto rank on validation MAE and latency,
+    validation MAE)
+    """
+    ranks = pareto_ranks([objectives(r, 'validation') for r in results])
+    order = sorted(range(len(results)), key=lambda i: (ranks[i], results[i]['validation']['mae']))
+    return [results[i] for i in order[:keep]]
+
+
+def describe(params):
+    return (f"trees={params['n_estimators']:<4} depth={str(params['max_depth']):<5}"
+            f"leaf={params['min_samples_leaf']:<3}")
+
+
+# Parameters of the forest save_model.py ships, marked in the report
+PRODUCTION_PARAMS = {'n_estimators': 100, 'max_depth': None, 'min_samples_leaf': 1}
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def main():
+    print("="*80)
+    print("FOREST TUNING - SUCCESSIVE HALVING WITH PARETO REPORT")
+    print("="*80)
+    print()
+
+    data = load_datasets()
+    n_fit = len(data['X_train']) - int(len(data['X_train']) * VALIDATION_FRACTION)
+    candidates = [dict(zip(PARAM_GRID, values)) for values in itertools.product(*PARAM_GRID.values())]
+    n_rungs = 1 + max(0, math.ceil(math.log(len(candidates) / MIN_FINALISTS, HALVING_FACTOR)))
+    print(f"✓ {len(candidates)} candidates, {n_rungs} rungs (factor {HALVING_FACTOR}), "
+          f"{n_fit} fitting rows, {len(data['X_train']) - n_fit} validation rows, "
+          f"{TRAIN_CORES} worker(s)")
+    print()
+
+    history = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=TRAIN_CORES, initializer=_init_worker) as pool:
+        for rung in range(n_rungs):
+            final = rung == n_rungs - 1
+            n_rows = n_fit if final else max(100, n_fit // HALVING_FACTOR ** (n_rungs - 1 - rung))
+            print(f"STEP {rung + 1}: Rung {rung}: {len(candidates)} candidates on {n_rows} rows...")
+            rung_started = time.perf_counter()
+            # Largest forests first, so they never queue behind small ones
+            ordered = sorted(candidates, key=lambda params: -params['n_estimators'])
+            futures = [pool.submit(evaluate_candidate, params, n_rows, final) for params in ordered]
+            results = [future.result() for future in as_completed(futures)]
+            for result in results:
+                result['rung'] = rung
+            history.extend(results)
+
+            keep = len(results) if final else max(1, math.ceil(len(results) / HALVING_FACTOR))
+            kept = survivors(results, keep)
+            print(f"✓ Done in {time.perf_counter() - rung_started:.1f} s; keeping {len(kept)}")
+            for result in kept[:5]:
+                print(f"    {describe(result['params'])} val MAE {result['validation']['mae']:6.2f}  "
+                      f"{result['single_row_us']:6.1f} µs/row  {result['batch_ms']:5.1f} ms/batch")
+            print()
+            candidates = [result['params'] for result in kept]
+    finalists = [result for result in history if result['rung'] == n_rungs - 1]
+    print(f"✓ Search finished in {time.perf_counter() - started:.1f} s, {len(history)} fits")
+    print()
+
+    # ========================================================================
+    # FINALISTS AND PARETO FRONT
+    # ========================================================================
+
+    print(f"STEP {n_rungs + 1}: Finalists on the test set (trained on {n_fit} rows)...")
+    print(f"{'Candidate':<30}{'MAE':>7}{'RMSE':>8}{'R²':>8}{'1 row':>10}{f'{BATCH_ROWS} rows':>11}"
+          f"{'Nodes':>9}{'File':>9}")
+    print("-"*92)
+    ranks = pareto_ranks([objectives(r, 'test') for r in finalists])
+    front = sorted((r for r, rank in zip(finalists, ranks) if rank == 0),
+                   key=lambda r: r['single_row_us'])
+    for result in sorted(finalists, key=lambda r: r['test']['mae']):
+        marker = (' *' if result in front else '') + (' (production)' if result['params'] == PRODUCTION_PARAMS else '')
+        print(f"{describe(result['params']):<30}{result['test']['mae']:>7.2f}{result['test']['rmse']:>8.2f}"
+              f"{result['test']['r2']:>8.4f}{result['single_row_us']:>7.1f} µs{result['batch_ms']:>8.1f} ms"
+              f"{result['n_nodes']:>9}{result['portable_mb']:>6.1f} MB{marker}")
+    print("(* on the Pareto front of test MAE, single-row and batch latency)")
+    print()
+
+    best_mae = min(r['test']['mae'] for r in finalists)
+    picks = {}
+    for latency, unit, label in [('single_row_us', 'µs/row', 'single rows'),
+                                 ('batch_ms', f'ms/{BATCH_ROWS} rows', 'batches')]:
+        print(f"Fastest forest for {label} within each accuracy budget "
+              f"(best test MAE {best_mae:.2f} W/m²):")
+        picks[latency] = {}
+        for budget in ACCURACY_BUDGETS:
+            pick = min((r for r in front if r['test']['mae'] <= best_mae + budget),
+                       key=lambda r: r[latency])
+            picks[latency][str(budget)] = pick['params']
+            print(f"  MAE ≤ best + {budget:<4g} →  {describe(pick['params'])} "
+                  f"({pick['test']['mae']:.2f} W/m², {pick[latency]:.1f} {unit}, "
+                  f"{pick['portable_mb']:.1f} MB)")
+        print()
+
+    with open(TUNING_REPORT_PATH, 'w') as f:
+        json.dump({'param_grid': PARAM_GRID, 'halving_factor': HALVING_FACTOR,
+                   'history': history, 'pareto_front': front,
+                   'fastest_within_budget': picks}, f, indent=2)
+    print(f"✓ Full report written to {TUNING_REPORT_PATH}")
+    print("  Set the chosen parameters in save_model.py MODELS['random_forest'].")
+    print()
+
+    print("="*80)
+    print("TUNING COMPLETE")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+================================================================================
+VERIFY FUSED SCALER + FOREST MODEL
+================================================================================
+Project: Intelligent Solar Energy Analytics & Prediction System
+Role: Machine Learning Engineer
+Organization: Emmvee Solar Systems Pvt. Ltd.
+
+Purpose: Prove that the fused forest (StandardScaler folded into the split
+         thresholds) predicts identically to scaler.transform + model.predict
+
+Inputs are raw request rows; they go through the feature stage of the
+scaler's feature set (feature_stage.py) as in app.py, so solar-trained
+artifacts are checked the same way as raw ones.
+================================================================================
+"""
+
+import time
+import warnings
+import joblib
+import numpy as np
+import pandas as pd
+from feature_stage import RAW_FEATURES, build_features, fitted_feature_set, model_inputs
+from forest_engine import CompiledForest
+
+warnings.filterwarnings('ignore')
+
+print("="*80)
+print("VERIFY FUSED SCALER + FOREST MODEL")
+print("="*80)
+print()
+
+# ============================================================================
+# STEP 1: LOAD MODEL AND SCALER
+# ============================================================================
+
+print("STEP 1: Loading model and scaler...")
+model = joblib.load('random_forest_model.pkl')
+scaler = joblib.load('scaler.pkl')
+engine = CompiledForest.from_sklearn(model)
+feature_set = fitted_feature_set(scaler)
+print(f"✓ Compiled forest: {engine.n_trees} trees, {engine.n_nodes} nodes")
+print(f"✓ Feature set: {feature_set}")
+print()
+
+# ============================================================================
+# STEP 2: FUSE SCALER INTO SPLIT THRESHOLDS
+# ============================================================================
+
+print("STEP 2: Fusing scaler into split thresholds...")
+start = time.perf_counter()
+fused = engine.fuse_scaler(scaler)
+print(f"✓ Fused in {time.perf_counter() - start:.2f} s")
+print()
+
+# ============================================================================
+# STEP 3: PROOF AT EVERY SPLIT
+# ============================================================================
+
+print("STEP 3: Checking every split boundary...")
+n_splits = len(engine.internal_nodes())
+mismatches = engine.verify_fusion(fused, scaler)
+print(f"  Splits checked:    {n_splits}")
+print(f"  Splits mismatched: {mismatches}")
+print()
+
+# ============================================================================
+# STEP 4: END-TO-END COMPARISON
+# ============================================================================
+
+print("STEP 4: Comparing predictions end to end...")
+
+# Every row of the raw dataset plus random inputs across the /predict ranges
+X_dataset = pd.read_csv('weather_environmental_data.csv')[RAW_FEATURES].dropna().values
+
+rng = np.random.default_rng(42)
+n_random = 20000
+X_random = np.column_stack([
+    rng.uniform(-10, 50, n_random),
+    rng.uniform(0, 100, n_random),
+    rng.uniform(0, 100, n_random),
+    rng.integers(0, 24, n_random),
+    rng.integers(1, 13, n_random)
+]).astype(float)
+
+all_equal = True
+for name, X in [('Dataset rows', X_dataset), ('Random inputs', X_random)]:
+    expected = model.predict(model_inputs(X, scaler))
+    actual = np.concatenate([fused.predict(build_features(X[i:i + 256], feature_set))
+                             for i in range(0, len(X), 256)])
+    equal = np.array_equal(expected, actual)
+    all_equal = all_equal and equal
+    print(f"  {name:<15} {len(X):>6} rows  max |diff| = {np.abs(expected - actual).max():.3g}  "
+          f"{'✓' if equal else '✗'}")
+print()
+
+print("="*80)
+if mismatches == 0 and all_equal:
+    print("✓ FUSED MODEL IS EQUIVALENT TO SCALER + RANDOM FOREST")
+else:
+    print("✗ FUSED MODEL DIFFERS FROM SCALER + RANDOM FOREST")
+print("="*80)